@@ -1,14 +1,19 @@
 """API Exposer integration."""
 
 from __future__ import annotations
+import voluptuous as vol
+
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.service import SupportsResponse
+import homeassistant.helpers.config_validation as cv
 
 from .const import DOMAIN
+from .index import EndpointIndex
 from .service import EndpointsService
+from .websocket_api import async_register_websocket_commands
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Initialize the Setup"""
@@ -24,11 +29,22 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
 
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Set up from config flow."""
-    service = EndpointsService(hass, config_entry)
+    index = EndpointIndex(hass)
+    config_entry.async_on_unload(index.async_start())
+    hass.data.setdefault(DOMAIN, {})["index"] = index
+    async_register_websocket_commands(hass)
+    service = EndpointsService(hass, config_entry, index)
     hass.services.async_register(
         DOMAIN,
         "get_endpoints",
         service.get_endpoints,
+        schema=vol.Schema({
+            vol.Optional("include_state", default=False): bool,
+            vol.Optional("attributes"): vol.All(cv.ensure_list, [str]),
+            vol.Optional("domains"): vol.All(cv.ensure_list, [str]),
+            vol.Optional("views"): vol.All(cv.ensure_list, [str]),
+            vol.Optional("if_none_match"): str,
+        }),
         supports_response=SupportsResponse.ONLY
     )
 
@@ -36,5 +52,6 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload the integration."""
-    hass.services.async_remove(DOMAIN, "get_sensor_attributes")
+    hass.services.async_remove(DOMAIN, "get_endpoints")
+    hass.data.get(DOMAIN, {}).pop("index", None)
     return True
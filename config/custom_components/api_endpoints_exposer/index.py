@@ -0,0 +1,180 @@
+"""Cached index of the endpoints declared in the dashboards."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+
+from datetime import timedelta
+from typing import Any, Callable, List
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util.yaml import loader
+
+_LOGGER = logging.getLogger(__name__)
+
+YAML_DASHBOARD = "ui-lovelace.yaml"
+WATCH_INTERVAL = timedelta(seconds=10)
+EVENT_LOVELACE_UPDATED = "lovelace_updated"
+
+
+def find_endpoints(dashboard_config: dict, dashboard: str) -> List[dict]:
+    """Every card with a description and an entity, at any nesting depth."""
+    endpoints = []
+    views: List[dict] = dashboard_config.get('views') or []
+    for position, view in enumerate(views):
+        if isinstance(view, dict):
+            name = view.get('path') or view.get('title') or str(position)
+            _walk(view, dashboard, name, endpoints)
+    return endpoints
+
+
+def _walk(node: Any, dashboard: str, view: str, endpoints: List[dict]) -> None:
+    # Sections, stacks, grids and conditional cards all nest their children
+    # under different keys, so every container is visited.
+    if isinstance(node, list):
+        for item in node:
+            _walk(item, dashboard, view, endpoints)
+    elif isinstance(node, dict):
+        if 'description' in node and 'entity' in node:
+            endpoints.append({
+                'description': node['description'],
+                'entity': node['entity'],
+                'view': view,
+                'dashboard': dashboard,
+            })
+        for value in node.values():
+            if isinstance(value, (dict, list)):
+                _walk(value, dashboard, view, endpoints)
+
+
+class EndpointIndex:
+    """Endpoints of the YAML dashboard and of every storage-mode dashboard.
+
+    Each dashboard is parsed once, off the event loop, and re-parsed only when
+    it changes: the YAML file is watched by its mtime and storage dashboards
+    by the `lovelace_updated` event. Reading the index is a plain lookup.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._path = hass.config.path(YAML_DASHBOARD)
+        self._yaml_mtime: float | None = None
+        self._sources: dict[str, List[dict]] = {}
+        self._endpoints: List[dict] | None = None
+        self._lock = asyncio.Lock()
+        self._listeners: List[Callable[[], None]] = []
+
+    @callback
+    def async_start(self) -> Callable[[], None]:
+        """Start watching the dashboards; returns the function that stops it."""
+        unsub_watch = async_track_time_interval(self._hass, self._async_check_yaml, WATCH_INTERVAL)
+        unsub_event = self._hass.bus.async_listen(EVENT_LOVELACE_UPDATED, self._async_lovelace_updated)
+
+        @callback
+        def stop() -> None:
+            unsub_watch()
+            unsub_event()
+
+        return stop
+
+    @callback
+    def async_add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call `listener` whenever the endpoint set changes."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    async def async_endpoints(self) -> List[dict]:
+        if self._endpoints is None:
+            async with self._lock:
+                if self._endpoints is None:
+                    await self._async_load_yaml()
+                    for url_path in self._storage_dashboards():
+                        await self._async_load_storage(url_path)
+                    self._rebuild()
+        return self._endpoints
+
+    def _rebuild(self) -> None:
+        previous = self._endpoints
+        self._endpoints = [endpoint for endpoints in self._sources.values() for endpoint in endpoints]
+        if previous is not None and previous != self._endpoints:
+            for listener in list(self._listeners):
+                listener()
+
+    async def _async_check_yaml(self, now=None) -> None:
+        if self._endpoints is None:
+            return
+        mtime = await self._hass.async_add_executor_job(self._mtime)
+        if mtime == self._yaml_mtime:
+            return
+        async with self._lock:
+            await self._async_load_yaml()
+            self._rebuild()
+
+    async def _async_lovelace_updated(self, event: Event) -> None:
+        if self._endpoints is None:
+            return
+        url_path = event.data.get("url_path")
+        async with self._lock:
+            dashboards = self._storage_dashboards()
+            if url_path in dashboards:
+                await self._async_load_storage(url_path)
+            else:
+                # A dashboard was added or removed.
+                for name in [name for name in self._sources if name != YAML_DASHBOARD]:
+                    del self._sources[name]
+                for url_path in dashboards:
+                    await self._async_load_storage(url_path)
+            self._rebuild()
+
+    def _mtime(self) -> float | None:
+        try:
+            return os.stat(self._path).st_mtime
+        except FileNotFoundError:
+            return None
+
+    def _parse_yaml(self) -> tuple[float | None, List[dict]]:
+        mtime = self._mtime()
+        if mtime is None:
+            return None, []
+        try:
+            with open(self._path, 'r') as file:
+                dashboard_config: dict = loader.yaml.load(file, Loader=loader.PythonSafeLoader) or {}
+        except Exception as e:
+            # Keep the mtime so a broken file is not re-parsed until it changes.
+            _LOGGER.warning(f"Could not parse {YAML_DASHBOARD}: {e}")
+            return mtime, []
+        return mtime, find_endpoints(dashboard_config, YAML_DASHBOARD)
+
+    async def _async_load_yaml(self) -> None:
+        self._yaml_mtime, self._sources[YAML_DASHBOARD] = await self._hass.async_add_executor_job(self._parse_yaml)
+
+    def _storage_dashboards(self) -> dict:
+        lovelace = self._hass.data.get("lovelace")
+        if lovelace is None:
+            return {}
+        dashboards = getattr(lovelace, "dashboards", None)
+        if dashboards is None and isinstance(lovelace, dict):
+            dashboards = lovelace.get("dashboards")
+        return {
+            url_path: dashboard
+            for url_path, dashboard in (dashboards or {}).items()
+            if getattr(dashboard, "mode", None) == "storage"
+        }
+
+    async def _async_load_storage(self, url_path: str | None) -> None:
+        name = url_path or "lovelace"
+        dashboard = self._storage_dashboards().get(url_path)
+        if dashboard is None:
+            self._sources.pop(name, None)
+            return
+        try:
+            dashboard_config = await dashboard.async_load(False)
+        except Exception as e:
+            # Storage dashboards that were never saved have no config yet.
+            _LOGGER.debug(f"Dashboard {name} has no config: {e}")
+            self._sources.pop(name, None)
+            return
+        self._sources[name] = find_endpoints(dashboard_config or {}, name)
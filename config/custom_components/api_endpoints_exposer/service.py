@@ -1,36 +1,70 @@
-from homeassistant.core import HomeAssistant, ServiceCall
+import hashlib
+import json
+
+from homeassistant.core import HomeAssistant, ServiceCall, State
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.util.yaml import loader
 from typing import List
 
+from .index import EndpointIndex
+
 class EndpointsService():
-    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry):
+    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry, index: EndpointIndex):
         self._hass = hass
         self._config_entry = config_entry
+        self._index = index
 
     async def get_endpoints(self, call: ServiceCall) -> None:
-        """Service to get the attributes of a sensor."""
-        result = await self._extract_endpoints('ui-lovelace.yaml')
+        """Service to get the endpoints exposed in the dashboards.
+
+        With `include_state` every endpoint also carries the current state of
+        its entity, so callers need no extra request per entity. The response
+        `version` can be sent back as `if_none_match`; when nothing changed the
+        endpoints come back empty.
+        """
+        endpoints = self.filter(
+            await self._index.async_endpoints(),
+            call.data.get("domains"),
+            call.data.get("views")
+        )
+        if call.data.get("include_state", False):
+            attributes = call.data.get("attributes")
+            endpoints = [
+                {**endpoint, **self.snapshot(self._hass.states.get(endpoint['entity']), attributes)}
+                for endpoint in endpoints
+            ]
+
+        version = self.version(endpoints)
+        if call.data.get("if_none_match") == version:
+            return {"version": version, "unchanged": True, "endpoints": []}
+        return {
+            "version": version,
+            "endpoints": endpoints
+        }
+
+    @staticmethod
+    def filter(endpoints: List[dict], domains: List[str] | None, views: List[str] | None) -> List[dict]:
+        if domains:
+            endpoints = [endpoint for endpoint in endpoints if str(endpoint['entity']).split('.')[0] in domains]
+        if views:
+            endpoints = [endpoint for endpoint in endpoints if endpoint['view'] in views]
+        return endpoints
+
+    @staticmethod
+    def snapshot(state: State | None, attributes: List[str] | None) -> dict:
+        if state is None:
+            return {"state": None, "attributes": {}, "last_changed": None}
+
+        if attributes is None:
+            selected = dict(state.attributes)
+        else:
+            selected = {key: state.attributes[key] for key in attributes if key in state.attributes}
         return {
-            "endpoints": result
+            "state": state.state,
+            "attributes": selected,
+            "last_changed": state.last_changed.isoformat()
         }
-    
-    async def _extract_endpoints(self, dashboard_path_str: str) -> List[dict]:
-        dashboard_path = self._hass.config.path(dashboard_path_str)
-        endpoints = []
-        with open(dashboard_path, 'r') as file:
-            dashboard_config: dict = loader.yaml.load(file, Loader=loader.PythonSafeLoader)
-            views: List[dict] = dashboard_config.get('views', [])
-            for view in views:
-                sections: List[dict] = view.get('sections', [])
-                for section in sections:
-                    cards: List[dict] = section.get('cards', [])
-                    for card in cards:
-                        card_keys = card.keys()
-                        if 'description' in card_keys and 'entity' in card_keys:
-                            endpoints.append({
-                                'description': card['description'],
-                                'entity': card['entity']
-                            })
-
-        return endpoints
\ No newline at end of file
+
+    @staticmethod
+    def version(endpoints: List[dict]) -> str:
+        payload = json.dumps(endpoints, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode()).hexdigest()[:12]
@@ -0,0 +1,150 @@
+"""Websocket subscription to the state of the exposed endpoints."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from typing import Any, List
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import Event, EventStateChangedData, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import DOMAIN
+from .index import EndpointIndex
+from .service import EndpointsService
+
+_LOGGER = logging.getLogger(__name__)
+
+DEBOUNCE_DEFAULT = 1.0
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    websocket_api.async_register_command(hass, ws_subscribe)
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): f"{DOMAIN}/subscribe",
+    vol.Optional("debounce", default=DEBOUNCE_DEFAULT): vol.All(vol.Coerce(float), vol.Range(min=0, max=60)),
+    vol.Optional("attributes"): [str],
+    vol.Optional("domains"): [str],
+    vol.Optional("views"): [str],
+})
+@websocket_api.async_response
+async def ws_subscribe(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Send the exposed endpoints once, then only the states that change.
+
+    Changes arriving within `debounce` seconds are coalesced into a single
+    message keyed by entity, holding the latest state of each.
+    """
+    index: EndpointIndex | None = hass.data.get(DOMAIN, {}).get("index")
+    if index is None:
+        connection.send_error(msg["id"], "not_loaded", "The integration is not loaded")
+        return
+
+    # Load before answering, so a failure is the only reply to the command.
+    try:
+        endpoints = await index.async_endpoints()
+    except Exception as err:
+        _LOGGER.exception("Could not load the endpoints to subscribe to")
+        connection.send_error(msg["id"], websocket_api.ERR_UNKNOWN_ERROR, str(err))
+        return
+
+    subscription = EndpointSubscription(hass, connection, msg, index)
+    connection.subscriptions[msg["id"]] = subscription.async_stop
+    connection.send_result(msg["id"])
+    subscription.async_start(endpoints)
+
+
+class EndpointSubscription:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        connection: websocket_api.ActiveConnection,
+        msg: dict[str, Any],
+        index: EndpointIndex
+    ) -> None:
+        self._hass = hass
+        self._connection = connection
+        self._id = msg["id"]
+        self._debounce = msg["debounce"]
+        self._attributes: List[str] | None = msg.get("attributes")
+        self._domains: List[str] | None = msg.get("domains")
+        self._views: List[str] | None = msg.get("views")
+        self._index = index
+        self._sent: dict[str, dict] = {}
+        self._pending: dict[str, dict] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._unsub_states = None
+        self._unsub_index = None
+        self._stopped = False
+
+    @callback
+    def async_start(self, endpoints: List[dict]) -> None:
+        self._unsub_index = self._index.async_add_listener(self._async_endpoints_changed)
+        self._track(endpoints)
+
+    @callback
+    def async_stop(self) -> None:
+        self._stopped = True
+        if self._unsub_index:
+            self._unsub_index()
+        if self._unsub_states:
+            self._unsub_states()
+        if self._flush_handle:
+            self._flush_handle.cancel()
+
+    async def _async_track(self) -> None:
+        endpoints = await self._index.async_endpoints()
+        if not self._stopped:
+            self._track(endpoints)
+
+    @callback
+    def _track(self, endpoints: List[dict]) -> None:
+        endpoints = EndpointsService.filter(endpoints, self._domains, self._views)
+        if self._unsub_states:
+            self._unsub_states()
+        entity_ids = sorted({endpoint['entity'] for endpoint in endpoints if isinstance(endpoint['entity'], str)})
+        self._unsub_states = async_track_state_change_event(self._hass, entity_ids, self._async_state_changed)
+
+        self._sent = {
+            entity_id: EndpointsService.snapshot(self._hass.states.get(entity_id), self._attributes)
+            for entity_id in entity_ids
+        }
+        self._pending.clear()
+        self._connection.send_message(websocket_api.event_message(self._id, {
+            "endpoints": [{**endpoint, **self._sent.get(endpoint['entity'], {})} for endpoint in endpoints]
+        }))
+
+    @callback
+    def _async_endpoints_changed(self) -> None:
+        self._hass.async_create_task(self._async_track())
+
+    @callback
+    def _async_state_changed(self, event: Event[EventStateChangedData]) -> None:
+        entity_id = event.data["entity_id"]
+        snapshot = EndpointsService.snapshot(event.data["new_state"], self._attributes)
+        if snapshot == self._sent.get(entity_id):
+            # Only attributes the client did not ask for changed.
+            self._pending.pop(entity_id, None)
+            return
+
+        self._pending[entity_id] = snapshot
+        if self._flush_handle is None:
+            self._flush_handle = self._hass.loop.call_later(self._debounce, self._flush)
+
+    @callback
+    def _flush(self) -> None:
+        self._flush_handle = None
+        if self._stopped or not self._pending:
+            return
+
+        changes, self._pending = self._pending, {}
+        self._sent.update(changes)
+        self._connection.send_message(websocket_api.event_message(self._id, {"changes": changes}))
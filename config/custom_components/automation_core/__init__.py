@@ -4,11 +4,18 @@ from __future__ import annotations
 
 import logging
 
-from homeassistant.core import HomeAssistant
+from datetime import datetime, timedelta
+
+from homeassistant.core import Event, HomeAssistant
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
 from homeassistant.helpers import device_registry as dr
-from custom_components.automation_core.service import AutomationService
+from homeassistant.helpers.event import async_track_time_interval
+from custom_components.automation_core.const import *
+from custom_components.automation_core.discovery import async_setup_automations
+from custom_components.automation_core.metrics import TRACES
+from custom_components.automation_core.service import AutomationService, ServiceStatus
+from custom_components.automation_core.views import MetricsView
 from custom_components.automation_core.utils import get_main_domain
 
 DOMAIN = get_main_domain()
@@ -21,13 +28,71 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][config_entry.entry_id] = config_entry
 
-    automation_service = AutomationService()
+    TRACES.budget = config_entry.data.get(CONF_TRACE_BUDGET, DEFAULT_TRACE_BUDGET)
+    automation_service = AutomationService(
+        pool_size=config_entry.data.get(CONF_POOL_SIZE, DEFAULT_POOL_SIZE),
+        shards=config_entry.data.get(CONF_SHARDS, DEFAULT_SHARDS),
+        idle_timeout=config_entry.data.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT),
+        headless=config_entry.data.get(CONF_HEADLESS, DEFAULT_HEADLESS),
+        max_heap_mb=config_entry.data.get(CONF_MAX_HEAP_MB, DEFAULT_MAX_HEAP_MB)
+    )
+    hass.data[DOMAIN]['service'] = automation_service
     hass.data[DOMAIN]['get_page'] = automation_service.get_page
+    hass.data[DOMAIN]['lease_page'] = automation_service.lease
+
+    def on_status(status: ServiceStatus) -> None:
+        hass.bus.async_fire(f"{DOMAIN}_browser_status", {
+            "status": status,
+            "launch_time": automation_service.launch_time
+        })
+
+    config_entry.async_on_unload(automation_service.add_status_listener(on_status))
+    # Services and other non-entity setup of the automations, found by discovery.
+    await async_setup_automations(hass, config_entry)
+
+    async def on_stop(event: Event) -> None:
+        await async_stop_automations(hass)
+
+    config_entry.async_on_unload(hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, on_stop))
 
+    async def prune_profiles(now: datetime) -> None:
+        await automation_service.prune_profiles()
+
+    # Hourly, as each profile is pruned at most once per prune_interval anyway.
+    config_entry.async_on_unload(async_track_time_interval(hass, prune_profiles, timedelta(hours=1)))
+    if not hass.data.get(f"{DOMAIN}_metrics_view"):
+        hass.data[f"{DOMAIN}_metrics_view"] = True
+        hass.http.register_view(MetricsView())
+    # The browser is already launching in the background, so platforms are set
+    # up while Chromium starts instead of after it.
     await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
     await cleanup_old_device(hass)
     return True
 
+async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
+    """Unload a config entry."""
+    unloaded = await hass.config_entries.async_unload_platforms(config_entry, PLATFORMS)
+    if unloaded:
+        await async_stop_automations(hass)
+        hass.data[DOMAIN].pop(config_entry.entry_id, None)
+        # Rescanned on the next setup, so new and changed automations are found.
+        hass.data[DOMAIN].pop("discovery", None)
+    return unloaded
+
+async def async_stop_automations(hass: HomeAssistant) -> None:
+    """Stop the automation clients, then the browser they run on.
+
+    The browser goes last so the sessions it snapshots on shutdown are the
+    ones the clients left behind.
+    """
+    data = hass.data.get(DOMAIN, {})
+    if accounts := data.pop("whatsapp", None):
+        await accounts.shutdown()
+    data.pop("get_page", None)
+    data.pop("lease_page", None)
+    if automation_service := data.pop("service", None):
+        await automation_service.shutdown()
+
 async def cleanup_old_device(hass: HomeAssistant) -> None:
     """Cleanup device without proper device identifier."""
     device_reg = dr.async_get(hass)
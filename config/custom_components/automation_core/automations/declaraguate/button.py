@@ -1,7 +1,14 @@
+import logging
+
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from custom_components.automation_core.entity import ButtonAutomationEntity
+from custom_components.automation_core.utils import get_main_domain
+from custom_components.automation_core.automations.declaraguate.lib import STATUS_EVENT, DeclaraGuate, DeclaraGuateStatus
+from custom_components.automation_core.automations.whatsapp.account import get_accounts
+
+_LOGGER = logging.getLogger(__name__)
 
 class DeclaraGuateButton(ButtonAutomationEntity):
     """Button to pay taxes in Guatemala."""
@@ -10,6 +17,8 @@ class DeclaraGuateButton(ButtonAutomationEntity):
         super().__init__(hass, config_entry)
         self._attr_name = "Declaraguate"
         self._attr_unique_id = f"{config_entry.entry_id}_declaraguate_button"
+        # DeclaraGuate runs on leased pages, so there is no dedicated page to go stale.
+        self._page_id = None
         self._attr_device_info = DeviceInfo(
             identifiers={(self._domain, config_entry.entry_id)},
             name="Declaraguate",
@@ -18,9 +27,24 @@ class DeclaraGuateButton(ButtonAutomationEntity):
             entry_type=DeviceEntryType.SERVICE,
         )
 
-    def press(self):
+    async def async_press(self) -> None:
         """Activate the button."""
-        # Aquí va la lógica para pagar impuestos
-        print("Pagando impuestos")
-        # Ejemplo: podrías usar una API externa o una biblioteca
-        # await self.hass.async_add_executor_job(pay_taxes)
\ No newline at end of file
+        _LOGGER.info("Starting the Declaraguate declaration")
+        # The run waits for the captcha to be solved over WhatsApp, so it
+        # goes on in the background on a pooled page.
+        self.hass.async_create_task(self._declare())
+
+    async def _declare(self) -> None:
+        lease_page = self.hass.data[get_main_domain()]['lease_page']
+        self._fire_status(DeclaraGuateStatus.RUNNING)
+        try:
+            await DeclaraGuate.declare(lease_page, get_accounts(self.hass).get())
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            _LOGGER.error(f"Declaraguate declaration failed: {error}")
+            self._fire_status(DeclaraGuateStatus.FAILED, error)
+            return
+        self._fire_status(DeclaraGuateStatus.DECLARED)
+
+    def _fire_status(self, status: DeclaraGuateStatus, error: str | None = None) -> None:
+        self.hass.bus.async_fire(STATUS_EVENT, {"status": status, "error": error})
@@ -1,17 +1,43 @@
+import asyncio
 import logging
 
+from enum import StrEnum
+from typing import AsyncContextManager, Callable, Optional
 from playwright.async_api import Page, Locator
 from custom_components.automation_core import utils
+from custom_components.automation_core.metrics import METRICS, MetricKind, timed_step
+from custom_components.automation_core.routing import ANALYTICS_HOSTS, RoutePolicy, register_route_policy
 from custom_components.automation_core.automations.whatsapp.lib import WhatsApp, WhatsAppEventName, WhatsAppMessage, WhatsAppLoginStatus
 
 LOGGER = logging.getLogger(__name__)
 
+STATUS_EVENT = f"{utils.get_main_domain()}_declaraguate_status"
+
+class DeclaraGuateStatus(StrEnum):
+    RUNNING = "running"
+    DECLARED = "declared"
+    FAILED = "failed"
+
+# The captcha is a first-party image that gets screenshotted, so only
+# third-party images are dropped along with fonts, media and trackers.
+register_route_policy(utils.get_domain(__file__), RoutePolicy(
+    blocked_resource_types=frozenset({"font", "media"}),
+    blocked_url_patterns=ANALYTICS_HOSTS + (r"^https?://(?![^/]*sat\.gob\.gt)[^/]+/.*\.(?:png|jpe?g|gif|webp|svg)(?:\?|$)",),
+))
+
 class DeclaraGuate:
     _instance = None
+    _lock = asyncio.Lock()
     _page: Page = None
+    _whatsapp: WhatsApp = None
+    _finished: Optional[asyncio.Future] = None
 
     BASE_URL = "declaraguate.sat.gob.gt/declaraguate-web/catalogo.iface"
     CAPTCHA_PATH = "automation_core/declaraguate/captcha.png"
+    # Seconds the declaration may wait for the WhatsApp login, then for the
+    # captcha to be solved over WhatsApp.
+    LOGIN_TIMEOUT = 10 * 60
+    CAPTCHA_TIMEOUT = 15 * 60
 
     def __new__(cls):
         if cls._instance is None:
@@ -19,6 +45,7 @@ class DeclaraGuate:
         return cls._instance
     
     @classmethod
+    @timed_step
     async def go_to_base(cls):
         current_url = cls._page.url
         base_url = f"https://{cls.BASE_URL}"
@@ -26,41 +53,84 @@ class DeclaraGuate:
             await cls._page.goto(base_url)
 
     @classmethod
-    async def login(cls, page: Page):
-        cls._page = page
-        async def login_callback(status: WhatsAppLoginStatus):
-            if not WhatsAppLoginStatus.LOGGED_IN is status:
-                return
-            
-            WhatsApp.event_emitter.remove_listener(WhatsAppEventName.LOGIN_STATUS, login_callback)
-            await cls._login()
-        WhatsApp.event_emitter.add_listener(WhatsAppEventName.LOGIN_STATUS, login_callback)
+    async def declare(cls, lease_page: Callable[[str], AsyncContextManager[Page]], whatsapp: WhatsApp):
+        """Log in and declare on a pooled page, held only for this run.
+
+        `whatsapp` is the account the captcha is solved through; the run
+        starts once it is logged in, and fails if that takes longer than
+        `LOGIN_TIMEOUT`. Nothing is held while waiting for the login.
+        """
+        await asyncio.wait_for(cls._logged_in(whatsapp), timeout=cls.LOGIN_TIMEOUT)
+        async with cls._lock:
+            async with lease_page(utils.get_domain(__file__)) as page:
+                cls._page = page
+                cls._whatsapp = whatsapp
+                cls._finished = asyncio.get_running_loop().create_future()
+                try:
+                    await cls._login()
+                    await asyncio.wait_for(cls._finished, timeout=cls.CAPTCHA_TIMEOUT)
+                finally:
+                    cls._page = None
+
+    @staticmethod
+    async def _logged_in(whatsapp: WhatsApp):
+        if whatsapp.state == WhatsAppLoginStatus.LOGGED_IN:
+            return
+        logged_in = asyncio.get_running_loop().create_future()
+
+        def login_callback(status: WhatsAppLoginStatus):
+            if WhatsAppLoginStatus.LOGGED_IN is status and not logged_in.done():
+                logged_in.set_result(None)
+
+        whatsapp.event_emitter.add_listener(WhatsAppEventName.LOGIN_STATUS, login_callback)
+        try:
+            await logged_in
+        finally:
+            whatsapp.event_emitter.remove_listener(WhatsAppEventName.LOGIN_STATUS, login_callback)
 
     @classmethod
+    @timed_step
     async def _login(cls):
         await cls.go_to_base()
-        await cls._page.get_by_role("link", name="IVA PEQUEÑO CONTRIBUYENTE").click()
+        async with METRICS.timed(MetricKind.SELECTOR_WAIT, "DeclaraGuate.contributor_link"):
+            await cls._page.get_by_role("link", name="IVA PEQUEÑO CONTRIBUYENTE").click()
         await cls._handle_captcha()
 
     @classmethod
+    @timed_step
     async def _handle_captcha(cls):
         captcha_panel = cls._page.locator("#mainForm\\:captchaPanel")
         captcha_img = captcha_panel.locator("img.iceGphImg")
         local_path = f"config/www/{cls.CAPTCHA_PATH}"
         await utils.take_qr_screenshot(captcha_img, local_path)
+        whatsapp = cls._whatsapp
+        finished = cls._finished
+
+        def drop(_=None):
+            if callback in whatsapp.event_emitter.listeners(WhatsAppEventName.MESSAGE_COMING):
+                whatsapp.event_emitter.remove_listener(WhatsAppEventName.MESSAGE_COMING, callback)
         
         async def callback(event: WhatsAppMessage):
             if (not event.me or len(event.message) != 5):
                 return
             
-            WhatsApp.event_emitter.remove_listener(WhatsAppEventName.MESSAGE_COMING, callback)
-            await cls._captcha_resolution(event, captcha_panel)
+            drop()
+            if finished.done():
+                return
+            try:
+                await cls._captcha_resolution(event, captcha_panel)
+            except Exception as e:
+                if not finished.done():
+                    finished.set_exception(e)
 
-        WhatsApp.event_emitter.add_listener(WhatsAppEventName.MESSAGE_COMING, callback)
-        await WhatsApp.find_by_name("Oscar Klee")
-        await WhatsApp._send_image_impl(local_path, "Declaraguate captcha resolution requirement.")
+        # Dropped with the run, so a late reply does not touch a returned page.
+        finished.add_done_callback(drop)
+        whatsapp.event_emitter.add_listener(WhatsAppEventName.MESSAGE_COMING, callback)
+        await (await whatsapp.find_by_name("Oscar Klee"))
+        await (await whatsapp.send_image(local_path, "Declaraguate captcha resolution requirement."))
 
     @classmethod
+    @timed_step
     async def _captcha_resolution(cls, event: WhatsAppMessage, panel: Locator):        
         LOGGER.info(f"New Message from:{event.sender} message:{event.message}")
         
@@ -80,3 +150,5 @@ class DeclaraGuate:
     @classmethod
     async def _declare_taxes(cls):
         LOGGER.info(f"Starting to declare taxes")
+        if cls._finished and not cls._finished.done():
+            cls._finished.set_result(None)
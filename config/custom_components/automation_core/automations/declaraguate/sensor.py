@@ -1,15 +1,20 @@
-from homeassistant.core import HomeAssistant
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from custom_components.automation_core.entity import SensorAutomationEntity
+from custom_components.automation_core.automations.declaraguate.lib import STATUS_EVENT
 
 class DeclaraGuateSensor(SensorAutomationEntity):
     """Sensor to show DeclaraGuate status."""
 
+    _attr_should_poll = False
+
     def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry):
         super().__init__(hass, config_entry)
         self._attr_name = "Declaraguate Status"
         self._attr_unique_id = f"{config_entry.entry_id}_declaraguate_status"
+        # DeclaraGuate runs on leased pages, so there is no dedicated page to go stale.
+        self._page_id = None
         self._attr_device_info = DeviceInfo(
             identifiers={(self._domain, config_entry.entry_id)},
             name="Declaraguate",
@@ -18,11 +23,22 @@ class DeclaraGuateSensor(SensorAutomationEntity):
             entry_type=DeviceEntryType.SERVICE,
         )
         self._state = "unknown"
+        self._error: str | None = None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(self.hass.bus.async_listen(STATUS_EVENT, self._handle_status))
+
+    @callback
+    def _handle_status(self, event: Event) -> None:
+        self._state = event.data["status"]
+        self._error = event.data.get("error")
+        self.async_write_ha_state()
 
     @property
     def state(self):
         return self._state
 
-    async def async_update(self):
-        """Update the sensor state."""
-        self._state = "paid"
\ No newline at end of file
+    @property
+    def extra_state_attributes(self) -> dict:
+        return {"error": self._error}
@@ -0,0 +1,50 @@
+from typing import List
+
+from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.util import slugify
+from custom_components.automation_core.const import CONF_WHATSAPP_ACCOUNTS, DEFAULT_WHATSAPP_ACCOUNTS
+from custom_components.automation_core.utils import get_main_domain
+from custom_components.automation_core.automations.whatsapp.lib import DEFAULT_ACCOUNT, WhatsAppAccounts
+
+def get_accounts(hass: HomeAssistant) -> WhatsAppAccounts:
+    """The WhatsApp clients, kept in hass.data so the entities of an account share one."""
+    # Shut down by the component, before the browser, on stop and on unload.
+    return hass.data.setdefault(get_main_domain(), {}).setdefault("whatsapp", WhatsAppAccounts())
+
+def configured_accounts(config_entry: ConfigEntry) -> List[str]:
+    accounts = config_entry.data.get(CONF_WHATSAPP_ACCOUNTS, DEFAULT_WHATSAPP_ACCOUNTS)
+    return list(dict.fromkeys(slug for slug in map(slugify, accounts) if slug))
+
+class WhatsAppAccountEntity:
+    """Mixin for the WhatsApp entities, created once per configured account.
+
+    The entities of the default account keep the ids and names they had
+    before accounts existed; every other account uses its own page, in its
+    own browser profile.
+    """
+
+    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry, account: str = DEFAULT_ACCOUNT):
+        super().__init__(hass, config_entry)
+        self._account = account
+        self._client = get_accounts(hass).get(account)
+        self._page_id = self._client.page_id
+        self._isolated_page = account != DEFAULT_ACCOUNT
+        self._attr_device_info = DeviceInfo(
+            identifiers={(self._domain, self._account_id(config_entry.entry_id))},
+            name=self._account_name("WhatsApp"),
+            model="WhatsApp",
+            manufacturer="oklee",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    @classmethod
+    def create(cls, hass: HomeAssistant, config_entry: ConfigEntry) -> list:
+        return [cls(hass, config_entry, account) for account in configured_accounts(config_entry)]
+
+    def _account_id(self, unique_id: str) -> str:
+        return unique_id if self._account == DEFAULT_ACCOUNT else f"{unique_id}_{self._account}"
+
+    def _account_name(self, name: str) -> str:
+        return name if self._account == DEFAULT_ACCOUNT else f"{name} ({self._account})"
@@ -1,46 +1,50 @@
-import logging
 import asyncio
+import logging
 
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
-from homeassistant.components.sensor import State
+from playwright.async_api import Page
 from custom_components.automation_core.entity import ButtonAutomationEntity
-from custom_components.automation_core.automations.whatsapp.lib import WhatsApp
+from custom_components.automation_core.automations.whatsapp.account import WhatsAppAccountEntity
+from custom_components.automation_core.automations.whatsapp.lib import DEFAULT_ACCOUNT, WhatsAppLoginStatus
 
 _LOGGER = logging.getLogger(__name__)
 
-class WhatsAppLoginButton(ButtonAutomationEntity):
+class WhatsAppLoginButton(WhatsAppAccountEntity, ButtonAutomationEntity):
     """Button to login to WhatsApp."""
     
-    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry):
-        super().__init__(hass, config_entry)
-        self._attr_name = "WhatsApp Login"
-        self._attr_unique_id = f"{config_entry.entry_id}_login_button"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(self._domain, config_entry.entry_id)},
-            name="WhatsApp",
-            model="WhatsApp",
-            manufacturer="oklee",
-            entry_type=DeviceEntryType.SERVICE,
-        )
+    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry, account: str = DEFAULT_ACCOUNT):
+        super().__init__(hass, config_entry, account)
+        self._attr_name = self._account_name("WhatsApp Login")
+        self._attr_unique_id = self._account_id(f"{config_entry.entry_id}_login_button")
 
     async def async_press(self) -> None:
         """Activate the button."""
-        sensor: State = self.hass.states.get(f"sensor.{self._domain}_login_status")
-        if sensor.state == "logged_in":
+        if self._client.state == WhatsAppLoginStatus.LOGGED_IN:
             _LOGGER.info("Already logged in")
             return
         
-        print("Iniciando sesión en WhatsApp")
+        _LOGGER.info(f"Logging in to WhatsApp ({self._account})")
         try:
             if self._page:
-                await self.change_state("in_progress")
-                await WhatsApp.login(self._page)
-                await self.change_state("logged_in")
-        except (asyncio.TimeoutError, Exception) as e:
-            print(f"Failed to initialize WhatsApp page: {e}")
+                login = await self._client.login(self._page)
+                self.change_state(WhatsAppLoginStatus.LOGIN_IN_PROGRESS)
+                # The QR login can take minutes, so the press does not wait for it.
+                login.add_done_callback(self._on_login_done)
+        except Exception as e:
+            _LOGGER.error(f"Failed to start the WhatsApp login: {e}")
+
+    def _on_login_done(self, login: asyncio.Future) -> None:
+        if login.cancelled():
+            return
+        if error := login.exception():
+            _LOGGER.error(f"WhatsApp login failed: {error}")
+            return
+        self.change_state(self._client.state)
+
+    async def async_page_recycled(self, page: Page) -> None:
+        await self._client.attach_page(page)
 
-    async def change_state(self, state: str) -> None:
+    def change_state(self, state: WhatsAppLoginStatus) -> None:
         event_name = f"event.{self._domain}_login_status"
-        self.hass.bus.fire(event_name, {"state": state})
\ No newline at end of file
+        self.hass.bus.async_fire(event_name, {"state": state, "account": self._account})
@@ -1,58 +1,71 @@
+import hashlib
 import logging
 
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.util import dt as dt_util
+from custom_components.automation_core import utils
 from custom_components.automation_core.entity import ImageAutomationEntity
-from custom_components.automation_core.automations.whatsapp.lib import WhatsApp, WhatsAppEventName
-from datetime import datetime
+from custom_components.automation_core.automations.whatsapp.account import WhatsAppAccountEntity
+from custom_components.automation_core.automations.whatsapp.lib import DEFAULT_ACCOUNT, WhatsAppEventName
 
 _LOGGER = logging.getLogger(__name__)
 
-class WhatsAppQRImage(ImageAutomationEntity):
-    LOCAL_PATH = "/local/automation_core/whatsapp"
-
-    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry):
-        super().__init__(hass, config_entry)
-        use_ssl = hass.config.api.use_ssl
-        scheme = "https" if use_ssl else "http"
-        host = hass.config.api.local_ip
-        port = hass.config.api.port
-        self._base_url = f"{scheme}://{host}:{port}"
-        self._attr_name = "WhatsApp QR Login"
-        self._attr_unique_id = f"{config_entry.entry_id}_login_qr_image"
-        self._image_path = None
-        self._cached_image = None
-        self.name = "QR Image"
-        self.image_last_updated = datetime.now()
-        self._attr_device_info = DeviceInfo(
-            identifiers={(self._domain, config_entry.entry_id)},
-            name="WhatsApp",
-            model="WhatsApp",
-            manufacturer="oklee",
-            entry_type=DeviceEntryType.SERVICE,
-        )
-        WhatsApp.event_emitter.on(WhatsAppEventName.NEW_QR_SCREENSHOT, self._handle_new_qr)
-    
+class WhatsAppQRImage(WhatsAppAccountEntity, ImageAutomationEntity):
+    """The login QR, rendered from its data-ref and served from memory."""
+
+    UNKNOWN_PATH = "www/automation_core/whatsapp/unknown.png"
+
+    _attr_content_type = "image/png"
+
+    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry, account: str = DEFAULT_ACCOUNT):
+        super().__init__(hass, config_entry, account)
+        self._attr_name = self._account_name("WhatsApp QR Login")
+        self._attr_unique_id = self._account_id(f"{config_entry.entry_id}_login_qr_image")
+        self._image: bytes | None = None
+        self._content_hash: str | None = None
+        self._unknown_image: bytes | None = None
+        self.name = self._account_name("QR Image")
+        self._attr_image_last_updated = dt_util.utcnow()
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        emitter = self._client.event_emitter
+        emitter.on(WhatsAppEventName.NEW_QR_CODE, self._handle_new_qr)
+        self.async_on_remove(lambda: emitter.remove_listener(WhatsAppEventName.NEW_QR_CODE, self._handle_new_qr))
+
     @property
     def state(self):
         return self.image_last_updated.strftime("%Y-%m-%d %H:%M:%S")
 
-    def _handle_new_qr(self, path: str):
-        now = datetime.now()
-        self._image_path = f"{self._base_url}{path}?v={now.timestamp()}"
-        self.image_last_updated = now
-        self.async_schedule_update_ha_state(True)
-
-    async def async_image(self) -> bytes:
-        try:
-            if self._image_path is None:
-                image_url = f"{self._base_url}{self.LOCAL_PATH}/unknown.png"
-            else:
-                image_url = self._image_path
-
-            image = await self._async_load_image_from_url(image_url)
-            return image.content
-        except Exception as e:
-            _LOGGER.error(f"Error fetching image: {str(e)}")
-            return b""
\ No newline at end of file
+    @property
+    def extra_state_attributes(self) -> dict:
+        return {"content_hash": self._content_hash}
+
+    async def _handle_new_qr(self, data_ref: str):
+        image = await self.hass.async_add_executor_job(utils.render_qr_png, data_ref)
+        content_hash = hashlib.sha256(image).hexdigest()[:16]
+        if content_hash == self._content_hash:
+            return
+        self._image = image
+        self._content_hash = content_hash
+        # The frontend caches the image by this timestamp, so it only changes
+        # along with the content.
+        self._attr_image_last_updated = dt_util.utcnow()
+        self.async_write_ha_state()
+
+    async def async_image(self) -> bytes | None:
+        if self._image is not None:
+            return self._image
+
+        if self._unknown_image is None:
+            try:
+                self._unknown_image = await self.hass.async_add_executor_job(self._read_unknown_image)
+            except OSError as e:
+                _LOGGER.error(f"Error reading placeholder image: {e}")
+                return None
+        return self._unknown_image
+
+    def _read_unknown_image(self) -> bytes:
+        with open(self.hass.config.path(self.UNKNOWN_PATH), "rb") as file:
+            return file.read()
@@ -2,21 +2,35 @@ import logging
 import asyncio
 import re
 
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 from pathlib import Path
 from custom_components.automation_core import utils
-from dataclasses import dataclass
-from playwright.async_api import Page, TimeoutError, ElementHandle
-from playwright.async_api import expect
+from custom_components.automation_core.metrics import METRICS, MetricKind
+from custom_components.automation_core.scheduler import CommandScheduler, Priority
+from custom_components.automation_core.snapshots import SnapshotPolicy, register_snapshot_policy
+from custom_components.automation_core.automations.whatsapp.store import LRUDict, MessageStore
+from dataclasses import dataclass, field
+from functools import lru_cache
+from time import monotonic
+from playwright.async_api import Page
 from pyee.asyncio import AsyncIOEventEmitter
 from enum import StrEnum
-from datetime import datetime, time, timedelta
+from datetime import date, datetime, time, timedelta
 
 LOGGER = logging.getLogger(__name__)
 
+# model-storage only caches chats the phone syncs again, and last-wid-md
+# only exists once a device is linked.
+register_snapshot_policy(utils.get_domain(__file__), SnapshotPolicy(
+    excluded_databases=("model-storage",),
+    required_local_storage=("last-wid-md",),
+))
+
+DEFAULT_ACCOUNT = "default"
+
 class WhatsAppEventName(StrEnum):
     LOGIN_STATUS = "login_status"
-    NEW_QR_SCREENSHOT = "new_qr_screenshot"
+    NEW_QR_CODE = "new_qr_code"
     MESSAGE_COMING = "message_comming"
 
 class WhatsAppLoginStatus(StrEnum):
@@ -24,152 +38,344 @@ class WhatsAppLoginStatus(StrEnum):
     LOGGED_IN = "logged_in"
     LOGIN_IN_PROGRESS = "login_in_progress" 
 
-@dataclass
+TIME_LABEL = re.compile(r"^(1[0-2]|0?[1-9]):([0-5][0-9])\s*([ap])\.?\s*m\.?$", re.IGNORECASE)
+DATE_LABEL = re.compile(r"^(\d{1,2})/(\d{1,2})/(\d{2}|\d{4})$")
+WEEKDAY_LABELS = {
+    name: index for index, names in enumerate((
+        ("monday", "lunes"),
+        ("tuesday", "martes"),
+        ("wednesday", "miércoles"),
+        ("thursday", "jueves"),
+        ("friday", "viernes"),
+        ("saturday", "sábado"),
+        ("sunday", "domingo"),
+    )) for name in names
+}
+YESTERDAY_LABELS = {"yesterday", "ayer"}
+
+@lru_cache(maxsize=1024)
+def parse_time_label(label: str, today: date) -> Optional[datetime]:
+    """Turn a chat-list time label into a datetime.
+
+    Handles clock times ("3:45 PM", "3:45 p.m.") for today, "Yesterday", weekday
+    names within the last week and M/D/YYYY dates. Labels without a time of
+    day resolve to midnight, unknown labels to midnight today. Only the label
+    and the current day take part, so results are deterministic and cached.
+    """
+    label = label.strip()
+    if not label:
+        return None
+
+    if match := TIME_LABEL.match(label):
+        hour = int(match.group(1)) % 12 + (12 if match.group(3).lower() == "p" else 0)
+        return datetime.combine(today, time(hour, int(match.group(2))))
+
+    lowered = label.lower()
+    if lowered in YESTERDAY_LABELS:
+        return datetime.combine(today - timedelta(days=1), time.min)
+
+    if lowered in WEEKDAY_LABELS:
+        days_ago = (today.weekday() - WEEKDAY_LABELS[lowered]) % 7 or 7
+        return datetime.combine(today - timedelta(days=days_ago), time.min)
+
+    if match := DATE_LABEL.match(label):
+        month, day, year = (int(group) for group in match.groups())
+        try:
+            return datetime(year + 2000 if year < 100 else year, month, day)
+        except ValueError:
+            pass
+
+    return datetime.combine(today, time.min)
+
+@dataclass(slots=True)
 class WhatsAppMessage:
     sender: str
     me: bool
-    time: str
+    time: Optional[datetime]
     message: str
     unread: bool
     no_of_unread: int
-    pattern: str = r"^(1[0-2]|0?[1-9]):([0-5][0-9])\s*(a\.m\.|p\.m\.)$"
+    received: float = field(default_factory=monotonic)
 
     @classmethod
     def from_dict(cls, message_data: dict) -> 'WhatsAppMessage':
-        message_data["time"] = cls._parse_time(message_data["time"])
-        return cls(**message_data)
-    
-    @classmethod
-    def _parse_time(cls, timeStr: str):
-        if (not timeStr):
-            return
-        
-        normalized_str = timeStr.replace("a.m.", "AM").replace("p.m.", "PM")
-        if (not re.match(cls.pattern, timeStr)):
-            normalized_str = "12:00 AM"
-
-        
-        time_obj = datetime.strptime(normalized_str, "%I:%M %p")
-        now = datetime.now()
-        return time(time_obj.hour, time_obj.minute, now.second, now.microsecond)
-    
+        return cls(
+            message_data["sender"],
+            message_data["me"],
+            parse_time_label(message_data["time"], date.today()),
+            message_data["message"],
+            message_data["unread"],
+            message_data["no_of_unread"]
+        )
+
+    def is_older_than(self, other: 'WhatsAppMessage') -> bool:
+        if self.time is None or other.time is None:
+            return False
+        return (self.time, self.received) < (other.time, other.received)
+
     def __eq__(self, other):
         if not isinstance(other, WhatsAppMessage):
             return False
         return (self.sender == other.sender and
                 self.message == other.message)
 
+# Watches the login screen with one observer: every QR rotation (a new
+# data-ref on its container) and the chat list appearing are pushed to
+# Python, and the observer disconnects once logged in.
+LOGIN_WATCHER = """
+() => {
+    if (window.__loginWatcher) return;
+    window.__loginWatcher = true;
+    let lastRef = null;
+    let scheduled = false;
+    let observer = null;
+    const check = () => {
+        scheduled = false;
+        if (document.querySelector('#pane-side')) {
+            observer.disconnect();
+            window.onLoginState({ logged_in: true });
+            return;
+        }
+        const container = document.querySelector('div[data-ref]');
+        const ref = container && container.getAttribute('data-ref');
+        if (ref && ref !== lastRef) {
+            lastRef = ref;
+            window.onLoginState({ qr: ref });
+        }
+    };
+    const start = () => {
+        observer = new MutationObserver(() => {
+            if (scheduled) return;
+            scheduled = true;
+            setTimeout(check, 50);
+        });
+        observer.observe(document.documentElement, {
+            childList: true, subtree: true, attributes: true, attributeFilter: ['data-ref']
+        });
+        check();
+    };
+    if (document.documentElement) start();
+    else document.addEventListener('DOMContentLoaded', start);
+}
+"""
+
+# Every message in the open chat carries a data-id of the form
+# "<from me>_<chat jid>_<message id>", stable across re-renders.
+MESSAGE_IDS = """() => [...document.querySelectorAll('#main [data-id]')].map(element => element.dataset.id)"""
+NEW_MESSAGE_ID = """
+([known, chat]) => [...document.querySelectorAll('#main [data-id]')]
+    .map(element => element.dataset.id)
+    .find(id => !known.includes(id) && (chat === null || id.split('_')[1] === chat))
+"""
+
 class WhatsApp:
-    _instance = None
-    _lock = asyncio.Lock()
-    _state: WhatsAppLoginStatus = WhatsAppLoginStatus.NOT_LOGGED_IN
-    event_emitter = AsyncIOEventEmitter()
-    _task_queue = asyncio.Queue()
-    _worker_task = None
-    _shutdown_event: asyncio.Event = asyncio.Event()
-    _current_messages: Dict[str, WhatsAppMessage] = {}
-    _current_user: str = None
-    _page: Page = None
+    """Client of one WhatsApp account, driving its own WhatsApp Web page.
+
+    Every account has its own command queue, event stream and message
+    history, so several accounts run side by side (see `WhatsAppAccounts`).
+    """
 
     LANG_PREF = "wa_web_lang_pref"
+    # Seconds the language cookie is trusted from memory. Cookies set by
+    # scripts or sub-resources are not seen by _track_session, so it is
+    # read again from the context after this long.
+    LANG_PREF_TTL = 5 * 60
     BASE_URL = "web.whatsapp.com"
     SUFFIX_LINK = "https://web.whatsapp.com/send?phone={mobile}&text&type=phone_number&app_absent=1"
-    QR_PATH = "automation_core/whatsapp/qr.png"
+    # Search term of your own chat in the en_US UI go_to_base enforces; it is
+    # also what _current_user holds while it is open.
+    ME_CHAT = "(You)"
+    # Seconds to open one chat and send its batch; a flush has no overall timeout.
+    CHAT_TIMEOUT = 120
+
+    def __init__(self, account: str = DEFAULT_ACCOUNT, store: Optional[MessageStore] = None):
+        self.account = account
+        self._state: WhatsAppLoginStatus = WhatsAppLoginStatus.NOT_LOGGED_IN
+        self.event_emitter = AsyncIOEventEmitter()
+        self._scheduler = CommandScheduler()
+        self._shutdown_event = asyncio.Event()
+        self._current_messages: Dict[str, WhatsAppMessage] = LRUDict()
+        self._store = store or MessageStore(path=self._store_path(account))
+        self._current_user: Optional[str] = None
+        self._pending_messages: Dict[Optional[str], Tuple[List[str], asyncio.Future]] = {}
+        self._flush_scheduled = False
+        self._page: Optional[Page] = None
+        self._login_event = asyncio.Event()
+        self._login_watched_page: Optional[Page] = None
+        self._initial_data_ref: Optional[str] = None
+        self._session_page: Optional[Page] = None
+        self._route: Optional[str] = None
+        self._lang_pref: Optional[str] = None
+        self._lang_pref_read = 0.0
+
+    @staticmethod
+    def _store_path(account: str) -> Path:
+        # The default account keeps the history it had before accounts existed.
+        directory = Path("./Automation_Data/whatsapp")
+        if account != DEFAULT_ACCOUNT:
+            directory /= account
+        return (directory / "messages.db").absolute()
+
+    @property
+    def page_id(self) -> str:
+        """Page of the account; every account but the default one needs a profile of its own."""
+        domain = utils.get_domain(__file__)
+        return domain if self.account == DEFAULT_ACCOUNT else f"{domain}.{self.account}"
+
+    @property
+    def state(self) -> WhatsAppLoginStatus:
+        return self._state
+
+    @property
+    def load(self) -> int:
+        """Commands and chats waiting on this account."""
+        return self._scheduler.backlog + len(self._pending_messages)
+
+    async def shutdown(self):
+        self._shutdown_event.set()
+        await self._scheduler.shutdown()
+        await self._store.close()
+
+    async def search_messages(
+        self,
+        sender: Optional[str] = None,
+        text: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        me: Optional[bool] = None,
+        limit: int = 50
+    ) -> List[dict]:
+        """Search the received messages history, newest first."""
+        return await self._store.query(
+            sender=sender,
+            text=text,
+            since=since.timestamp() if since else None,
+            until=until.timestamp() if until else None,
+            me=me,
+            limit=limit
+        )
 
-    @classmethod
-    async def shutdown(cls):
-        cls._shutdown_event.set()
-    
-    @classmethod
-    async def _start_worker(cls):
-        if cls._worker_task is None:
-            cls._worker_task = asyncio.create_task(cls._worker())
+    async def create_new_messages_listener_event(self) -> asyncio.Future:
+        return self._scheduler.spawn("messages_listener", self._create_new_messages_listener_event)
+
+    async def _create_new_messages_listener_event(self):
+        async def on_chat_changes(changes: List[dict], initial: bool = False):
+            for message_data in changes:
+                new_message = WhatsAppMessage.from_dict(message_data)
+                if initial:
+                    self._current_messages[new_message.sender] = new_message
+                    continue
+
+                message = self._current_messages.get(new_message.sender)
+                if message and new_message.sender == message.sender and (
+                    new_message.message == message.message or 
+                    new_message.is_older_than(message)):
+                    continue
+
+                self._current_messages[new_message.sender] = new_message
+                self._store.append(new_message)
+                self.event_emitter.emit(WhatsAppEventName.MESSAGE_COMING, new_message)
+
+        await self._page.expose_function("onChatChanges", on_chat_changes)
+        pane_side = await self._page.query_selector('#pane-side')
+        # Only rows touched by a mutation are read, compared against the last
+        # state seen for that chat, and real changes are sent in one call per
+        # animation frame (or after 250ms when the tab is hidden and frames
+        # are paused). The rows present at start only seed the state.
+        await self._page.evaluate(""" 
+        (pane) => {
+            const ROW = 'div[role="listitem"]';
+            const config = { attributes: true, characterData: true, childList: true, subtree: true };
+            const chats = new Map();
+            let dirty = new Set();
+            let scheduled = false;
+
+            const read = (element) => {
+                const titleElement = element.querySelector('span[title]');
+                if (!titleElement) return null;
+                const messageData = {};
+                messageData.sender = titleElement.getAttribute('title');
+                const meElement = titleElement.parentElement.querySelector('span[title] ~ span');
+                messageData.me = !!meElement;
+                const timeElement = element.querySelectorAll('div[role="gridcell"] > div')[1];
+                messageData.time = timeElement ? timeElement.textContent : '';
+                const messageElement = element.querySelector('span[dir="ltr"]');
+                messageData.message = messageElement ? messageElement.textContent : '';
+                const unreadBadge = element.querySelector('span[aria-label*="me"]');
+                messageData.unread = !!unreadBadge;
+                messageData.no_of_unread = 0;
+                if (unreadBadge) {
+                    const badgeText = unreadBadge.textContent.trim();
+                    messageData.no_of_unread = badgeText && !isNaN(badgeText) ? parseInt(badgeText) : 1;
+                }
+                return messageData;
+            };
 
-    @classmethod
-    async def _worker(cls):
-        while not cls._shutdown_event.is_set():
-            method, args, kwargs, future = await cls._task_queue.get()
-            try:
-                result = await method(*args, **kwargs)
-                future.set_result(result)
-            except Exception as e:
-                future.set_exception(e)
-            finally:
-                cls._task_queue.task_done()
+            const changed = (messageData) => {
+                const key = `${messageData.me}|${messageData.time}|${messageData.message}|${messageData.no_of_unread}`;
+                if (chats.get(messageData.sender) === key) return false;
+                chats.set(messageData.sender, key);
+                return true;
+            };
 
-    @classmethod
-    async def create_new_messages_listener_event(cls) -> asyncio.Future:
-        await cls._start_worker()
-        future = asyncio.Future()
-        await cls._task_queue.put((cls._create_new_messages_listener_event, (), {}, future))
-        return future
+            const flush = () => {
+                if (!scheduled) return;
+                scheduled = false;
+                const rows = dirty;
+                dirty = new Set();
+                const changes = [];
+                rows.forEach(row => {
+                    if (!row.isConnected) return;
+                    const messageData = read(row);
+                    if (messageData && changed(messageData)) changes.push(messageData);
+                });
+                if (changes.length) window.onChatChanges(changes);
+            };
+
+            const markDirty = (node) => {
+                const element = node.nodeType === Node.ELEMENT_NODE ? node : node.parentElement;
+                if (!element) return;
+                const row = element.closest(ROW);
+                if (row) {
+                    dirty.add(row);
+                } else {
+                    element.querySelectorAll(ROW).forEach(item => dirty.add(item));
+                }
+            };
 
-    @classmethod
-    async def _create_new_messages_listener_event(cls):
-        async def on_mutation(message_data):
-            new_message = WhatsAppMessage.from_dict(message_data)
-            message = cls._current_messages.get(new_message.sender)
-            if message and new_message.sender == message.sender and (
-                new_message.message == message.message or 
-                new_message.time < message.time):
-                return
-            
-            cls._current_messages[new_message.sender] = new_message
-            cls.event_emitter.emit(WhatsAppEventName.MESSAGE_COMING, new_message)
-
-        await cls._page.expose_function("onMutation", on_mutation)
-        pane_side = await cls._page.query_selector('#pane-side')
-        await cls._page.evaluate(""" 
-        (pane) => {
-            const config = { attributes: true, childList: true, subtree: true };
             const callback = function(mutationsList, observer) {
-                const listItems = pane.querySelectorAll('div[role="listitem"]');
-                const chatItems = Array.from(listItems).filter(item => item.querySelector('span[title]') !== null);
-                chatItems.forEach(element => {
-                    const messageData = {};
-                    const titleElement = element.querySelector('span[title]');
-                    messageData.sender = titleElement ? titleElement.getAttribute('title') : 'Unknown';
-                    const meElement = titleElement ? titleElement.parentElement.querySelector('span[title] ~ span') : null;
-                    messageData.me = !!meElement;
-                    const timeElement = element.querySelectorAll('div[role="gridcell"] > div')[1];
-                    messageData.time = timeElement ? timeElement.textContent : '';
-                    const messageElement = element.querySelector('span[dir="ltr"]');
-                    messageData.message = messageElement ? messageElement.textContent : '';
-                    const unreadBadge = element.querySelector('span[aria-label*="me"]');
-                    messageData.unread = !!unreadBadge;
-                    messageData.no_of_unread = 0;
-                    if (unreadBadge) {
-                        const badgeText = unreadBadge.textContent.trim();
-                        messageData.no_of_unread = badgeText && !isNaN(badgeText) ? parseInt(badgeText) : 1;
-                    }
-
-                    window.onMutation(messageData);
-                });
+                for (const mutation of mutationsList) {
+                    markDirty(mutation.target);
+                    mutation.addedNodes.forEach(markDirty);
+                }
+                if (scheduled || !dirty.size) return;
+                scheduled = true;
+                requestAnimationFrame(flush);
+                setTimeout(flush, 250);
             };
-            
+
+            const initial = Array.from(pane.querySelectorAll(ROW)).map(read).filter(item => item && changed(item));
+            if (initial.length) window.onChatChanges(initial, true);
+
             const observer = new MutationObserver(callback);
             observer.observe(pane, config);
         }
         """, pane_side)
-        await cls._shutdown_event.wait()
-
-    @classmethod
-    async def is_logged(cls) -> asyncio.Future:
-        await cls._start_worker()
-        future = asyncio.Future()
-        await cls._task_queue.put((cls._is_logged_impl, (), {}, future))
-        return future
-
-    @classmethod
-    async def _is_logged_impl(cls) -> bool:
-        await cls.go_to_base()
-        heading_task = asyncio.create_task(cls._page.get_by_role("button", name="Chats").wait_for())
-        login_text_task = asyncio.create_task(cls._page.wait_for_selector('text="Log into WhatsApp Web"'))
-        done, pending = await asyncio.wait(
-            [heading_task, login_text_task],
-            return_when=asyncio.FIRST_COMPLETED,
-            timeout=30
-        )
+        await self._shutdown_event.wait()
+
+    async def is_logged(self) -> asyncio.Future:
+        return self._scheduler.submit(self._is_logged_impl, priority=Priority.HIGH, timeout=60)
+
+    async def _is_logged_impl(self) -> bool:
+        await self.go_to_base()
+        heading_task = asyncio.create_task(self._page.get_by_role("button", name="Chats").wait_for())
+        login_text_task = asyncio.create_task(self._page.wait_for_selector('text="Log into WhatsApp Web"'))
+        async with METRICS.timed(MetricKind.SELECTOR_WAIT, "WhatsApp.login_screen"):
+            done, pending = await asyncio.wait(
+                [heading_task, login_text_task],
+                return_when=asyncio.FIRST_COMPLETED,
+                timeout=30
+            )
         for task in pending:
             task.cancel()
         if heading_task in done:
@@ -181,239 +387,381 @@ class WhatsApp:
         else:
             raise Exception("No se detectó 'heading' ni 'Inicia sesión en WhatsApp Web'.")
 
-    @classmethod
-    async def go_to_base(cls):
-        current_url = cls._page.url
-        base_url = f"https://{cls.BASE_URL}/"
-        cookies: List[Dict] = await cls._page.context.cookies()
-        lang_pref = next((cookie for cookie in cookies if cookie["name"] == cls.LANG_PREF), None)
-        if current_url != base_url or (lang_pref and lang_pref["value"] != "en_US"):
-            await cls._set_localization()
-            await cls._page.goto(base_url)
-
-    @classmethod
-    async def _set_localization(cls):
-        await cls._page.context.clear_cookies(name=cls.LANG_PREF)
-        await cls._page.context.add_cookies([{
-            "name": cls.LANG_PREF,
-            "value": "en_US",
-            "domain": f".{cls.BASE_URL}",
-            "path": "/",
-            "secure": True
-        }])
-
-    @classmethod
-    async def login(cls, page: Page) -> asyncio.Future:
-        cls._page = page
-        await cls._start_worker()
-        future = asyncio.Future()
-        await cls._task_queue.put((cls._login_impl, (), {}, future))
-        return future
-
-    @classmethod
-    async def _login_impl(cls) -> None:
-        if cls._state is WhatsAppLoginStatus.LOGIN_IN_PROGRESS:
-            LOGGER.info(f"login not executed - current status: {cls._state}")
+    async def go_to_base(self):
+        """Bring the page to the chat list, reloading WhatsApp Web only when needed.
+
+        The language cookie and the current route are tracked in memory (see
+        `_track_session`), so this usually costs no browser round trip when
+        the page is already there.
+        """
+        base_url = f"https://{self.BASE_URL}/"
+        self._track_session()
+        if self._lang_pref is None or monotonic() - self._lang_pref_read > self.LANG_PREF_TTL:
+            cookies: List[Dict] = await self._page.context.cookies(base_url)
+            lang_pref = next((cookie for cookie in cookies if cookie["name"] == self.LANG_PREF), None)
+            self._lang_pref = lang_pref["value"] if lang_pref else ""
+            self._lang_pref_read = monotonic()
+
+        wrong_language = self._lang_pref not in ("", "en_US")
+        route = self._route or self._page.url
+        if route == base_url and not wrong_language:
             return
-        if cls._state is WhatsAppLoginStatus.LOGGED_IN or await cls._is_logged_impl():
-            cls._state = WhatsAppLoginStatus.LOGGED_IN
-            cls.event_emitter.emit(WhatsAppEventName.LOGIN_STATUS, cls._state)
-        else:
-            cls._state = WhatsAppLoginStatus.LOGIN_IN_PROGRESS
-            await cls._handle_qr_login()
-            cls._state = WhatsAppLoginStatus.LOGGED_IN
-            cls.event_emitter.emit(WhatsAppEventName.LOGIN_STATUS, cls._state)
 
-    @classmethod
-    async def _handle_qr_login(cls):
-        while not cls._shutdown_event.is_set():
-            try:
-                if await cls._is_logged_impl():
-                    break
+        self._current_user = None
+        if not wrong_language and route.startswith(base_url) and await self._page.locator("#pane-side").count():
+            # The app is loaded and logged in: switch routes in-app instead of
+            # reloading it, which takes several seconds.
+            await self._page.evaluate("""() => {
+                history.pushState({}, '', '/');
+                window.dispatchEvent(new PopStateEvent('popstate', { state: {} }));
+            }""")
+            return
 
-                qr_selector = cls._page.get_by_role("img", name="Scan this QR code to link a")
-                await qr_selector.wait_for(timeout=utils.ONE_SECOND)
+        await self._set_localization()
+        await self._page.goto(base_url)
 
-                qr_element = await qr_selector.element_handle()
-                parent_div: ElementHandle = await qr_element.evaluate_handle("element => element.parentElement")
-                current_data_ref = await parent_div.get_attribute("data-ref")
+    def _track_session(self):
+        """Follow the route and language cookie of the page through its events."""
+        page = self._page
+        if self._session_page is page:
+            return
+        self._session_page = page
+        self._route = None
+        self._lang_pref = None
 
-                if current_data_ref != getattr(cls, "_initial_data_ref", None):
-                    local_path = f"config/www/{cls.QR_PATH}"
-                    remote_path = f"/local/{cls.QR_PATH}"
-                    await utils.take_qr_screenshot(qr_selector, local_path)
-                    cls.event_emitter.emit(WhatsAppEventName.NEW_QR_SCREENSHOT, remote_path)
-                    cls._initial_data_ref = current_data_ref
+        def on_navigated(frame):
+            if page is self._page and frame.parent_frame is None:
+                self._route = frame.url
 
-            except TimeoutError:
-                pass
+        def on_response(response):
+            if (page is self._page and self.BASE_URL in response.url
+                    and response.request.resource_type == "document"):
+                asyncio.ensure_future(check_cookies(response))
 
-    @classmethod
-    async def logout(cls) -> asyncio.Future:
-        await cls._start_worker()
-        future = asyncio.Future()
-        await cls._task_queue.put((cls._logout_impl, (), {}, future))
-        return future
+        async def check_cookies(response):
+            try:
+                set_cookie = await response.header_value("set-cookie")
+            except Exception:
+                set_cookie = None
+            if set_cookie and self.LANG_PREF in set_cookie:
+                self._lang_pref = None
+
+        page.on("framenavigated", on_navigated)
+        page.on("response", on_response)
+
+    async def _set_localization(self):
+        await self._page.context.clear_cookies(name=self.LANG_PREF)
+        await self._page.context.add_cookies([{
+            "name": self.LANG_PREF,
+            "value": "en_US",
+            "domain": f".{self.BASE_URL}",
+            "path": "/",
+            "secure": True
+        }])
+        self._lang_pref = "en_US"
+        self._lang_pref_read = monotonic()
+
+    async def login(self, page: Page) -> asyncio.Future:
+        self._page = page
+        return self._scheduler.submit(self._login_impl, priority=Priority.HIGH, timeout=None)
+
+    async def attach_page(self, page: Page) -> Optional[asyncio.Future]:
+        """Move to a recycled page, logging in again and restoring the listener."""
+        if self._page is None:
+            return None
+        self._page = page
+        listening = self._scheduler.cancel("messages_listener")
+        if self._state is WhatsAppLoginStatus.LOGIN_IN_PROGRESS:
+            # The QR login holds the exclusive lane while it waits for
+            # _login_event, so the watcher is moved to the new page directly.
+            await self._watch_login()
+            await self.go_to_base()
+            return None
+        return self._scheduler.submit(self._reattach_impl, listening, priority=Priority.HIGH, timeout=None)
+
+    async def _reattach_impl(self, listening: bool) -> None:
+        if self._state is WhatsAppLoginStatus.LOGGED_IN:
+            self._state = WhatsAppLoginStatus.NOT_LOGGED_IN
+            await self._login_impl()
+        if listening:
+            self._scheduler.spawn("messages_listener", self._create_new_messages_listener_event)
+
+    async def _login_impl(self) -> None:
+        if self._state is WhatsAppLoginStatus.LOGIN_IN_PROGRESS:
+            LOGGER.info(f"login not executed - current status: {self._state}")
+            return
+        if self._state is WhatsAppLoginStatus.LOGGED_IN or await self._is_logged_impl():
+            self._state = WhatsAppLoginStatus.LOGGED_IN
+            self.event_emitter.emit(WhatsAppEventName.LOGIN_STATUS, self._state)
+        else:
+            self._state = WhatsAppLoginStatus.LOGIN_IN_PROGRESS
+            self.event_emitter.emit(WhatsAppEventName.LOGIN_STATUS, self._state)
+            await self._handle_qr_login()
+            self._state = WhatsAppLoginStatus.LOGGED_IN
+            self.event_emitter.emit(WhatsAppEventName.LOGIN_STATUS, self._state)
+
+    async def _handle_qr_login(self):
+        self._login_event.clear()
+        await self._watch_login()
+        login = asyncio.create_task(self._login_event.wait())
+        shutdown = asyncio.create_task(self._shutdown_event.wait())
+        _, pending = await asyncio.wait([login, shutdown], return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
 
-    @classmethod
-    async def _logout_impl(cls) -> None:
-        settings = cls._page.get_by_role("button", name="Ajustes")
+    async def _watch_login(self):
+        """Report QR rotations and the chat list appearing through onLoginState.
+
+        The watcher is also installed as an init script, so it survives the
+        reloads WhatsApp Web does while a device is being linked.
+        """
+        page = self._page
+        if self._login_watched_page is not page:
+            self._login_watched_page = page
+            await page.expose_function("onLoginState", self._on_login_state)
+            await page.add_init_script(script=f"({LOGIN_WATCHER})()")
+        await page.evaluate(LOGIN_WATCHER)
+
+    def _on_login_state(self, state: dict):
+        if state.get("logged_in"):
+            self._login_event.set()
+        elif (data_ref := state.get("qr")) and data_ref != self._initial_data_ref:
+            # data-ref is the QR payload itself; listeners render it.
+            self._initial_data_ref = data_ref
+            self.event_emitter.emit(WhatsAppEventName.NEW_QR_CODE, data_ref)
+
+    async def logout(self) -> asyncio.Future:
+        return self._scheduler.submit(self._logout_impl, priority=Priority.HIGH)
+
+    async def _logout_impl(self) -> None:
+        settings = self._page.get_by_role("button", name="Ajustes")
         await settings.click()
-        logout_button = cls._page.get_by_role("button", name="Cerrar sesión")
+        logout_button = self._page.get_by_role("button", name="Cerrar sesión")
         await logout_button.click()
-        confirm_logout = cls._page.get_by_label("¿Deseas cerrar sesión?").get_by_role("button", name="Cerrar sesión")
+        confirm_logout = self._page.get_by_label("¿Deseas cerrar sesión?").get_by_role("button", name="Cerrar sesión")
         await confirm_logout.click()
         LOGGER.info("Sesión cerrada")
 
-    @classmethod
-    async def find_by_name(cls, name: str) -> asyncio.Future:
-        if (cls._current_user == name):
+    async def find_by_name(self, name: str) -> asyncio.Future:
+        return self._scheduler.submit(self._find_by_name_impl, name)
+
+    async def _find_by_name_impl(self, name: str) -> None:
+        if (self._current_user == name):
             return
 
-        search_box = cls._page.get_by_role("textbox", name="Search").get_by_role("paragraph")
-        await search_box.click()
+        search_box = self._page.get_by_role("textbox", name="Search").get_by_role("paragraph")
+        async with METRICS.timed(MetricKind.SELECTOR_WAIT, "WhatsApp.search_box"):
+            await search_box.click()
         await search_box.fill(name)
-        await cls._page.get_by_label("Search results.").get_by_role("listitem").get_by_text(name).first.click()
-        cls._current_user = name
-
-    @classmethod
-    async def find_me(cls) -> asyncio.Future:
-        await cls._start_worker()
-        future = asyncio.Future()
-        await cls._task_queue.put((cls._find_me_impl, (), {}, future))
-        return future
-
-    @classmethod
-    async def _find_me_impl(cls) -> None:
-        await cls._find_by_name_impl("(Tú)")
-
-    @classmethod
-    async def find_user(cls, mobile: str) -> asyncio.Future:
-        await cls._start_worker()
-        future = asyncio.Future()
-        await cls._task_queue.put((cls._find_user_impl, (mobile), {}, future))
-        return future
-
-    @classmethod
-    async def _find_user_impl(cls, mobile: str) -> None:
-        url = cls.SUFFIX_LINK.format(mobile=mobile)
-        await cls._page.goto(url)
-        message_input = cls._page.get_by_role("textbox", name="Escribe un mensaje")
-        await message_input.wait_for(timeout=utils.minutes(1))
+        async with METRICS.timed(MetricKind.SELECTOR_WAIT, "WhatsApp.search_result"):
+            await self._page.get_by_label("Search results.").get_by_role("listitem").get_by_text(name).first.click()
+        self._current_user = name
+
+    async def find_me(self) -> asyncio.Future:
+        return self._scheduler.submit(self._find_me_impl)
+
+    async def _find_me_impl(self) -> None:
+        await self._find_by_name_impl(self.ME_CHAT)
+
+    async def find_user(self, mobile: str) -> asyncio.Future:
+        return self._scheduler.submit(self._find_user_impl, mobile)
+
+    async def _find_user_impl(self, mobile: str) -> None:
+        url = self.SUFFIX_LINK.format(mobile=mobile)
+        await self._page.goto(url)
+        async with METRICS.timed(MetricKind.SELECTOR_WAIT, "WhatsApp.message_input"):
+            await self._message_input().wait_for(timeout=utils.minutes(1))
+        self._current_user = mobile
+
+    async def _open_chat(self, mobile: Optional[str]) -> None:
+        if mobile is None:
+            await self._find_me_impl()
+        elif self._current_user != mobile:
+            await self._find_user_impl(mobile)
+
+    def _message_input(self):
+        return self._page.get_by_role("textbox", name="Type a message")
+
+    async def send_me_message(self, message: str) -> asyncio.Future:
+        return self._scheduler.submit(self._send_me_message_impl, message)
+
+    async def _send_me_message_impl(self, message: str) -> None:
+        await self._find_me_impl()
+        await self._send_message_impl(message)
+
+    async def send_message(self, message: str) -> asyncio.Future:
+        return self._scheduler.submit(self._send_message_impl, message)
+
+    async def queue_message(self, message: str, mobile: Optional[str] = None) -> asyncio.Future:
+        """Queue a message for `mobile` (or yourself) to be sent in the next batch.
+
+        Messages queued for the same chat before the batch runs are sent
+        together as a single message, so a burst of notifications opens each
+        chat once. The returned future resolves once that chat is flushed.
+        """
+        if mobile in self._pending_messages:
+            messages, future = self._pending_messages[mobile]
+            messages.append(message)
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self._pending_messages[mobile] = ([message], future)
 
-    @classmethod
-    async def send_me_message(cls, message: str) -> asyncio.Future:
-        await cls._start_worker()
-        future = asyncio.Future()
-        await cls._task_queue.put((cls._send_me_message_impl, (message), {}, future))
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self._scheduler.submit(self._flush_messages_impl, timeout=None)
         return future
 
-    @classmethod
-    async def _send_me_message_impl(cls, message: str) -> None:
-        await cls._find_me_impl()
-        await cls._send_message_impl(message)
-
-    @classmethod
-    async def send_message(cls, message: str) -> asyncio.Future:
-        await cls._start_worker()
-        future = asyncio.Future()
-        await cls._task_queue.put((cls._send_message_impl, (message,), {}, future))
-        return future
-    
-    @classmethod
-    async def _message_cooldown(cls, message: str):
-        await asyncio.sleep(1)
-        if (cls._current_user and cls._current_messages[cls._current_user]):
-            current_message: WhatsAppMessage = cls._current_messages[cls._current_user]
+    async def _flush_messages_impl(self) -> None:
+        self._flush_scheduled = False
+        pending, self._pending_messages = self._pending_messages, {}
+        # Start with the chat that is already open to save one navigation.
+        recipients = sorted(pending, key=lambda mobile: mobile != self._current_user)
+        try:
+            for mobile in recipients:
+                messages, future = pending[mobile]
+                try:
+                    await asyncio.wait_for(self._send_chat_impl(mobile, "\n".join(messages)), timeout=self.CHAT_TIMEOUT)
+                    if not future.done():
+                        future.set_result(len(messages))
+                except Exception as e:
+                    if not future.done():
+                        future.set_exception(e)
+        finally:
+            # Cancelled mid-batch: callers of the chats not sent yet must not wait forever.
+            for _, future in pending.values():
+                if not future.done():
+                    future.cancel()
+
+    async def _send_chat_impl(self, mobile: Optional[str], message: str) -> None:
+        await self._open_chat(mobile)
+        await self._send_message_impl(message)
+
+    def _remember_sent(self, message: str):
+        current_message = self._current_messages.get(self._current_user)
+        if current_message:
             current_message.message = message
-            now = datetime.now().time()
-            dt = datetime.combine(datetime.today().date(), now)
-            dt_plus_5 = dt + timedelta(seconds=5)
-            current_message.time = dt_plus_5.time()
-
-    @classmethod
-    async def _send_message_impl(cls, message: str) -> None:
-        cls._message_cooldown(message)
-        input_box = cls._page.get_by_role("textbox", name="Type a message")
-        await input_box.click()
-        for line in message.split("\n"):
-            await input_box.type(line)
-            await cls._page.keyboard.press("Shift+Enter")
-        await cls._page.keyboard.press("Enter")
-
-    @classmethod
-    async def send_media(cls, file_path: Path, message: Optional[str] = None, media_type: str = "image") -> asyncio.Future:
-        await cls._start_worker()
-        future = asyncio.Future()
-        await cls._task_queue.put((cls._send_media_impl, (file_path), {"message": message, "media_type": media_type}, future))
-        return future
-
-    @classmethod
-    async def _send_media_impl(cls, file_path: Path, message: Optional[str] = None, media_type: str = "image") -> None:
-        await cls._message_cooldown(message)
-        await cls._page.get_by_role("button", name="Attach").click()
-        async with cls._page.expect_file_chooser() as fc_info:
+            # Labels only carry minutes, so the echo of this message in the
+            # chat list compares equal instead of newer.
+            current_message.time = datetime.now().replace(second=0, microsecond=0)
+            current_message.received = monotonic()
+
+    async def _send_message_impl(self, message: str) -> None:
+        self._remember_sent(message)
+        input_box = self._message_input()
+        async with METRICS.timed(MetricKind.SELECTOR_WAIT, "WhatsApp.message_input"):
+            await input_box.click()
+        # insert_text pastes the whole body at once, line breaks included,
+        # instead of typing it key by key.
+        await self._page.keyboard.insert_text(message)
+        await self._page.keyboard.press("Enter")
+
+    async def send_media(self, file_path: Path, message: Optional[str] = None, media_type: str = "image") -> asyncio.Future:
+        return self._scheduler.submit(self._send_media_impl, file_path, message=message, media_type=media_type)
+
+    async def _send_media_impl(self, file_path: Path, message: Optional[str] = None, media_type: str = "image") -> None:
+        self._remember_sent(message)
+        await self._page.get_by_role("button", name="Attach").click()
+        async with self._page.expect_file_chooser() as fc_info:
             if media_type == "image":
-                await cls._page.get_by_role("button", name="Photos & videos").click()
+                await self._page.get_by_role("button", name="Photos & videos").click()
             elif media_type == "document":
-                await cls._page.get_by_role("button", name="Document").click()
+                await self._page.get_by_role("button", name="Document").click()
 
             file_chooser = await fc_info.value
             await file_chooser.set_files(file_path)
 
         if message:
-            caption = cls._page.get_by_role("textbox", name="Add a caption")
-            await caption.wait_for()
-            await caption.type(message)
-        await cls._page.get_by_role("button", name="Send", exact=True).click()
+            caption = self._page.get_by_role("textbox", name="Add a caption")
+            async with METRICS.timed(MetricKind.SELECTOR_WAIT, "WhatsApp.caption"):
+                await caption.wait_for()
+            await caption.fill(message)
+        await self._page.get_by_role("button", name="Send", exact=True).click()
         LOGGER.info(f"File {file_path} Sent")
 
-    @classmethod
-    async def send_image(cls, image_path: Path, caption: Optional[str] = None) -> asyncio.Future:
-        await cls._start_worker()
-        future = asyncio.Future()
-        await cls._task_queue.put((cls._send_image_impl, (image_path), {"caption": caption}, future))
-        return future
-
-    @classmethod
-    async def _send_image_impl(cls, image_path: Path, caption: Optional[str] = None) -> None:
-        await cls._send_media_impl(image_path, caption, "image")
-
-    @classmethod
-    async def send_video(cls, video_path: Path, caption: Optional[str] = None) -> asyncio.Future:
-        await cls._start_worker()
-        future = asyncio.Future()
-        await cls._task_queue.put((cls._send_video_impl, (video_path), {"caption": caption}, future))
-        return future
-
-    @classmethod
-    async def _send_video_impl(cls, video_path: Path, caption: Optional[str] = None) -> None:
-        await cls._send_media_impl(video_path, caption, "video")
-
-    @classmethod
-    async def send_document(cls, doc_path: Path, caption: Optional[str] = None) -> asyncio.Future:
-        await cls._start_worker()
-        future = asyncio.Future()
-        await cls._task_queue.put((cls._send_document_impl, (doc_path), {"caption": caption}, future))
-        return future
-
-    @classmethod
-    async def _send_document_impl(cls, doc_path: Path, caption: Optional[str] = None) -> None:
-        await cls._send_media_impl(doc_path, caption, "document")
-
-    @classmethod
-    async def send_me_and_wait(cls, message: str) -> asyncio.Future:
-        await cls._start_worker()
-        future = asyncio.Future()
-        await cls._task_queue.put((cls._send_me_and_wait_impl, (message), {}, future))
-        return future
-
-    @classmethod
-    async def _send_me_and_wait_impl(cls, message: str) -> str:
-        await cls._send_me_message_impl(message)
-        rows = cls._page.get_by_role("application").get_by_role("row")
-        chat_current_length = await rows.count()
-        await expect(rows).to_have_count(chat_current_length + 1, timeout=utils.minutes(10))
-        last_message = rows.last.locator(".selectable-text")
-        messages = await last_message.all_text_contents()
-        return "".join(messages)
\ No newline at end of file
+    async def send_image(self, image_path: Path, caption: Optional[str] = None) -> asyncio.Future:
+        return self._scheduler.submit(self._send_image_impl, image_path, caption=caption)
+
+    async def _send_image_impl(self, image_path: Path, caption: Optional[str] = None) -> None:
+        await self._send_media_impl(image_path, caption, "image")
+
+    async def send_video(self, video_path: Path, caption: Optional[str] = None) -> asyncio.Future:
+        return self._scheduler.submit(self._send_video_impl, video_path, caption=caption)
+
+    async def _send_video_impl(self, video_path: Path, caption: Optional[str] = None) -> None:
+        await self._send_media_impl(video_path, caption, "video")
+
+    async def send_document(self, doc_path: Path, caption: Optional[str] = None) -> asyncio.Future:
+        return self._scheduler.submit(self._send_document_impl, doc_path, caption=caption)
+
+    async def _send_document_impl(self, doc_path: Path, caption: Optional[str] = None) -> None:
+        await self._send_media_impl(doc_path, caption, "document")
+
+    async def send_me_and_wait(self, message: str) -> asyncio.Future:
+        sent = self._scheduler.submit(self._send_me_tracked_impl, message)
+        return asyncio.ensure_future(self._wait_reply_after(sent))
+
+    async def _send_me_tracked_impl(self, message: str) -> Tuple[List[str], str]:
+        """Send to yourself; returns the message ids the reply is not, and your chat jid."""
+        await self._find_me_impl()
+        # Read before sending, in the same command, so a quick reply is not missed.
+        known = await self._page.evaluate(MESSAGE_IDS)
+        await self._send_message_impl(message)
+        sent = await self._new_message_id(known, None, utils.seconds(30))
+        return known + [sent], sent.split("_")[1]
+
+    async def _wait_reply_after(self, sent: asyncio.Future) -> str:
+        known, chat = await sent
+        # Waiting for the reply only reads the chat, so it must not hold the
+        # exclusive lane for up to ten minutes.
+        return await self._scheduler.submit(self._wait_reply_impl, known, chat, exclusive=False, timeout=None)
+
+    async def _new_message_id(self, known: List[str], chat: Optional[str], timeout: float) -> str:
+        handle = await self._page.wait_for_function(NEW_MESSAGE_ID, arg=[known, chat], timeout=timeout)
+        return await handle.json_value()
+
+    async def _wait_reply_impl(self, known: List[str], chat: str) -> str:
+        # Matched by id within your chat, so messages arriving in between,
+        # re-renders and other chats opened meanwhile are never taken for it.
+        reply_id = await self._new_message_id(known, chat, utils.minutes(10))
+        messages = await self._page.locator(f'#main [data-id="{reply_id}"] .selectable-text').all_text_contents()
+        return "".join(messages)
+
+class WhatsAppAccounts:
+    """The WhatsApp clients of one installation, keyed by account."""
+
+    def __init__(self):
+        self._clients: Dict[str, WhatsApp] = {}
+
+    def get(self, account: str = DEFAULT_ACCOUNT) -> WhatsApp:
+        if account not in self._clients:
+            self._clients[account] = WhatsApp(account)
+        return self._clients[account]
+
+    def __contains__(self, account: str) -> bool:
+        return account in self._clients
+
+    def __iter__(self):
+        return iter(list(self._clients.values()))
+
+    def pick(self, mobile: Optional[str] = None) -> WhatsApp:
+        """The account that should send the next message to `mobile`.
+
+        Messages to yourself stay on the default account. Otherwise a chat
+        that already has messages waiting keeps its account, so they still
+        go out as one, and new chats go to the logged in account with the
+        shortest backlog.
+        """
+        if mobile is None or not self._clients:
+            return self.get()
+        clients = [client for client in self if client.state is WhatsAppLoginStatus.LOGGED_IN] or list(self)
+        for client in clients:
+            if mobile in client._pending_messages:
+                return client
+        return min(clients, key=lambda client: client.load)
+
+    async def queue_message(self, message: str, mobile: Optional[str] = None) -> asyncio.Future:
+        """Queue a message on the account picked for `mobile` (see `pick`)."""
+        return await self.pick(mobile).queue_message(message, mobile)
+
+    async def shutdown(self):
+        await asyncio.gather(*(client.shutdown() for client in self), return_exceptions=True)
@@ -1,26 +1,20 @@
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from custom_components.automation_core.entity import NotifyAutomationEntity
+from custom_components.automation_core.automations.whatsapp.account import WhatsAppAccountEntity
+from custom_components.automation_core.automations.whatsapp.lib import DEFAULT_ACCOUNT
 
-class WhatsApp(NotifyAutomationEntity):
+class WhatsApp(WhatsAppAccountEntity, NotifyAutomationEntity):
     """Implementation of WhatsApp notification service."""
 
-    def __init__(self, hass:HomeAssistant, config_entry: ConfigEntry):
-        super().__init__(hass, config_entry)
-        self._attr_name = "WhatsApp"
-        self._attr_unique_id = f"{config_entry.entry_id}_notify"
-        self._attr_device_info = DeviceInfo(
-            name="WhatsApp",
-            entry_type=DeviceEntryType.SERVICE,
-            identifiers={(self._domain, config_entry.entry_id)},
-            manufacturer="oklee",
-            model="WhatsApp",
-        )
+    def __init__(self, hass:HomeAssistant, config_entry: ConfigEntry, account: str = DEFAULT_ACCOUNT):
+        super().__init__(hass, config_entry, account)
+        self._attr_name = self._account_name("WhatsApp")
+        self._attr_unique_id = self._account_id(f"{config_entry.entry_id}_notify")
 
-    async def async_send_message(self, message: str, **kwargs) -> None:
+    async def async_send_message(self, message: str, title: str | None = None) -> None:
         """Send a message via WhatsApp."""
-        # Aquí va la lógica para enviar el mensaje por WhatsApp
-        print(f"Enviando mensaje por WhatsApp: {message}")
-        # Ejemplo: podrías usar una API externa o una biblioteca
-        # await self.hass.async_add_executor_job(send_whatsapp_message, message)
\ No newline at end of file
+        if title:
+            message = f"*{title}*\n{message}"
+        # Not awaiting delivery lets notifications fired back to back share a batch.
+        await self._client.queue_message(message)
@@ -1,35 +1,26 @@
-from homeassistant.core import HomeAssistant, Event
+from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from custom_components.automation_core.entity import SensorAutomationEntity
-from custom_components.automation_core.automations.whatsapp.lib import WhatsApp
+from custom_components.automation_core.automations.whatsapp.account import WhatsAppAccountEntity
+from custom_components.automation_core.automations.whatsapp.lib import DEFAULT_ACCOUNT, WhatsAppEventName, WhatsAppLoginStatus
 
-class WhatsAppLoginSensor(SensorAutomationEntity):
+class WhatsAppLoginSensor(WhatsAppAccountEntity, SensorAutomationEntity):
     """Sensor to show WhatsApp login status."""
 
-    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry):
-        super().__init__(hass, config_entry)
-        self._attr_name = "WhatsApp Login Status"
-        self._attr_unique_id = f"{config_entry.entry_id}_login_status"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(self._domain, config_entry.entry_id)},
-            name="WhatsApp",
-            model="WhatsApp",
-            manufacturer="oklee",
-            entry_type=DeviceEntryType.SERVICE,
-        )
+    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry, account: str = DEFAULT_ACCOUNT):
+        super().__init__(hass, config_entry, account)
+        self._attr_name = self._account_name("WhatsApp Login Status")
+        self._attr_unique_id = self._account_id(f"{config_entry.entry_id}_login_status")
 
-        self._state = WhatsApp._state
-        event_name = f"event.{self._domain}_login_status"
-        hass.bus.async_listen(event_name, self._handle_event)
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        emitter = self._client.event_emitter
+        emitter.on(WhatsAppEventName.LOGIN_STATUS, self._handle_login_status)
+        self.async_on_remove(lambda: emitter.remove_listener(WhatsAppEventName.LOGIN_STATUS, self._handle_login_status))
 
-    async def _handle_event(self, event: Event):
-        """Handle the event."""
-        new_state = event.data.get("state")
-        if new_state:
-            WhatsApp._state = new_state
-            self.async_write_ha_state()
+    def _handle_login_status(self, status: WhatsAppLoginStatus) -> None:
+        self.async_write_ha_state()
 
     @property
     def state(self):
-        return WhatsApp._state
\ No newline at end of file
+        return self._client.state
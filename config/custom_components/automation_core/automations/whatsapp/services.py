@@ -0,0 +1,70 @@
+from typing import Callable
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+from custom_components.automation_core.utils import get_main_domain
+from custom_components.automation_core.automations.whatsapp.account import get_accounts
+from custom_components.automation_core.automations.whatsapp.lib import DEFAULT_ACCOUNT, WhatsApp
+
+SEARCH_SERVICE = "search_whatsapp_messages"
+SEARCH_SCHEMA = vol.Schema({
+    # Accounts are keyed by their slug, as configured_accounts stores them.
+    vol.Optional("account", default=DEFAULT_ACCOUNT): cv.slugify,
+    vol.Optional("sender"): cv.string,
+    vol.Optional("text"): cv.string,
+    vol.Optional("since"): cv.datetime,
+    vol.Optional("until"): cv.datetime,
+    vol.Optional("me"): cv.boolean,
+    vol.Optional("limit", default=50): vol.All(vol.Coerce(int), vol.Range(min=1, max=1000)),
+})
+
+SEND_SERVICE = "send_whatsapp_message"
+SEND_SCHEMA = vol.Schema({
+    vol.Required("message"): cv.string,
+    vol.Required("mobile"): cv.string,
+    vol.Optional("account"): cv.slugify,
+})
+
+@callback
+def async_setup_automation(hass: HomeAssistant, config_entry: ConfigEntry) -> Callable[[], None]:
+    """Register the WhatsApp services, which cover every account; returns their removal."""
+    domain = get_main_domain()
+
+    def client(account: str) -> WhatsApp:
+        accounts = get_accounts(hass)
+        if account not in accounts:
+            raise ServiceValidationError(f"Unknown WhatsApp account: {account}")
+        return accounts.get(account)
+
+    async def search_messages(call: ServiceCall) -> ServiceResponse:
+        """Search the stored history of received messages of one account."""
+        data = dict(call.data)
+        account = data.pop("account")
+        for key in ("since", "until"):
+            if key in data and data[key].tzinfo is None:
+                data[key] = data[key].replace(tzinfo=dt_util.get_default_time_zone())
+        messages = await client(account).search_messages(**data)
+        return {"messages": messages}
+
+    async def send_message(call: ServiceCall) -> None:
+        """Send a message to a phone number, from the given account or the least busy one."""
+        if (account := call.data.get("account")) is None:
+            await get_accounts(hass).queue_message(call.data["message"], call.data["mobile"])
+        else:
+            await client(account).queue_message(call.data["message"], call.data["mobile"])
+
+    hass.services.async_register(
+        domain, SEARCH_SERVICE, search_messages, schema=SEARCH_SCHEMA, supports_response=SupportsResponse.ONLY
+    )
+    hass.services.async_register(domain, SEND_SERVICE, send_message, schema=SEND_SCHEMA)
+
+    def remove() -> None:
+        for service in (SEARCH_SERVICE, SEND_SERVICE):
+            hass.services.async_remove(domain, service)
+
+    return remove
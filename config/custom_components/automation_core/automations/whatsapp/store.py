@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import sqlite3
+import time
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, List, Optional
+
+LOGGER = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    sender TEXT NOT NULL,
+    me INTEGER NOT NULL,
+    message TEXT NOT NULL,
+    time_label TEXT,
+    received_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_sender_received ON messages (sender, received_at);
+CREATE INDEX IF NOT EXISTS messages_received ON messages (received_at);
+"""
+
+class LRUDict(OrderedDict):
+    """Dict that forgets its least recently written keys past `maxsize`."""
+
+    def __init__(self, maxsize: int = 512):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __setitem__(self, key, value) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+
+@dataclass
+class MessageStore:
+    """Append-only SQLite (WAL) history of received messages.
+
+    Writes are buffered and committed in batches; all database work runs on a
+    single dedicated thread so the event loop never blocks on disk.
+    """
+    path: Path = field(default_factory=lambda: Path("./Automation_Data/whatsapp/messages.db").absolute())
+    retention_days: int = 90
+    flush_interval: float = 1
+    max_buffer: int = 200
+    _buffer: List[tuple] = field(default_factory=list)
+    _flush_task: Optional[asyncio.Task] = None
+    _connection: Optional[sqlite3.Connection] = None
+    _executor: ThreadPoolExecutor = field(default_factory=lambda: ThreadPoolExecutor(max_workers=1, thread_name_prefix="whatsapp_store"))
+
+    async def _run(self, method: Callable[..., Any], *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, method, *args)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            cutoff = time.time() - self.retention_days * 86400
+            connection.execute("DELETE FROM messages WHERE received_at < ?", (cutoff,))
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def append(self, message) -> None:
+        """Buffer a received message; it is written within `flush_interval`."""
+        self._buffer.append((
+            message.sender,
+            int(message.me),
+            message.message,
+            str(message.time) if message.time is not None else None,
+            time.time()
+        ))
+        if len(self._buffer) >= self.max_buffer:
+            asyncio.ensure_future(self.flush())
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.ensure_future(self._delayed_flush())
+
+    async def _delayed_flush(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        await self.flush()
+
+    async def flush(self) -> None:
+        rows, self._buffer = self._buffer, []
+        if rows:
+            try:
+                await self._run(self._write, rows)
+            except Exception as e:
+                LOGGER.error(f"Storing {len(rows)} messages failed: {e}")
+
+    def _write(self, rows: List[tuple]) -> None:
+        connection = self._connect()
+        connection.executemany(
+            "INSERT INTO messages (sender, me, message, time_label, received_at) VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+        connection.commit()
+
+    async def query(
+        self,
+        sender: Optional[str] = None,
+        text: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        me: Optional[bool] = None,
+        limit: int = 50
+    ) -> List[dict]:
+        """Newest first; `since`/`until` are unix timestamps."""
+        await self.flush()
+        clauses, params = [], []
+        if sender is not None:
+            clauses.append("sender = ?")
+            params.append(sender)
+        if text:
+            # Matched literally: % and _ in the text are not wildcards.
+            clauses.append("message LIKE ? ESCAPE '\\'")
+            escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+        if since is not None:
+            clauses.append("received_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("received_at <= ?")
+            params.append(until)
+        if me is not None:
+            clauses.append("me = ?")
+            params.append(int(me))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT sender, me, message, time_label, received_at FROM messages {where} ORDER BY received_at DESC LIMIT ?"
+        params.append(limit)
+        return await self._run(self._read, sql, params)
+
+    def _read(self, sql: str, params: list) -> List[dict]:
+        rows = self._connect().execute(sql, params).fetchall()
+        return [{**dict(row), "me": bool(row["me"])} for row in rows]
+
+    async def close(self) -> None:
+        """Write what is buffered, then release the database and its thread."""
+        await self.flush()
+        if self._connection is not None:
+            await self._run(self._connection.close)
+            self._connection = None
+        self._executor.shutdown(wait=False)
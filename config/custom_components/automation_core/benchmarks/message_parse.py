@@ -0,0 +1,54 @@
+import os
+import sys
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
+os.chdir(ROOT_DIR)
+sys.path.append(ROOT_DIR)
+
+import logging
+import random
+import timeit
+from custom_components.automation_core.automations.whatsapp.lib import WhatsAppMessage, parse_time_label
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+LOGGER = logging.getLogger(__name__)
+
+ROWS = 5000
+REPEAT = 5
+LABELS = ["Yesterday", "Monday", "Friday", "10/14/2026", ""] + [
+    f"{hour}:{minute:02d} {period}" for hour in range(1, 13) for minute in range(0, 60, 7) for period in ("AM", "PM", "p.m.")
+]
+
+def make_rows(count: int) -> list:
+    rng = random.Random(0)
+    return [{
+        "sender": f"Contact {rng.randrange(200)}",
+        "me": rng.random() < 0.1,
+        "time": rng.choice(LABELS),
+        "message": f"message {index}",
+        "unread": rng.random() < 0.3,
+        "no_of_unread": rng.randrange(5),
+    } for index in range(count)]
+
+def parse(rows: list) -> None:
+    for row in rows:
+        WhatsAppMessage.from_dict(row)
+
+def main():
+    rows = make_rows(ROWS)
+
+    parse_time_label.cache_clear()
+    cold = timeit.timeit(lambda: parse(rows), number=1)
+    warm = min(timeit.repeat(lambda: parse(rows), number=1, repeat=REPEAT))
+
+    LOGGER.info(f"{ROWS} rows, {len(LABELS)} distinct time labels")
+    LOGGER.info(f"cold cache: {ROWS / cold:,.0f} rows/s")
+    LOGGER.info(f"warm cache: {ROWS / warm:,.0f} rows/s ({warm / ROWS * 1e6:.2f} µs/row)")
+    LOGGER.info(f"label cache: {parse_time_label.cache_info()}")
+
+if __name__ == "__main__":
+    main()
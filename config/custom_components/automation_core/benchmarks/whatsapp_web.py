@@ -0,0 +1,236 @@
+import os
+import sys
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
+os.chdir(ROOT_DIR)
+sys.path.append(ROOT_DIR)
+
+import argparse
+import asyncio
+import logging
+import resource
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from playwright.async_api import Page, Route
+from custom_components.automation_core.service import AutomationService
+from custom_components.automation_core.automations.whatsapp.lib import WhatsApp, WhatsAppEventName, WhatsAppLoginStatus, WhatsAppMessage
+from custom_components.automation_core.automations.whatsapp.store import MessageStore
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+LOGGER = logging.getLogger(__name__)
+
+FIXTURE = Path(__file__).parent / "fixtures" / "whatsapp_web.html"
+SELF_CHAT = "Benchmark (You)"
+CONTACTS = 30
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Drive WhatsApp against a local stand-in of WhatsApp Web.")
+    parser.add_argument("--qr-rotations", type=int, default=0, help="start logged out and link the device after this many QR codes")
+    parser.add_argument("--qr-interval", type=int, default=500, help="milliseconds between QR rotations while logged out")
+    parser.add_argument("--reloads", type=int, default=0, help="go_to_base calls that have to reload the app")
+    parser.add_argument("--messages", type=int, default=200, help="messages sent one by one")
+    parser.add_argument("--batch", type=int, default=200, help="messages queued in one burst")
+    parser.add_argument("--incoming", type=int, default=300, help="incoming messages for the listener latency")
+    parser.add_argument("--interval", type=float, default=0.02, help="seconds between incoming messages")
+    parser.add_argument("--duration", type=float, default=0, help="seconds of mixed load to watch memory over")
+    parser.add_argument("--sample", type=float, default=10, help="seconds between memory samples")
+    parser.add_argument("--headed", action="store_true")
+    return parser.parse_args()
+
+async def serve_fixture(route: Route) -> None:
+    await route.fulfill(path=str(FIXTURE), content_type="text/html")
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize() / 1024 / 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+async def js_heap_mb(session) -> float:
+    metrics = (await session.send("Performance.getMetrics"))["metrics"]
+    heap = next(metric["value"] for metric in metrics if metric["name"] == "JSHeapUsedSize")
+    return heap / 1024 / 1024
+
+def bench_cookie(name: str, value: str) -> dict:
+    return {"name": name, "value": value, "domain": f".{WhatsApp.BASE_URL}", "path": "/", "secure": True}
+
+async def bench_qr_login(whatsapp: WhatsApp, page: Page, rotations: int, interval: int) -> None:
+    """Log in through the QR screen: QR events from the login observer, then login detection."""
+    qr_times: List[float] = []
+    enough = asyncio.Event()
+
+    def on_qr(data_ref: str):
+        qr_times.append(time.perf_counter())
+        if len(qr_times) >= rotations:
+            enough.set()
+
+    await page.context.add_cookies([bench_cookie("bench_logged_out", str(interval))])
+    whatsapp.event_emitter.add_listener(WhatsAppEventName.NEW_QR_CODE, on_qr)
+    try:
+        started = time.perf_counter()
+        login = await whatsapp.login(page)
+        await asyncio.wait_for(enough.wait(), timeout=30 + rotations * interval / 1000)
+        LOGGER.info(f"qr: first code after {qr_times[0] - started:.2f}s, {len(qr_times)} codes")
+        if len(qr_times) > 1:
+            gaps = [(b - a) * 1000 - interval for a, b in zip(qr_times, qr_times[1:])]
+            LOGGER.info(f"qr: rotation detected {statistics.mean(gaps):.1f}ms after it happened on average")
+
+        await page.context.clear_cookies(name="bench_logged_out")
+        linked = time.perf_counter()
+        await page.evaluate("bench.setLoggedIn(true)")
+        await login
+        LOGGER.info(f"qr: login detected {(time.perf_counter() - linked) * 1000:.1f}ms after linking")
+    finally:
+        whatsapp.event_emitter.remove_listener(WhatsAppEventName.NEW_QR_CODE, on_qr)
+
+async def bench_reload(whatsapp: WhatsApp, page: Page, count: int) -> None:
+    """go_to_base when the language is wrong, which has to reload WhatsApp Web."""
+    durations = []
+    for _ in range(count):
+        await page.context.add_cookies([bench_cookie(WhatsApp.LANG_PREF, "es")])
+        # Cookies set from here are not seen by the in-memory tracking.
+        whatsapp._lang_pref = None
+        started = time.perf_counter()
+        await whatsapp.go_to_base()
+        await page.locator("#pane-side").wait_for(state="attached")
+        durations.append(time.perf_counter() - started)
+    LOGGER.info(
+        f"go_to_base reload: {count} in {sum(durations):.2f}s, "
+        f"p50 {percentile(durations, 0.5) * 1000:.1f}ms max {max(durations) * 1000:.1f}ms"
+    )
+
+async def bench_send(whatsapp: WhatsApp, page: Page, count: int) -> None:
+    await (await whatsapp.find_me())
+    before = await page.evaluate("name => bench.sentCount(name)", SELF_CHAT)
+    started = time.perf_counter()
+    futures = [await whatsapp.send_message(f"send {index}") for index in range(count)]
+    await asyncio.gather(*futures)
+    elapsed = time.perf_counter() - started
+    delivered = await page.evaluate("name => bench.sentCount(name)", SELF_CHAT) - before
+    LOGGER.info(f"send_message: {count} in {elapsed:.2f}s, {count / elapsed:.1f} msg/s, {delivered} delivered")
+
+async def bench_batch(whatsapp: WhatsApp, page: Page, count: int) -> None:
+    before = await page.evaluate("name => bench.sentCount(name)", SELF_CHAT)
+    started = time.perf_counter()
+    futures = [await whatsapp.queue_message(f"queued {index}") for index in range(count)]
+    await asyncio.gather(*futures)
+    elapsed = time.perf_counter() - started
+    delivered = await page.evaluate("name => bench.sentCount(name)", SELF_CHAT) - before
+    LOGGER.info(f"queue_message: {count} in {elapsed:.2f}s, {count / elapsed:.1f} msg/s, {delivered} chat message(s)")
+
+async def bench_listener(whatsapp: WhatsApp, page: Page, count: int, interval: float) -> None:
+    injected: Dict[str, float] = {}
+    latencies: List[float] = []
+    done = asyncio.Event()
+
+    def on_message(message: WhatsAppMessage):
+        stamp = injected.pop(message.message, None)
+        if stamp is None:
+            return
+        latencies.append(time.time() * 1000 - stamp)
+        if len(latencies) == count:
+            done.set()
+
+    whatsapp.event_emitter.add_listener(WhatsAppEventName.MESSAGE_COMING, on_message)
+    try:
+        for index in range(count):
+            text = f"incoming {index}"
+            # Recorded before the call returns so a fast event is not missed.
+            injected[text] = time.time() * 1000
+            injected[text] = await page.evaluate(
+                "([name, text]) => bench.incoming(name, text)", [f"Contact {index % CONTACTS}", text]
+            )
+            await asyncio.sleep(interval)
+        try:
+            await asyncio.wait_for(done.wait(), timeout=10)
+        except asyncio.TimeoutError:
+            pass
+    finally:
+        whatsapp.event_emitter.remove_listener(WhatsAppEventName.MESSAGE_COMING, on_message)
+
+    if not latencies:
+        LOGGER.error("listener: no events received")
+        return
+    LOGGER.info(
+        f"listener: {len(latencies)}/{count} events, latency p50 {percentile(latencies, 0.5):.1f}ms "
+        f"p95 {percentile(latencies, 0.95):.1f}ms max {max(latencies):.1f}ms mean {statistics.mean(latencies):.1f}ms"
+    )
+
+async def soak(whatsapp: WhatsApp, page: Page, duration: float, sample: float) -> None:
+    session = await page.context.new_cdp_session(page)
+    await session.send("Performance.enable")
+    samples = []
+    deadline = time.monotonic() + duration
+    next_sample = time.monotonic()
+    index = 0
+    while time.monotonic() < deadline:
+        await page.evaluate("([name, text]) => bench.incoming(name, text)", [f"Contact {index % CONTACTS}", f"soak {index}"])
+        if index % 10 == 0:
+            await (await whatsapp.send_message(f"soak reply {index}"))
+        index += 1
+        if time.monotonic() >= next_sample:
+            samples.append((await js_heap_mb(session), rss_mb()))
+            LOGGER.info(f"soak: {index} messages, JS heap {samples[-1][0]:.1f} MB, python RSS {samples[-1][1]:.1f} MB")
+            next_sample += sample
+        await asyncio.sleep(0.05)
+
+    if samples:
+        LOGGER.info(
+            f"soak: JS heap {samples[0][0]:.1f} -> {samples[-1][0]:.1f} MB (peak {max(s[0] for s in samples):.1f}), "
+            f"python RSS {samples[0][1]:.1f} -> {samples[-1][1]:.1f} MB (peak {max(s[1] for s in samples):.1f})"
+        )
+
+async def main():
+    args = parse_args()
+    workdir = Path(tempfile.mkdtemp(prefix="whatsapp_bench_"))
+    whatsapp = WhatsApp(store=MessageStore(path=workdir / "messages.db"))
+    automation_service = AutomationService(user_data_dir=workdir / "User_Data", headless=not args.headed)
+    try:
+        page = await automation_service.get_page(whatsapp.page_id)
+        await page.route(f"https://{WhatsApp.BASE_URL}/**", serve_fixture)
+
+        if args.qr_rotations:
+            await bench_qr_login(whatsapp, page, args.qr_rotations, args.qr_interval)
+        else:
+            started = time.perf_counter()
+            await (await whatsapp.login(page))
+            LOGGER.info(f"login: {time.perf_counter() - started:.2f}s")
+        if whatsapp.state is not WhatsAppLoginStatus.LOGGED_IN:
+            raise RuntimeError(f"login ended as {whatsapp.state}")
+        if args.reloads:
+            # Before the listener starts: a reload drops its in-page observer.
+            await bench_reload(whatsapp, page, args.reloads)
+
+        await whatsapp.create_new_messages_listener_event()
+        await asyncio.sleep(1)
+
+        if args.messages:
+            await bench_send(whatsapp, page, args.messages)
+        if args.batch:
+            await bench_batch(whatsapp, page, args.batch)
+        if args.incoming:
+            await bench_listener(whatsapp, page, args.incoming, args.interval)
+        if args.duration:
+            await soak(whatsapp, page, args.duration, args.sample)
+    finally:
+        await whatsapp.shutdown()
+        await automation_service.shutdown()
+        await asyncio.wait_for(automation_service.start(), timeout=30)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    asyncio.run(main())
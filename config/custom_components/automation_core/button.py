@@ -2,7 +2,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.components.button import ButtonEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from custom_components.automation_core.utils import get_automation_instances_of_type
+from custom_components.automation_core.discovery import get_automation_instances_of_type
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -10,5 +10,5 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Add button entities from a config_entry."""
-    entities = get_automation_instances_of_type(hass, config_entry, ButtonEntity)
+    entities = await get_automation_instances_of_type(hass, config_entry, ButtonEntity)
     async_add_entities(entities)
\ No newline at end of file
@@ -1,5 +1,9 @@
+import voluptuous as vol
+
 from typing import Any
 from custom_components.automation_core.utils import get_main_domain
+from custom_components.automation_core.const import *
+from homeassistant.helpers.selector import TextSelector, TextSelectorConfig
 from homeassistant.config_entries import(
     ConfigFlow, 
     ConfigFlowResult)
@@ -20,4 +24,13 @@ class ConfigFlowHandler(ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             return self.async_create_entry(title="Automation Core", data=user_input)
 
-        return self.async_show_form(step_id="user",errors={})
\ No newline at end of file
+        data_schema = vol.Schema({
+            vol.Required(CONF_POOL_SIZE, default=DEFAULT_POOL_SIZE): vol.All(int, vol.Range(min=1)),
+            vol.Required(CONF_SHARDS, default=DEFAULT_SHARDS): vol.All(int, vol.Range(min=1)),
+            vol.Required(CONF_IDLE_TIMEOUT, default=DEFAULT_IDLE_TIMEOUT): vol.All(int, vol.Range(min=10)),
+            vol.Required(CONF_HEADLESS, default=DEFAULT_HEADLESS): bool,
+            vol.Required(CONF_MAX_HEAP_MB, default=DEFAULT_MAX_HEAP_MB): vol.All(int, vol.Range(min=128)),
+            vol.Required(CONF_TRACE_BUDGET, default=DEFAULT_TRACE_BUDGET): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Required(CONF_WHATSAPP_ACCOUNTS, default=DEFAULT_WHATSAPP_ACCOUNTS): TextSelector(TextSelectorConfig(multiple=True)),
+        })
+        return self.async_show_form(step_id="user", data_schema=data_schema, errors={})
\ No newline at end of file
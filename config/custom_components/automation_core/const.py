@@ -0,0 +1,29 @@
+"""Constants for the automation core component."""
+
+CONF_POOL_SIZE = "pool_size"
+CONF_SHARDS = "shards"
+CONF_IDLE_TIMEOUT = "idle_timeout"
+CONF_HEADLESS = "headless"
+CONF_MAX_HEAP_MB = "max_heap_mb"
+CONF_TRACE_BUDGET = "trace_budget"
+CONF_WHATSAPP_ACCOUNTS = "whatsapp_accounts"
+
+DEFAULT_POOL_SIZE = 2
+DEFAULT_SHARDS = 1
+DEFAULT_IDLE_TIMEOUT = 300
+DEFAULT_HEADLESS = False
+DEFAULT_MAX_HEAP_MB = 1024
+DEFAULT_HEALTH_INTERVAL = 60
+DEFAULT_SNAPSHOT_INTERVAL = 6 * 60 * 60
+DEFAULT_PRUNE_INTERVAL = 24 * 60 * 60
+# Seconds a command may take before its Playwright trace is kept; 0 disables tracing.
+DEFAULT_TRACE_BUDGET = 0
+# Every WhatsApp account but "default" gets a browser profile of its own.
+DEFAULT_WHATSAPP_ACCOUNTS = ["default"]
+
+# Headless Chromium announces itself as HeadlessChrome, which some sites
+# (WhatsApp Web among them) refuse to serve.
+HEADLESS_USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/133.0.0.0 Safari/537.36"
+)
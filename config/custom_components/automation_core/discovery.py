@@ -0,0 +1,188 @@
+import ast
+import asyncio
+import importlib
+import logging
+import os
+
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Type, TypeVar
+from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.storage import Store
+
+from custom_components.automation_core.utils import get_main_domain
+
+DOMAIN = get_main_domain()
+STORAGE_KEY = f"{DOMAIN}.discovery"
+STORAGE_VERSION = 1
+AUTOMATIONS_DIR = Path(__file__).parent / "automations"
+AUTOMATIONS_PACKAGE = f"{__package__}.automations"
+# Module-level callback an automation defines to set up what is not an entity
+# (services, say): `async_setup_automation(hass, config_entry)`, returning the
+# function that undoes it, or None.
+SETUP_HOOK = "async_setup_automation"
+
+# Base classes that make an automation class an entity of a platform, keyed by
+# the name they are referenced with in the automation source.
+ENTITY_BASES = {
+    "ButtonAutomationEntity": "ButtonEntity",
+    "SensorAutomationEntity": "SensorEntity",
+    "NotifyAutomationEntity": "NotifyEntity",
+    "ImageAutomationEntity": "ImageEntity",
+    "ButtonEntity": "ButtonEntity",
+    "SensorEntity": "SensorEntity",
+    "NotifyEntity": "NotifyEntity",
+    "ImageEntity": "ImageEntity",
+}
+
+_LOGGER = logging.getLogger(__name__)
+T = TypeVar('T')
+
+class AutomationRegistry:
+    """Index of the entity classes and setup hooks each automation module contributes.
+
+    Modules are read with `ast` instead of being imported, and the result is
+    stored with each file's mtime so unchanged files are not parsed again on
+    the next start. A module is only imported once a platform asks for one of
+    its classes.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self._hass = hass
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._index: Dict[str, dict] = {}
+
+    async def async_load(self) -> None:
+        stored = await self._store.async_load() or {}
+        index, changed = await self._hass.async_add_executor_job(self._scan, stored.get("modules", {}))
+        self._index = index
+        if changed:
+            self._store.async_delay_save(lambda: {"modules": self._index}, 1)
+
+    def _scan(self, previous: Dict[str, dict]) -> tuple[Dict[str, dict], bool]:
+        if not AUTOMATIONS_DIR.exists():
+            raise FileNotFoundError(f"The directory doesn't exist {AUTOMATIONS_DIR}")
+
+        index = {}
+        changed = False
+        for file_path in AUTOMATIONS_DIR.rglob("*.py"):
+            if file_path.name.startswith('__'):
+                continue
+
+            relative_path = file_path.relative_to(AUTOMATIONS_DIR).with_suffix("")
+            module_name = f"{AUTOMATIONS_PACKAGE}.{str(relative_path).replace(os.sep, '.')}"
+            mtime = file_path.stat().st_mtime
+            entry = previous.get(module_name)
+            if entry is None or entry["mtime"] != mtime or "setup" not in entry:
+                try:
+                    entry = {"mtime": mtime, **self._parse(file_path)}
+                except SyntaxError as e:
+                    _LOGGER.error(f"Error parsing {file_path}: {e}")
+                    continue
+                changed = True
+            index[module_name] = entry
+
+        return index, changed or index.keys() != previous.keys()
+
+    @staticmethod
+    def _parse(file_path: Path) -> dict:
+        tree = ast.parse(file_path.read_text(encoding="utf-8"), str(file_path))
+        setup = any(
+            isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == SETUP_HOOK
+            for node in tree.body
+        )
+        return {"classes": AutomationRegistry._entity_classes(tree), "setup": setup}
+
+    @staticmethod
+    def _entity_classes(tree: ast.Module) -> Dict[str, List[str]]:
+        bases: Dict[str, List[str]] = {}
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef):
+                bases[node.name] = [
+                    base.id if isinstance(base, ast.Name) else base.attr
+                    for base in node.bases
+                    if isinstance(base, (ast.Name, ast.Attribute))
+                ]
+
+        def entity_types(name: str, seen: set) -> set:
+            types = set()
+            for base in bases.get(name, []):
+                if base in ENTITY_BASES:
+                    types.add(ENTITY_BASES[base])
+                elif base in bases and base not in seen:
+                    types |= entity_types(base, seen | {base})
+            return types
+
+        classes = {}
+        for name in bases:
+            if types := entity_types(name, {name}):
+                classes[name] = sorted(types)
+        return classes
+
+    def _import_modules(self, modules: List[str]) -> list:
+        imported = []
+        for module_name in modules:
+            try:
+                imported.append(importlib.import_module(module_name))
+            except Exception as e:
+                _LOGGER.error(f"Error importing {module_name}: {e}")
+        return imported
+
+    async def async_get_setup_hooks(self) -> List[Callable[[HomeAssistant, ConfigEntry], Optional[Callable[[], None]]]]:
+        modules = [module_name for module_name, entry in self._index.items() if entry.get("setup")]
+        modules = await self._hass.async_add_executor_job(self._import_modules, modules)
+        return [hook for module in modules if callable(hook := getattr(module, SETUP_HOOK, None))]
+
+    async def async_get_classes(self, entity_type: Type[T]) -> List[Type[T]]:
+        wanted = {
+            module_name: [name for name, types in entry["classes"].items() if entity_type.__name__ in types]
+            for module_name, entry in self._index.items()
+        }
+        wanted = {module_name: names for module_name, names in wanted.items() if names}
+        modules = await self._hass.async_add_executor_job(self._import_modules, list(wanted))
+
+        classes = []
+        for module in modules:
+            for name in wanted[module.__name__]:
+                obj = getattr(module, name, None)
+                if isinstance(obj, type) and issubclass(obj, entity_type) and obj is not entity_type:
+                    classes.append(obj)
+        return classes
+
+async def async_get_registry(hass: HomeAssistant) -> AutomationRegistry:
+    """Return the registry, scanning the automations only once per setup."""
+    data = hass.data.setdefault(DOMAIN, {})
+    if "discovery" not in data:
+        registry = AutomationRegistry(hass)
+        data["discovery"] = (registry, asyncio.ensure_future(registry.async_load()))
+    registry, loaded = data["discovery"]
+    try:
+        await loaded
+    except Exception:
+        # A failed scan is not cached; the next caller scans again.
+        if data.get("discovery", (None, None))[1] is loaded:
+            data.pop("discovery")
+        raise
+    return registry
+
+async def async_setup_automations(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Run the setup hook of every automation that has one, undone on unload."""
+    registry = await async_get_registry(hass)
+    for hook in await registry.async_get_setup_hooks():
+        try:
+            if unload := hook(hass, config_entry):
+                config_entry.async_on_unload(unload)
+        except Exception as e:
+            _LOGGER.error(f"Error setting up {hook.__module__}: {e}")
+
+async def get_automation_instances_of_type(hass: HomeAssistant, config_entry: ConfigEntry, entity_type: Type[T]) -> List[T]:
+    registry = await async_get_registry(hass)
+    instances = []
+    for clazz in await registry.async_get_classes(entity_type):
+        try:
+            # Automation entities may create several instances (one per account, say).
+            create = getattr(clazz, "create", None)
+            instances.extend(create(hass, config_entry) if create else [clazz(hass, config_entry)])
+        except Exception as e:
+            _LOGGER.error(f"Error creating {clazz.__name__}: {e}")
+    return instances
@@ -2,6 +2,8 @@ import inspect
 import sys
 import os
 
+from typing import List
+
 from homeassistant.components.button import ButtonEntity
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.components.notify import NotifyEntity
@@ -22,8 +24,15 @@ class AutomationEntity:
         self.hass = hass
         self._config = config_entry.data
         self._domain = get_domain(self._get_file())
+        self._page_id = self._domain
+        self._isolated_page = False
         self._page: Page = None
 
+    @classmethod
+    def create(cls, hass: HomeAssistant, config_entry: ConfigEntry) -> List["AutomationEntity"]:
+        """Entities of this class for `config_entry`; override to create several."""
+        return [cls(hass, config_entry)]
+
     def _get_init_args(self, hass: HomeAssistant, config_entry: ConfigEntry):
         mro = type(self).__mro__
         current_index = mro.index(AutomationEntity)
@@ -53,8 +62,18 @@ class AutomationEntity:
         return module.__file__
 
     async def async_added_to_hass(self) -> None:
-        if self._domain:
-            self._page = await self.hass.data[get_main_domain()]['get_page'](self._domain)
+        # Automations that only lease pooled pages set _page_id to None.
+        if self._page_id:
+            service = self.hass.data[get_main_domain()]['service']
+            self._page = await service.get_page(self._page_id, isolated=self._isolated_page)
+            self.async_on_remove(service.add_page_listener(self._page_id, self._on_page_recycled))
+
+    def _on_page_recycled(self, page: Page) -> None:
+        self._page = page
+        self.hass.async_create_task(self.async_page_recycled(page))
+
+    async def async_page_recycled(self, page: Page) -> None:
+        """Called after the automation page was replaced by a new one."""
 
 class ButtonAutomationEntity(AutomationEntity, ButtonEntity):
     pass
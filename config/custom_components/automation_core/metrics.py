@@ -0,0 +1,162 @@
+from dataclasses import dataclass, field
+from contextlib import asynccontextmanager
+import asyncio
+import bisect
+import functools
+import logging
+import time
+from enum import StrEnum
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from playwright.async_api import BrowserContext
+
+logger = logging.getLogger(__name__)
+
+class MetricKind(StrEnum):
+    QUEUE_WAIT = "queue_wait"
+    EXECUTION = "execution"
+    SELECTOR_WAIT = "selector_wait"
+    STEP = "step"
+
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+@dataclass
+class Timing:
+    """Running summary of one timed operation, in seconds."""
+    count: int = 0
+    total: float = 0
+    last: float = 0
+    max: float = 0
+    buckets: List[int] = field(default_factory=lambda: [0] * len(BUCKETS))
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        self.max = max(self.max, seconds)
+        index = bisect.bisect_left(BUCKETS, seconds)
+        if index < len(BUCKETS):
+            self.buckets[index] += 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0
+
+@dataclass
+class MetricsRegistry:
+    """Timings of automation commands keyed by kind and operation name."""
+    timings: Dict[Tuple[MetricKind, str], Timing] = field(default_factory=dict)
+    _listeners: List[Callable[[MetricKind, str, Timing], None]] = field(default_factory=list)
+
+    def add_listener(self, listener: Callable[[MetricKind, str, Timing], None]) -> Callable[[], None]:
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def record(self, kind: MetricKind, name: str, seconds: float) -> None:
+        timing = self.timings.setdefault((kind, name), Timing())
+        timing.add(seconds)
+        for listener in list(self._listeners):
+            try:
+                listener(kind, name, timing)
+            except Exception as e:
+                logger.error(f"Metrics listener failed: {e}")
+
+    @asynccontextmanager
+    async def timed(self, kind: MetricKind, name: str) -> AsyncIterator[None]:
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record(kind, name, time.monotonic() - started)
+
+    def prometheus(self) -> str:
+        """The timings in the Prometheus text exposition format."""
+        lines = []
+        for kind in MetricKind:
+            metric = f"automation_core_{kind}_seconds"
+            entries = [(name, timing) for (entry_kind, name), timing in self.timings.items() if entry_kind is kind]
+            if not entries:
+                continue
+            lines.append(f"# TYPE {metric} histogram")
+            for name, timing in sorted(entries):
+                label = name.replace("\\", "\\\\").replace('"', '\\"')
+                cumulative = 0
+                for bound, count in zip(BUCKETS, timing.buckets):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{operation="{label}",le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{operation="{label}",le="+Inf"}} {timing.count}')
+                lines.append(f'{metric}_sum{{operation="{label}"}} {timing.total}')
+                lines.append(f'{metric}_count{{operation="{label}"}} {timing.count}')
+        return "\n".join(lines) + "\n"
+
+@dataclass
+class TraceRecorder:
+    """Saves a Playwright trace of the commands slower than `budget` seconds.
+
+    Tracing runs on the main browser context and every command is recorded in
+    its own chunk, which is written to `directory` only when the command ran
+    over budget. Chunks cannot overlap, so a command that starts while another
+    one is being traced is not traced.
+    """
+    budget: float = 0
+    directory: Path = field(default_factory=lambda: Path("./Automation_Data/traces").absolute())
+    _context: Optional[BrowserContext] = None
+    _lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    async def attach(self, context: BrowserContext) -> None:
+        if self.budget <= 0:
+            return
+        await context.tracing.start(screenshots=True, snapshots=True)
+        self._context = context
+
+    def detach(self) -> None:
+        self._context = None
+
+    @asynccontextmanager
+    async def capture(self, name: str) -> AsyncIterator[None]:
+        context = self._context
+        if context is None or self._lock.locked():
+            yield
+            return
+
+        async with self._lock:
+            try:
+                await context.tracing.start_chunk(title=name)
+            except Exception as e:
+                logger.debug(f"Could not start a trace chunk: {e}")
+                yield
+                return
+
+            started = time.monotonic()
+            try:
+                yield
+            finally:
+                elapsed = time.monotonic() - started
+                try:
+                    if elapsed > self.budget:
+                        self.directory.mkdir(parents=True, exist_ok=True)
+                        path = self.directory / f"{name}-{int(time.time())}.zip"
+                        await context.tracing.stop_chunk(path=str(path))
+                        logger.warning(f"{name} took {elapsed:.2f}s, trace saved to {path}")
+                    else:
+                        await context.tracing.stop_chunk()
+                except Exception as e:
+                    logger.debug(f"Could not stop the trace chunk: {e}")
+
+METRICS = MetricsRegistry()
+TRACES = TraceRecorder()
+
+def operation_name(method: Callable) -> str:
+    """`WhatsApp._send_message_impl` becomes `WhatsApp.send_message`."""
+    owner, _, name = getattr(method, "__qualname__", repr(method)).rpartition(".")
+    name = name.lstrip("_").removesuffix("_impl")
+    return f"{owner}.{name}" if owner else name
+
+def timed_step(method: Callable) -> Callable:
+    """Record each call of an async function as a step."""
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        async with METRICS.timed(MetricKind.STEP, operation_name(method)):
+            return await method(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,70 @@
+from dataclasses import dataclass
+import logging
+import re
+from typing import Dict, FrozenSet, Optional, Pattern, Tuple
+
+from playwright.async_api import Page, Route
+
+logger = logging.getLogger(__name__)
+
+ANALYTICS_HOSTS = (
+    r"google-analytics\.com",
+    r"googletagmanager\.com",
+    r"doubleclick\.net",
+    r"googlesyndication\.com",
+    r"facebook\.net",
+    r"hotjar\.com",
+    r"clarity\.ms",
+)
+
+@dataclass(frozen=True)
+class RoutePolicy:
+    """Network requests an automation page does not need.
+
+    A request is aborted when its resource type is blocked or its URL matches
+    a blocked pattern, unless its URL matches one of the allowed patterns.
+    """
+    blocked_resource_types: FrozenSet[str] = frozenset()
+    blocked_url_patterns: Tuple[str, ...] = ANALYTICS_HOSTS
+    allowed_url_patterns: Tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_blocked", self._compile(self.blocked_url_patterns))
+        object.__setattr__(self, "_allowed", self._compile(self.allowed_url_patterns))
+
+    @staticmethod
+    def _compile(patterns: Tuple[str, ...]) -> Optional[Pattern]:
+        if not patterns:
+            return None
+        return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+
+    def blocks(self, resource_type: str, url: str) -> bool:
+        if self._allowed and self._allowed.search(url):
+            return False
+        if resource_type in self.blocked_resource_types:
+            return True
+        return bool(self._blocked and self._blocked.search(url))
+
+_policies: Dict[str, RoutePolicy] = {}
+
+def register_route_policy(domain: str, policy: RoutePolicy) -> None:
+    _policies[domain] = policy
+
+def get_route_policy(domain: str) -> Optional[RoutePolicy]:
+    # Pages of one automation share its policy: "whatsapp.work" uses "whatsapp".
+    return _policies.get(domain) or _policies.get(domain.split(".")[0])
+
+async def apply_route_policy(page: Page, domain: str) -> None:
+    policy = get_route_policy(domain)
+    if policy is None:
+        return
+
+    async def handle(route: Route) -> None:
+        request = route.request
+        if policy.blocks(request.resource_type, request.url):
+            await route.abort("blockedbyclient")
+        else:
+            await route.continue_()
+
+    await page.route("**/*", handle)
+    logger.debug(f"Route policy applied to {domain} page")
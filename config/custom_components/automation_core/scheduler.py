@@ -0,0 +1,145 @@
+from dataclasses import dataclass, field
+import asyncio
+import contextlib
+import itertools
+import logging
+import time
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from custom_components.automation_core.metrics import METRICS, TRACES, MetricKind, operation_name
+
+logger = logging.getLogger(__name__)
+
+class Priority(IntEnum):
+    HIGH = 0
+    NORMAL = 10
+    LOW = 20
+
+@dataclass(order=True)
+class Command:
+    priority: int
+    sequence: int
+    method: Callable[..., Awaitable[Any]] = field(compare=False)
+    args: tuple = field(compare=False, default=())
+    kwargs: dict = field(compare=False, default_factory=dict)
+    timeout: Optional[float] = field(compare=False, default=None)
+    exclusive: bool = field(compare=False, default=True)
+    future: Optional[asyncio.Future] = field(compare=False, default=None)
+    enqueued: float = field(compare=False, default_factory=time.monotonic)
+
+@dataclass
+class CommandScheduler:
+    """Runs page commands by priority.
+
+    Exclusive commands (navigation, typing, clicks) run one at a time in their
+    own lane. Shared commands only read the page and run on `readers` workers,
+    so they keep going while an exclusive command is in progress. Long-lived
+    jobs such as listeners are spawned as named background tasks and never
+    occupy a worker.
+    """
+    readers: int = 2
+    default_timeout: Optional[float] = 120
+    _exclusive_queue: asyncio.PriorityQueue = field(default_factory=asyncio.PriorityQueue)
+    _shared_queue: asyncio.PriorityQueue = field(default_factory=asyncio.PriorityQueue)
+    _sequence: itertools.count = field(default_factory=itertools.count)
+    _workers: List[asyncio.Task] = field(default_factory=list)
+    _background: Dict[str, asyncio.Task] = field(default_factory=dict)
+
+    @property
+    def backlog(self) -> int:
+        """Commands queued and not started yet."""
+        return self._exclusive_queue.qsize() + self._shared_queue.qsize()
+
+    def submit(
+        self,
+        method: Callable[..., Awaitable[Any]],
+        *args,
+        priority: int = Priority.NORMAL,
+        timeout: Optional[float] = -1,
+        exclusive: bool = True,
+        **kwargs
+    ) -> asyncio.Future:
+        """Queue a command and return the future holding its result.
+
+        A timeout of -1 uses `default_timeout`, None disables it.
+        """
+        self._start_workers()
+        command = Command(
+            priority=priority,
+            sequence=next(self._sequence),
+            method=method,
+            args=args,
+            kwargs=kwargs,
+            timeout=self.default_timeout if timeout == -1 else timeout,
+            exclusive=exclusive,
+            future=asyncio.get_running_loop().create_future()
+        )
+        queue = self._exclusive_queue if exclusive else self._shared_queue
+        queue.put_nowait(command)
+        return command.future
+
+    def spawn(self, name: str, method: Callable[..., Awaitable[Any]], *args, **kwargs) -> asyncio.Task:
+        """Run a long-lived job on its own task, once per name."""
+        task = self._background.get(name)
+        if task is None or task.done():
+            task = asyncio.create_task(method(*args, **kwargs), name=name)
+            self._background[name] = task
+        return task
+
+    def cancel(self, name: str) -> bool:
+        """Stop a background job; returns whether it was running."""
+        task = self._background.pop(name, None)
+        if task is None or task.done():
+            return False
+        task.cancel()
+        return True
+
+    async def shutdown(self) -> None:
+        tasks = self._workers + list(self._background.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers.clear()
+        self._background.clear()
+        for queue in (self._exclusive_queue, self._shared_queue):
+            while not queue.empty():
+                command: Command = queue.get_nowait()
+                if not command.future.done():
+                    command.future.cancel()
+
+    def _start_workers(self) -> None:
+        if self._workers:
+            return
+        self._workers.append(asyncio.create_task(self._worker(self._exclusive_queue)))
+        for _ in range(self.readers):
+            self._workers.append(asyncio.create_task(self._worker(self._shared_queue)))
+
+    async def _worker(self, queue: asyncio.PriorityQueue) -> None:
+        while True:
+            command: Command = await queue.get()
+            try:
+                if command.future.done():
+                    continue
+                name = operation_name(command.method)
+                METRICS.record(MetricKind.QUEUE_WAIT, name, time.monotonic() - command.enqueued)
+                # Shared commands overlap others, so only exclusive ones are traced.
+                async with METRICS.timed(MetricKind.EXECUTION, name), \
+                        (TRACES.capture(name) if command.exclusive else contextlib.nullcontext()):
+                    result = await asyncio.wait_for(
+                        command.method(*command.args, **command.kwargs),
+                        timeout=command.timeout
+                    )
+                if not command.future.done():
+                    command.future.set_result(result)
+            except asyncio.CancelledError:
+                if not command.future.done():
+                    command.future.cancel()
+                raise
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    logger.warning(f"Command {command.method.__name__} timed out after {command.timeout}s")
+                if not command.future.done():
+                    command.future.set_exception(e)
+            finally:
+                queue.task_done()
@@ -1,8 +1,16 @@
-from homeassistant.core import HomeAssistant
-from homeassistant.components.sensor import SensorEntity
+from datetime import datetime
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfTime
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from custom_components.automation_core.utils import get_automation_instances_of_type
+from homeassistant.helpers.event import async_call_later
+from custom_components.automation_core.discovery import get_automation_instances_of_type
+from custom_components.automation_core.metrics import METRICS, MetricKind, Timing
+
+# Timings are recorded for every command; their sensors write at most this often.
+WRITE_INTERVAL = 10
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -10,5 +18,64 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Add sensor entities from a config_entry."""
-    entities = get_automation_instances_of_type(hass, config_entry, SensorEntity)
-    async_add_entities(entities)
\ No newline at end of file
+    entities = await get_automation_instances_of_type(hass, config_entry, SensorEntity)
+    async_add_entities(entities)
+
+    # One sensor per timed operation, created the first time it is recorded.
+    metric_sensors = {
+        key: CommandTimingSensor(config_entry, *key, timing) for key, timing in METRICS.timings.items()
+    }
+    async_add_entities(list(metric_sensors.values()))
+
+    @callback
+    def on_timing(kind: MetricKind, name: str, timing: Timing) -> None:
+        sensor = metric_sensors.get((kind, name))
+        if sensor is None:
+            sensor = metric_sensors[(kind, name)] = CommandTimingSensor(config_entry, kind, name, timing)
+            async_add_entities([sensor])
+        elif sensor.hass is not None:
+            sensor.async_schedule_write()
+
+    config_entry.async_on_unload(METRICS.add_listener(on_timing))
+
+class CommandTimingSensor(SensorEntity):
+    """Last duration of one automation operation, with its running summary."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_should_poll = False
+
+    def __init__(self, config_entry: ConfigEntry, kind: MetricKind, name: str, timing: Timing):
+        self._timing = timing
+        self._attr_name = f"{name} {kind.replace('_', ' ')}"
+        self._attr_unique_id = f"{config_entry.entry_id}_timing_{kind}_{name}"
+        self._pending_write: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_schedule_write(self) -> None:
+        """Write the state within WRITE_INTERVAL, coalescing the timings recorded until then."""
+        if self._pending_write is None:
+            self._pending_write = async_call_later(self.hass, WRITE_INTERVAL, self._async_write)
+
+    @callback
+    def _async_write(self, _now: datetime) -> None:
+        self._pending_write = None
+        self.async_write_ha_state()
+
+    async def async_will_remove_from_hass(self) -> None:
+        if self._pending_write is not None:
+            self._pending_write()
+            self._pending_write = None
+
+    @property
+    def native_value(self) -> float:
+        return round(self._timing.last * 1000, 1)
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        return {
+            "count": self._timing.count,
+            "mean_ms": round(self._timing.mean * 1000, 1),
+            "max_ms": round(self._timing.max * 1000, 1),
+        }
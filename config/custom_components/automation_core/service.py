@@ -1,67 +1,502 @@
 from dataclasses import dataclass, field
+from contextlib import asynccontextmanager
 import asyncio
 import logging
-from typing import Dict, Optional
+import time
+from enum import StrEnum
+from typing import AsyncIterator, Callable, Dict, List, Optional, Union
 from pathlib import Path
 
-from playwright.async_api import Page, async_playwright, ChromiumBrowserContext
+from playwright.async_api import CDPSession, Page, Playwright, async_playwright, ChromiumBrowserContext
+from custom_components.automation_core.const import (
+    DEFAULT_HEADLESS,
+    DEFAULT_HEALTH_INTERVAL,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_MAX_HEAP_MB,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_PRUNE_INTERVAL,
+    DEFAULT_SHARDS,
+    DEFAULT_SNAPSHOT_INTERVAL,
+    HEADLESS_USER_AGENT
+)
+from custom_components.automation_core.metrics import TRACES
+from custom_components.automation_core.routing import apply_route_policy
+from custom_components.automation_core.snapshots import SessionSnapshots, mark_pruned, prune_due, prune_profile
 from custom_components.automation_core.utils import get_main_domain
 
 DOMAIN = get_main_domain()
 
 logger = logging.getLogger(__name__)
 
+class ServiceStatus(StrEnum):
+    STOPPED = "stopped"
+    STARTING = "starting"
+    LAUNCHING_BROWSER = "launching_browser"
+    READY = "ready"
+    FAILED = "failed"
+
+@dataclass
+class PagePool:
+    """Pages of one automation domain handed out with lease/return semantics."""
+    size: int
+    idle: List[Page] = field(default_factory=list)
+    last_used: Dict[Page, float] = field(default_factory=dict)
+    leased: int = 0
+    _available: asyncio.Condition = field(default_factory=asyncio.Condition)
+
+    @property
+    def total(self) -> int:
+        return len(self.idle) + self.leased
+
 @dataclass
 class AutomationService:
+    """Owns the browser and hands out pages to automations.
+
+    Every shard is a persistent context with its own profile and therefore its
+    own Chromium process. Shard 0 uses `user_data_dir` and serves the
+    dedicated page of each automation (`get_page`); pooled pages (`lease`) are
+    spread across all shards. An isolated dedicated page gets a persistent
+    context of its own, named after its page id, for sites that keep a single
+    session per profile (one per WhatsApp account, say).
+
+    A watchdog replaces dedicated pages that closed, crashed, stopped
+    answering or grew past `max_heap_mb` of JS heap, relaunches the browser if
+    it died, and hands the new page to the listeners of that page id.
+
+    The session of every dedicated page is snapshotted periodically and on
+    shutdown; a fresh profile is seeded from those snapshots at startup, and
+    the caches of the profiles are pruned before launch and then whenever
+    `prune_profiles` is called.
+    """
     user_data_dir: Path = field(default_factory=lambda: Path("./User_Data").absolute())
+    pool_size: int = DEFAULT_POOL_SIZE
+    shards: int = DEFAULT_SHARDS
+    idle_timeout: float = DEFAULT_IDLE_TIMEOUT
+    headless: bool = DEFAULT_HEADLESS
+    max_heap_mb: int = DEFAULT_MAX_HEAP_MB
+    health_interval: float = DEFAULT_HEALTH_INTERVAL
+    snapshot_interval: float = DEFAULT_SNAPSHOT_INTERVAL
+    prune_interval: float = DEFAULT_PRUNE_INTERVAL
+    snapshots: SessionSnapshots = field(default_factory=SessionSnapshots)
+    _fresh_profile: bool = False
     pages: Dict[str, Page] = field(default_factory=dict)
     _locks: Dict[str, asyncio.Lock] = field(default_factory=dict)
+    _pools: Dict[str, PagePool] = field(default_factory=dict)
+    _playwright: Optional[Playwright] = None
     _context: Optional[ChromiumBrowserContext] = None
+    # Keyed by shard number, or by page id for isolated pages.
+    _shard_contexts: Dict[Union[int, str], ChromiumBrowserContext] = field(default_factory=dict)
+    _isolated: set = field(default_factory=set)
+    _shard_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
     _shutdown_event: asyncio.Event = field(default_factory=asyncio.Event)
+    status: ServiceStatus = ServiceStatus.STOPPED
+    launch_time: Optional[float] = None
+    _status_listeners: List[Callable[[ServiceStatus], None]] = field(default_factory=list)
+    _page_listeners: Dict[str, List[Callable[[Page], None]]] = field(default_factory=dict)
+    _cdp_sessions: Dict[Page, CDPSession] = field(default_factory=dict)
+    _crashed: set = field(default_factory=set)
+    _dead_shards: set = field(default_factory=set)
+    _wake_watchdog: asyncio.Event = field(default_factory=asyncio.Event)
+    _ready: Optional[asyncio.Future] = None
+    _task: Optional[asyncio.Task] = None
 
     def __post_init__(self) -> None:
+        self._fresh_profile = not self.user_data_dir.is_dir() or not any(self.user_data_dir.iterdir())
         self.user_data_dir.mkdir(exist_ok=True)
-        asyncio.create_task(self._initialize())
+        self.start()
+
+    def start(self) -> asyncio.Task:
+        """Launch the browser in the background; `get_context` waits for it.
+
+        A launch that failed is retried by the next call, until shutdown.
+        """
+        if self._task is None or (self._task.done() and not self._shutdown_event.is_set()):
+            self._ready = asyncio.get_running_loop().create_future()
+            # Retrieved here as nothing may be waiting when the launch fails.
+            self._ready.add_done_callback(lambda ready: ready.cancelled() or ready.exception())
+            self._task = asyncio.create_task(self._initialize())
+        return self._task
+
+    def add_status_listener(self, listener: Callable[[ServiceStatus], None]) -> Callable[[], None]:
+        self._status_listeners.append(listener)
+        return lambda: self._status_listeners.remove(listener)
+
+    def add_page_listener(self, page_id: str, listener: Callable[[Page], None]) -> Callable[[], None]:
+        """Call `listener` with the new page whenever `page_id` is recycled."""
+        listeners = self._page_listeners.setdefault(page_id, [])
+        listeners.append(listener)
+        return lambda: listeners.remove(listener)
+
+    def _set_status(self, status: ServiceStatus) -> None:
+        self.status = status
+        for listener in list(self._status_listeners):
+            try:
+                listener(status)
+            except Exception as e:
+                logger.error(f"Status listener failed: {e}")
 
     async def _initialize(self) -> None:
+        started = time.monotonic()
         try:
+            self._set_status(ServiceStatus.STARTING)
             async with async_playwright() as playwright:
-                self._context = await playwright.chromium.launch_persistent_context(
-                    user_data_dir=str(self.user_data_dir),
-                    headless=False
-                )
+                self._playwright = playwright
+                self._set_status(ServiceStatus.LAUNCHING_BROWSER)
+                await self.prune_profiles()
+                self._context = await self._launch(self.user_data_dir, 0)
+                self._shard_contexts[0] = self._context
+                if self._fresh_profile:
+                    await self.snapshots.restore_all(self._context)
+                await TRACES.attach(self._context)
+                self.launch_time = time.monotonic() - started
+                logger.info(f"Browser ready in {self.launch_time:.2f}s")
+                self._ready.set_result(self._context)
+                self._set_status(ServiceStatus.READY)
+                evictor = asyncio.create_task(self._evict_idle_pages())
+                watchdog = asyncio.create_task(self._watch_pages())
+                snapshotter = asyncio.create_task(self._snapshot_periodically())
                 await self._shutdown_event.wait()
+                evictor.cancel()
+                watchdog.cancel()
+                snapshotter.cancel()
+                await self._snapshot_pages()
                 await self._cleanup()
+                self._set_status(ServiceStatus.STOPPED)
         except Exception as e:
             logger.error(f"Automation Core initialization failed: {e}")
-            raise
+            if not self._ready.done():
+                self._ready.set_exception(e)
+            self._set_status(ServiceStatus.FAILED)
+
+    def _profile_dir(self, shard: Union[int, str]) -> Path:
+        if shard == 0:
+            return self.user_data_dir
+        return self.user_data_dir.with_name(f"{self.user_data_dir.name}_{shard}")
+
+    async def prune_profiles(self) -> None:
+        """Drop the rebuildable caches of every profile, at most once per `prune_interval`.
+
+        The cache files of a running context are in use, so its cache is
+        cleared through Chromium instead of on disk.
+        """
+        running = {self._profile_dir(shard): context for shard, context in self._shard_contexts.items()}
+        profiles = [self.user_data_dir] + sorted(self.user_data_dir.parent.glob(f"{self.user_data_dir.name}_*"))
+        for profile in profiles:
+            try:
+                if context := running.get(profile):
+                    await self._clear_cache(context, profile)
+                    continue
+                freed = await asyncio.to_thread(prune_profile, profile, self.prune_interval)
+            except Exception as e:
+                logger.warning(f"Pruning {profile} failed: {e}")
+                continue
+            if freed:
+                logger.info(f"Pruned {freed / 1024 / 1024:.1f} MB of caches from {profile}")
+
+    async def _clear_cache(self, context: ChromiumBrowserContext, profile: Path) -> None:
+        if not await asyncio.to_thread(prune_due, profile, self.prune_interval):
+            return
+        page = context.pages[0] if context.pages else await context.new_page()
+        session = await context.new_cdp_session(page)
+        try:
+            await session.send("Network.clearBrowserCache")
+        finally:
+            await session.detach()
+        await asyncio.to_thread(mark_pruned, profile)
+        logger.info(f"Cleared the browser cache of {profile}")
+
+    async def _snapshot_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            await self._snapshot_pages()
+
+    async def _snapshot_pages(self) -> None:
+        for page_id, page in list(self.pages.items()):
+            if page.is_closed():
+                continue
+            try:
+                await self.snapshots.take(page, page_id, isolated=page_id in self._isolated)
+            except Exception as e:
+                logger.warning(f"Snapshot of {page_id} failed: {e}")
+
+    async def _launch(self, user_data_dir: Path, shard: Union[int, str]) -> ChromiumBrowserContext:
+        user_data_dir.mkdir(exist_ok=True)
+        context = await self._playwright.chromium.launch_persistent_context(
+            user_data_dir=str(user_data_dir),
+            headless=self.headless,
+            user_agent=HEADLESS_USER_AGENT if self.headless else None
+        )
+        context.on("close", lambda _: self._on_context_closed(shard))
+        return context
+
+    def _on_context_closed(self, shard: Union[int, str]) -> None:
+        if self._shutdown_event.is_set():
+            return
+        self._dead_shards.add(shard)
+        self._wake_watchdog.set()
 
     async def _cleanup(self) -> None:
+        for shard, context in self._shard_contexts.items():
+            if shard != 0:
+                await context.close()
+        self._shard_contexts.clear()
+        TRACES.detach()
         self._context = None
+        self._playwright = None
         self.pages.clear()
+        self._pools.clear()
+        self._cdp_sessions.clear()
+        self._crashed.clear()
 
     async def shutdown(self) -> None:
+        """Stop the browser, returning once the dedicated pages are snapshotted and closed."""
         self._shutdown_event.set()
+        if self._ready is not None and not self._ready.done():
+            self._ready.cancel()
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
 
     async def get_context(self) -> ChromiumBrowserContext:
-        while not self._shutdown_event.is_set():
-            if self._context is not None:
-                return self._context
-            
-            await asyncio.sleep(0)
+        self.start()
+        # Shielded so a caller giving up (wait_for timeout) does not cancel
+        # readiness for everyone else.
+        return await asyncio.shield(self._ready)
+
+    async def _get_shard_context(self, shard: Union[int, str]) -> ChromiumBrowserContext:
+        if shard == 0:
+            return await asyncio.wait_for(self.get_context(), timeout=60)
+
+        async with self._shard_lock:
+            if context := self._shard_contexts.get(shard):
+                return context
+
+            await asyncio.wait_for(self.get_context(), timeout=60)
+            user_data_dir = self._profile_dir(shard)
+            fresh = isinstance(shard, str) and not user_data_dir.is_dir()
+            context = await self._launch(user_data_dir, shard)
+            self._shard_contexts[shard] = context
+            if fresh:
+                try:
+                    await self.snapshots.restore(context, shard, isolated=True)
+                except Exception as e:
+                    logger.error(f"Restoring the {shard} session failed: {e}")
+            return context
+
+    def _next_shard(self) -> int:
+        """Shard currently holding the fewest pages."""
+        loads = {shard: 0 for shard in range(max(self.shards, 1))}
+        for shard, context in self._shard_contexts.items():
+            if shard in loads:
+                loads[shard] = len(context.pages)
+        return min(loads, key=loads.get)
 
     async def _get_lock(self, page_id: str) -> asyncio.Lock:
         if page_id not in self._locks:
             self._locks[page_id] = asyncio.Lock()
         return self._locks[page_id]
 
-    async def get_page(self, page_id: str) -> Optional[Page]:       
+    async def get_page(self, page_id: str, isolated: bool = False) -> Optional[Page]:
+        if isolated:
+            self._isolated.add(page_id)
         lock = await self._get_lock(page_id)
         async with lock:
             if page := self.pages.get(page_id):
                 return page
-            
+
+            return await self._new_page(page_id)
+
+    async def _new_page(self, page_id: str) -> Page:
+        if page_id in self._isolated:
+            context = await self._get_shard_context(page_id)
+        else:
             context = await asyncio.wait_for(self.get_context(), timeout=60)
-            new_page = await context.new_page()
-            self.pages[page_id] = new_page
-            return new_page
\ No newline at end of file
+        new_page = await context.new_page()
+        await apply_route_policy(new_page, page_id)
+        new_page.on("crash", self._on_page_crashed)
+        new_page.on("close", lambda _: self._wake_watchdog.set())
+        self.pages[page_id] = new_page
+        return new_page
+
+    def _on_page_crashed(self, page: Page) -> None:
+        self._crashed.add(page)
+        self._wake_watchdog.set()
+
+    async def recycle_page(self, page_id: str, reason: str) -> Optional[Page]:
+        """Replace the dedicated page of `page_id` and notify its listeners."""
+        lock = await self._get_lock(page_id)
+        async with lock:
+            old_page = self.pages.pop(page_id, None)
+            if old_page is not None:
+                self._crashed.discard(old_page)
+                if session := self._cdp_sessions.pop(old_page, None):
+                    try:
+                        await session.detach()
+                    except Exception:
+                        pass
+                if not old_page.is_closed():
+                    try:
+                        await old_page.close()
+                    except Exception as e:
+                        logger.debug(f"Closing {page_id} page failed: {e}")
+
+            logger.warning(f"Recycling {page_id} page: {reason}")
+            try:
+                new_page = await self._new_page(page_id)
+            except Exception as e:
+                logger.error(f"Recreating {page_id} page failed: {e}")
+                return None
+
+        for listener in list(self._page_listeners.get(page_id, [])):
+            try:
+                listener(new_page)
+            except Exception as e:
+                logger.error(f"Page listener of {page_id} failed: {e}")
+        return new_page
+
+    async def _watch_pages(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake_watchdog.wait(), timeout=self.health_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake_watchdog.clear()
+            try:
+                await self._check_health()
+            except Exception as e:
+                logger.error(f"Page health check failed: {e}")
+
+    async def _check_health(self) -> None:
+        if self._dead_shards:
+            await self._recover_shards()
+
+        for page_id, page in list(self.pages.items()):
+            reason = await self._page_problem(page)
+            if reason:
+                await self.recycle_page(page_id, reason)
+
+    async def _recover_shards(self) -> None:
+        async with self._shard_lock:
+            dead, self._dead_shards = self._dead_shards, set()
+            for shard in dead:
+                self._shard_contexts.pop(shard, None)
+            # Other shards are relaunched on demand by _get_shard_context.
+            if 0 in dead:
+                logger.warning("Browser closed unexpectedly, relaunching")
+                self._set_status(ServiceStatus.LAUNCHING_BROWSER)
+                self._context = await self._launch(self.user_data_dir, 0)
+                self._shard_contexts[0] = self._context
+                await TRACES.attach(self._context)
+                self._ready = asyncio.get_running_loop().create_future()
+                self._ready.set_result(self._context)
+                self._set_status(ServiceStatus.READY)
+
+        recycled = {shard for shard in dead if shard in self._isolated}
+        if 0 in dead:
+            recycled |= {page_id for page_id in set(self.pages) | set(self._page_listeners) if page_id not in self._isolated}
+        for page_id in recycled:
+            await self.recycle_page(page_id, "browser closed")
+
+    async def _page_problem(self, page: Page) -> Optional[str]:
+        if page.is_closed():
+            return "page closed"
+        if page in self._crashed:
+            return "page crashed"
+
+        try:
+            heap = await asyncio.wait_for(self._js_heap_size(page), timeout=10)
+        except asyncio.TimeoutError:
+            return "page not responding"
+        except Exception as e:
+            return f"page unreachable ({e})"
+
+        if heap > self.max_heap_mb * 1024 * 1024:
+            return f"JS heap at {heap / 1024 / 1024:.0f} MB"
+        return None
+
+    async def _js_heap_size(self, page: Page) -> float:
+        session = self._cdp_sessions.get(page)
+        if session is None:
+            session = await page.context.new_cdp_session(page)
+            await session.send("Performance.enable")
+            self._cdp_sessions[page] = session
+        metrics = (await session.send("Performance.getMetrics"))["metrics"]
+        return next((metric["value"] for metric in metrics if metric["name"] == "JSHeapUsedSize"), 0)
+
+    @asynccontextmanager
+    async def lease(self, domain: str) -> AsyncIterator[Page]:
+        """Borrow a pooled page of `domain`, returning it to the pool on exit.
+
+        Up to `pool_size` pages exist per domain, so that many callers can work
+        on the same site in parallel; further callers wait for a page back.
+        """
+        page = await self._acquire(domain)
+        try:
+            yield page
+        finally:
+            await self._release(domain, page)
+
+    async def _acquire(self, domain: str) -> Page:
+        pool = self._pools.setdefault(domain, PagePool(size=max(self.pool_size, 1)))
+        async with pool._available:
+            while True:
+                while pool.idle:
+                    page = pool.idle.pop()
+                    pool.last_used.pop(page, None)
+                    if not page.is_closed():
+                        pool.leased += 1
+                        return page
+
+                if pool.total < pool.size:
+                    pool.leased += 1
+                    break
+
+                await pool._available.wait()
+
+        try:
+            context = await self._get_shard_context(self._next_shard())
+            page = await context.new_page()
+            page.on("crash", self._on_page_crashed)
+            await apply_route_policy(page, domain)
+            return page
+        except Exception:
+            async with pool._available:
+                pool.leased -= 1
+                pool._available.notify()
+            raise
+
+    async def _release(self, domain: str, page: Page) -> None:
+        pool = self._pools.get(domain)
+        if pool is None:
+            return
+
+        crashed = page in self._crashed
+        self._crashed.discard(page)
+        async with pool._available:
+            pool.leased -= 1
+            if not page.is_closed() and not crashed:
+                pool.idle.append(page)
+                pool.last_used[page] = time.monotonic()
+            pool._available.notify()
+        if crashed and not page.is_closed():
+            # The next lease opens a fresh page instead of a dead one.
+            try:
+                await page.close()
+            except Exception as e:
+                logger.debug(f"Closing crashed {domain} page failed: {e}")
+
+    async def _evict_idle_pages(self) -> None:
+        while True:
+            await asyncio.sleep(max(self.idle_timeout / 2, 1))
+            deadline = time.monotonic() - self.idle_timeout
+            for domain, pool in list(self._pools.items()):
+                async with pool._available:
+                    expired = [page for page in pool.idle if pool.last_used.get(page, 0) < deadline]
+                    for page in expired:
+                        pool.idle.remove(page)
+                        pool.last_used.pop(page, None)
+                        pool._available.notify()
+                for page in expired:
+                    try:
+                        await page.close()
+                    except Exception as e:
+                        logger.debug(f"Closing idle {domain} page failed: {e}")
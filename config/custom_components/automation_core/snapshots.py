@@ -0,0 +1,327 @@
+from dataclasses import dataclass, field
+import asyncio
+import gzip
+import json
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from playwright.async_api import BrowserContext, Page, Route
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 1
+RESTORE_PATH = "/__automation_restore__"
+
+# Chromium caches that are rebuilt on demand. Service worker caches are kept
+# because they hold the app shell that makes sites like WhatsApp Web start fast.
+PROFILE_CACHES = (
+    "Default/Cache",
+    "Default/Code Cache",
+    "Default/GPUCache",
+    "GrShaderCache",
+    "GraphiteDawnCache",
+    "ShaderCache",
+)
+
+# Values are tagged so binary keys and dates survive the trip through JSON.
+CODEC = """
+const toBase64 = (bytes) => {
+    let binary = '';
+    for (let i = 0; i < bytes.length; i += 0x8000) {
+        binary += String.fromCharCode.apply(null, bytes.subarray(i, i + 0x8000));
+    }
+    return btoa(binary);
+};
+const fromBase64 = (text) => Uint8Array.from(atob(text), c => c.charCodeAt(0));
+const encode = (value) => {
+    if (value === undefined) return { __t: 'undefined' };
+    if (value === null || typeof value !== 'object') return value;
+    if (value instanceof Date) return { __t: 'date', v: value.getTime() };
+    if (value instanceof ArrayBuffer) return { __t: 'buffer', v: toBase64(new Uint8Array(value)) };
+    if (ArrayBuffer.isView(value)) {
+        return { __t: 'view', c: value.constructor.name, v: toBase64(new Uint8Array(value.buffer, value.byteOffset, value.byteLength)) };
+    }
+    if (value instanceof Map) return { __t: 'map', v: Array.from(value, ([k, v]) => [encode(k), encode(v)]) };
+    if (value instanceof Set) return { __t: 'set', v: Array.from(value, encode) };
+    if (Array.isArray(value)) return value.map(encode);
+    if (Object.getPrototypeOf(value) !== Object.prototype && Object.getPrototypeOf(value) !== null) {
+        throw new Error(`cannot export ${value.constructor.name}`);
+    }
+    const result = {};
+    for (const [k, v] of Object.entries(value)) result[k] = encode(v);
+    return result;
+};
+const decode = (value) => {
+    if (value === null || typeof value !== 'object') return value;
+    if (Array.isArray(value)) return value.map(decode);
+    switch (value.__t) {
+        case 'undefined': return undefined;
+        case 'date': return new Date(value.v);
+        case 'buffer': return fromBase64(value.v).buffer;
+        case 'view': {
+            const bytes = fromBase64(value.v);
+            const View = globalThis[value.c] || Uint8Array;
+            return View === DataView ? new DataView(bytes.buffer) : new View(bytes.buffer, 0, bytes.byteLength / (View.BYTES_PER_ELEMENT || 1));
+        }
+        case 'map': return new Map(value.v.map(([k, v]) => [decode(k), decode(v)]));
+        case 'set': return new Set(value.v.map(decode));
+    }
+    const result = {};
+    for (const [k, v] of Object.entries(value)) result[k] = decode(v);
+    return result;
+};
+const request = (req) => new Promise((resolve, reject) => {
+    req.onsuccess = () => resolve(req.result);
+    req.onerror = () => reject(req.error);
+});
+"""
+
+EXPORT_INDEXED_DB = f"""
+async (excluded) => {{
+    {CODEC}
+    const databases = [];
+    let skipped = 0;
+    for (const info of await indexedDB.databases()) {{
+        if (!info.name || excluded.includes(info.name)) continue;
+        const db = await request(indexedDB.open(info.name));
+        const stores = [];
+        for (const name of Array.from(db.objectStoreNames)) {{
+            const store = db.transaction(name, 'readonly').objectStore(name);
+            const [keys, values] = await Promise.all([request(store.getAllKeys()), request(store.getAll())]);
+            const records = [];
+            keys.forEach((key, i) => {{
+                try {{
+                    records.push([encode(key), encode(values[i])]);
+                }} catch (e) {{
+                    skipped++;
+                }}
+            }});
+            stores.push({{
+                name,
+                keyPath: store.keyPath,
+                autoIncrement: store.autoIncrement,
+                indexes: Array.from(store.indexNames, (indexName) => {{
+                    const index = store.index(indexName);
+                    return {{ name: indexName, keyPath: index.keyPath, unique: index.unique, multiEntry: index.multiEntry }};
+                }}),
+                records,
+            }});
+        }}
+        databases.push({{ name: info.name, version: db.version, stores }});
+        db.close();
+    }}
+    return {{ databases, skipped }};
+}}
+"""
+
+IMPORT_STORAGE = f"""
+async ({{ localStorageItems, databases }}) => {{
+    {CODEC}
+    for (const {{ name, value }} of localStorageItems) localStorage.setItem(name, value);
+    for (const database of databases) {{
+        const open = indexedDB.open(database.name, database.version);
+        open.onupgradeneeded = () => {{
+            const db = open.result;
+            for (const spec of database.stores) {{
+                if (db.objectStoreNames.contains(spec.name)) continue;
+                const store = db.createObjectStore(spec.name, {{ keyPath: spec.keyPath, autoIncrement: spec.autoIncrement }});
+                for (const index of spec.indexes) {{
+                    store.createIndex(index.name, index.keyPath, {{ unique: index.unique, multiEntry: index.multiEntry }});
+                }}
+            }}
+        }};
+        const db = await request(open);
+        const names = database.stores.map(spec => spec.name).filter(name => db.objectStoreNames.contains(name));
+        if (names.length) {{
+            const transaction = db.transaction(names, 'readwrite');
+            for (const spec of database.stores) {{
+                if (!names.includes(spec.name)) continue;
+                const store = transaction.objectStore(spec.name);
+                for (const [key, value] of spec.records) {{
+                    if (spec.keyPath === null) store.put(decode(value), decode(key));
+                    else store.put(decode(value));
+                }}
+            }}
+            await new Promise((resolve, reject) => {{
+                transaction.oncomplete = resolve;
+                transaction.onerror = () => reject(transaction.error);
+            }});
+        }}
+        db.close();
+    }}
+}}
+"""
+
+@dataclass(frozen=True)
+class SnapshotPolicy:
+    """What to keep from the session of one automation domain."""
+    # Databases that only cache data the site can fetch again.
+    excluded_databases: Tuple[str, ...] = ()
+    # localStorage keys without which there is no session worth keeping.
+    required_local_storage: Tuple[str, ...] = ()
+
+_policies: Dict[str, SnapshotPolicy] = {}
+
+def register_snapshot_policy(domain: str, policy: SnapshotPolicy) -> None:
+    _policies[domain] = policy
+
+def get_snapshot_policy(domain: str) -> SnapshotPolicy:
+    # Pages of one automation share its policy: "whatsapp.work" uses "whatsapp".
+    return _policies.get(domain) or _policies.get(domain.split(".")[0], SnapshotPolicy())
+
+def _cookie_matches(cookie: dict, host: str) -> bool:
+    domain = cookie.get("domain", "").lstrip(".")
+    return host == domain or host.endswith(f".{domain}")
+
+@dataclass
+class SessionSnapshots:
+    """Versioned, gzipped snapshots of the session of each automation domain.
+
+    A snapshot holds the cookies, localStorage and IndexedDB of the origin the
+    domain's page is on. They are restored into a fresh profile, so a lost or
+    pruned profile, or a new host, starts already signed in. Snapshots of
+    isolated pages are only restored into the profile of that page.
+
+    Snapshots hold live session tokens in plain text, so they are readable
+    by their owner only; anyone who can read them can take over the session.
+    """
+    directory: Path = field(default_factory=lambda: Path("./Automation_Data/snapshots").absolute())
+    keep: int = 3
+
+    async def take(self, page: Page, domain: str, isolated: bool = False) -> Optional[Path]:
+        parts = urlsplit(page.url)
+        if parts.scheme not in ("http", "https"):
+            return None
+        origin = f"{parts.scheme}://{parts.netloc}"
+        policy = get_snapshot_policy(domain)
+
+        state = await page.context.storage_state()
+        local_storage = next(
+            (entry["localStorage"] for entry in state.get("origins", []) if entry["origin"] == origin), []
+        )
+        present = {item["name"] for item in local_storage}
+        if any(key not in present for key in policy.required_local_storage):
+            logger.debug(f"No {domain} session to snapshot")
+            return None
+
+        exported = await page.evaluate(EXPORT_INDEXED_DB, list(policy.excluded_databases))
+        if exported["skipped"]:
+            logger.warning(f"{exported['skipped']} IndexedDB records of {domain} could not be exported")
+
+        snapshot = {
+            "format": SNAPSHOT_FORMAT,
+            "domain": domain,
+            "origin": origin,
+            "isolated": isolated,
+            "created": time.time(),
+            "cookies": [cookie for cookie in state.get("cookies", []) if _cookie_matches(cookie, parts.hostname or "")],
+            "local_storage": local_storage,
+            "indexed_db": exported["databases"],
+        }
+        path = await asyncio.to_thread(self._write, domain, snapshot)
+        logger.info(f"Session snapshot of {domain} saved to {path}")
+        return path
+
+    def _write(self, domain: str, snapshot: dict) -> Path:
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        directory = self.directory / domain
+        directory.mkdir(mode=0o700, exist_ok=True)
+        path = directory / f"{int(snapshot['created'] * 1000)}.json.gz"
+        temporary = path.with_suffix(".tmp")
+        descriptor = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with open(descriptor, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as file:
+            json.dump(snapshot, file, separators=(",", ":"))
+        temporary.replace(path)
+        for old in self._versions(domain)[self.keep:]:
+            old.unlink(missing_ok=True)
+        return path
+
+    def _versions(self, domain: str) -> List[Path]:
+        """Snapshots of `domain`, newest first."""
+        directory = self.directory / domain
+        if not directory.is_dir():
+            return []
+        return sorted(directory.glob("*.json.gz"), key=lambda path: int(path.name.split(".")[0]), reverse=True)
+
+    def _read_latest(self, domain: str) -> Optional[dict]:
+        for path in self._versions(domain):
+            try:
+                with gzip.open(path, "rt", encoding="utf-8") as file:
+                    snapshot = json.load(file)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable snapshot {path}: {e}")
+                continue
+            if snapshot.get("format") == SNAPSHOT_FORMAT:
+                return snapshot
+        return None
+
+    async def restore_all(self, context: BrowserContext) -> None:
+        if not self.directory.is_dir():
+            return
+        domains = [path.name for path in self.directory.iterdir() if path.is_dir()]
+        for domain in domains:
+            try:
+                await self.restore(context, domain)
+            except Exception as e:
+                logger.error(f"Restoring the {domain} session failed: {e}")
+
+    async def restore(self, context: BrowserContext, domain: str, isolated: bool = False) -> bool:
+        snapshot = await asyncio.to_thread(self._read_latest, domain)
+        if snapshot is None or snapshot.get("isolated", False) != isolated:
+            return False
+
+        if snapshot["cookies"]:
+            await context.add_cookies(snapshot["cookies"])
+
+        # Storage is written from a blank page served on the origin, so the
+        # site itself is not loaded (and does not start its own session).
+        origin = snapshot["origin"]
+        page = await context.new_page()
+        try:
+            async def blank(route: Route) -> None:
+                await route.fulfill(body="<!DOCTYPE html><html></html>", content_type="text/html")
+
+            await page.route(f"{origin}/**", blank)
+            await page.goto(f"{origin}{RESTORE_PATH}")
+            await page.evaluate(IMPORT_STORAGE, {
+                "localStorageItems": snapshot["local_storage"],
+                "databases": snapshot["indexed_db"],
+            })
+        finally:
+            await page.close()
+        logger.info(f"Session of {domain} restored from snapshot")
+        return True
+
+def prune_due(user_data_dir: Path, interval: float) -> bool:
+    """Whether the profile was last pruned more than `interval` seconds ago."""
+    try:
+        return time.time() - (user_data_dir / ".last_prune").stat().st_mtime >= interval
+    except FileNotFoundError:
+        return True
+
+def mark_pruned(user_data_dir: Path) -> None:
+    if user_data_dir.is_dir():
+        (user_data_dir / ".last_prune").touch()
+
+def prune_profile(user_data_dir: Path, interval: float) -> int:
+    """Delete rebuildable caches of a profile not in use, at most once per `interval` seconds.
+
+    Returns the number of bytes freed.
+    """
+    if not prune_due(user_data_dir, interval):
+        return 0
+
+    freed = 0
+    for relative in PROFILE_CACHES:
+        path = user_data_dir / relative
+        if not path.is_dir():
+            continue
+        freed += sum(entry.stat().st_size for entry in path.rglob("*") if entry.is_file())
+        shutil.rmtree(path, ignore_errors=True)
+    mark_pruned(user_data_dir)
+    return freed
@@ -8,7 +8,7 @@ sys.path.append(ROOT_DIR)
 import asyncio
 import logging
 from custom_components.automation_core.service import AutomationService
-from custom_components.automation_core.automations.whatsapp.lib import WhatsApp, WhatsAppEventName, WhatsAppLoginStatus, WhatsAppMessage
+from custom_components.automation_core.automations.whatsapp.lib import WhatsAppAccounts, WhatsAppEventName, WhatsAppLoginStatus, WhatsAppMessage
 from custom_components.automation_core.automations.declaraguate.lib import DeclaraGuate
 from playwright.async_api import Page
 
@@ -18,16 +18,17 @@ logging.basicConfig(
     handlers=[logging.StreamHandler()]
 )
 LOGGER = logging.getLogger(__name__)
+ACCOUNTS = WhatsAppAccounts()
 
 async def on_login(status: WhatsAppLoginStatus):
     LOGGER.info(f"New Status: {status}")
     if WhatsAppLoginStatus.LOGGED_IN is status:
-        await WhatsApp.create_new_messages_listener_event()
+        await ACCOUNTS.get().create_new_messages_listener_event()
 
 async def forward_message(event: WhatsAppMessage):
     LOGGER.info(f"New Message from:{event.sender} message:{event.message}")
     if (event.me):
-        await WhatsApp.find_by_name(event.sender)
+        await ACCOUNTS.get().find_by_name(event.sender)
         # await WhatsApp._send_image_impl(page, "config/www/automation_core/whatsapp/qr.png", "test message")
 
 async def main():
@@ -35,12 +36,12 @@ async def main():
     automation_service = AutomationService()
     try:
         whatsapp: Page = await automation_service.get_page('whatsapp')
-        declaraguate: Page = await automation_service.get_page('declaraguate')
-        WhatsApp.event_emitter.add_listener(WhatsAppEventName.NEW_QR_SCREENSHOT, lambda path: LOGGER.info(f"New QR!! : {path}"))
-        WhatsApp.event_emitter.add_listener(WhatsAppEventName.LOGIN_STATUS, on_login)
-        WhatsApp.event_emitter.add_listener(WhatsAppEventName.MESSAGE_COMING, forward_message)
-        await WhatsApp.login(whatsapp)
-        await DeclaraGuate.login(declaraguate)
+        client = ACCOUNTS.get()
+        client.event_emitter.add_listener(WhatsAppEventName.NEW_QR_CODE, lambda data_ref: LOGGER.info(f"New QR!! : {data_ref}"))
+        client.event_emitter.add_listener(WhatsAppEventName.LOGIN_STATUS, on_login)
+        client.event_emitter.add_listener(WhatsAppEventName.MESSAGE_COMING, forward_message)
+        await client.login(whatsapp)
+        asyncio.create_task(DeclaraGuate.declare(automation_service.lease, client))
     except Exception as e:
         LOGGER.error(f"Error: {e}")
 
@@ -48,7 +49,7 @@ async def main():
         while True:
             await asyncio.sleep(5)
     except asyncio.CancelledError:
-        await WhatsApp.shutdown()
+        await ACCOUNTS.shutdown()
         await automation_service.shutdown()
 
 if __name__ == "__main__":
@@ -1,52 +1,12 @@
-import os
-import sys
-import inspect
-import importlib.util
+import io
+import qrcode
 
 from playwright.async_api import Locator
 from datetime import timedelta
 
 from pathlib import Path
-from typing import Type, List, TypeVar
-from homeassistant.core import HomeAssistant
-from homeassistant.config_entries import ConfigEntry
 
 ONE_SECOND = 1000
-T = TypeVar('T')
-
-def get_automation_instances_of_type(hass: HomeAssistant, config_entry:ConfigEntry, entity_type: Type[T]) -> List[T]:
-    instances = []
-    current_dir = Path(__file__).parent
-    root_path = (current_dir / "automations").resolve()
-
-    if not root_path.exists():
-        raise FileNotFoundError(f"The directory doesn't exist {root_path}")
-
-    for file_path in root_path.rglob("*.py"):
-        if file_path.name.startswith('__'):
-            continue
-
-        try:
-            relative_path = file_path.relative_to(current_dir)
-            module_name = str(relative_path).replace(os.sep, '.').rstrip('.py')
-            spec = importlib.util.spec_from_file_location(module_name, file_path)
-            module = importlib.util.module_from_spec(spec)
-            sys.modules[module_name] = module
-            spec.loader.exec_module(module)
-
-            for name, obj in inspect.getmembers(module):
-                if name.startswith('__'):
-                    continue
-
-                if (inspect.isclass(obj) and issubclass(obj, entity_type) and obj != entity_type):
-                    class_module = inspect.getmodule(obj)
-                    if class_module and str(class_module.__file__).startswith(str(root_path)):
-                        instance = obj(hass, config_entry)
-                        instances.append(instance)
-        except Exception as e:
-            print(f"Error importing {file_path}: {e}")
-            
-    return instances
 
 def get_domain(dir: str) -> str:
     return Path(dir).parent.name
@@ -67,6 +27,15 @@ def seconds(n):
 def minutes(n):
     return get_milliseconds(minutes=n)
 
+def render_qr_png(data: str, box_size: int = 8, border: int = 2) -> bytes:
+    """Encode `data` as a QR code PNG. CPU bound, run it in an executor."""
+    qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_L, box_size=box_size, border=border)
+    qr.add_data(data)
+    qr.make(fit=True)
+    buffer = io.BytesIO()
+    qr.make_image(fill_color="black", back_color="white").save(buffer)
+    return buffer.getvalue()
+
 async def take_qr_screenshot(selector:Locator, path: str):
     element = await selector.element_handle()
     if element:
@@ -0,0 +1,20 @@
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from custom_components.automation_core.metrics import METRICS
+from custom_components.automation_core.utils import get_main_domain
+
+DOMAIN = get_main_domain()
+
+class MetricsView(HomeAssistantView):
+    """Command timings for Prometheus to scrape."""
+
+    url = f"/api/{DOMAIN}/metrics"
+    name = f"api:{DOMAIN}:metrics"
+
+    async def get(self, request: web.Request) -> web.Response:
+        return web.Response(
+            text=METRICS.prometheus(),
+            content_type="text/plain",
+            headers={"Cache-Control": "no-store"}
+        )
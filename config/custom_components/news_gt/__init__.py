@@ -1,15 +1,20 @@
 """The News Guatemala integration."""
 
 from __future__ import annotations
+
+import voluptuous as vol
+
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.components.frontend import add_extra_js_url
 from homeassistant.components.http import StaticPathConfig
 
-from .const import DOMAIN
+from .const import DOMAIN, MAX_ARTICLES_DEFAULT
+from .articles import ArticleCache
+from .thumbnails import ThumbnailCache, ThumbnailView
 
 PLATFORMS = [Platform.SENSOR]
 
@@ -30,23 +35,77 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Set up the News GT from config flow."""
 
+    max_articles = config_entry.options.get("max_articles", config_entry.data.get("max_articles", MAX_ARTICLES_DEFAULT))
+    hass.data.setdefault(DOMAIN, {})[config_entry.entry_id] = ArticleCache(max_articles)
+
     await _register_custom_card(hass)
+    _register_thumbnail_view(hass)
+    _register_services(hass)
     await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
+    config_entry.async_on_unload(config_entry.add_update_listener(_async_update_listener))
     return True
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry so changed options take effect."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload the News GT integration."""
 
-    await hass.config_entries.async_forward_entry_unload(entry, "sensor")
+    unloaded = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unloaded:
+        hass.data[DOMAIN].pop(entry.entry_id, None)
 
-    return True
+    return unloaded
+
+def _register_services(hass: HomeAssistant) -> None:
+    """Serve the full article list, which is kept out of the state attributes."""
+    if hass.services.has_service(DOMAIN, "get_articles"):
+        return
+
+    async def get_articles(call: ServiceCall) -> ServiceResponse:
+        caches = list(hass.data.get(DOMAIN, {}).values())
+        if not caches:
+            return {"version": None, "articles": []}
+
+        cache: ArticleCache = caches[0]
+        if call.data.get("version") == cache.version:
+            return {"version": cache.version, "unchanged": True, "articles": []}
+
+        articles = cache.articles
+        if limit := call.data.get("limit"):
+            articles = articles[:limit]
+        return {"version": cache.version, "articles": articles}
+
+    hass.services.async_register(
+        DOMAIN,
+        "get_articles",
+        get_articles,
+        schema=vol.Schema({
+            vol.Optional("limit"): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional("version"): str,
+        }),
+        supports_response=SupportsResponse.ONLY
+    )
 
 async def _register_custom_card(hass: HomeAssistant):
     """Register the custom Lovelace card."""
+    # Static paths cannot be registered twice, and the entry reloads on option changes.
+    if hass.data.setdefault(f"{DOMAIN}_card_registered", False):
+        return
+    hass.data[f"{DOMAIN}_card_registered"] = True
     add_extra_js_url(hass, "/local/news_gt/news_gt.js")
     await hass.http.async_register_static_paths([
         StaticPathConfig(
             url_path="/local/news_gt/news_gt.js",
             path=hass.config.path("www/news_gt/news_gt.js")
         )
-    ])
\ No newline at end of file
+    ])
+
+def _register_thumbnail_view(hass: HomeAssistant) -> None:
+    """Serve downscaled article images from a local cache."""
+    # Like the card, the view cannot be registered twice.
+    if f"{DOMAIN}_thumbnails" in hass.data:
+        return
+    cache = hass.data[f"{DOMAIN}_thumbnails"] = ThumbnailCache(hass)
+    hass.http.register_view(ThumbnailView(cache))
@@ -0,0 +1,159 @@
+"""Concurrent fetching and merging of several news feeds."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import unicodedata
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from difflib import SequenceMatcher
+from email.utils import parsedate_to_datetime
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .extractor import ArticleExtractor
+from .fetcher import FeedFetcher
+
+_LOGGER = logging.getLogger(__name__)
+
+FEED_FIELDS = ("url", "title", "link", "summary", "image", "published")
+MAX_CONCURRENT_FETCHES = 4
+TITLE_SIMILARITY = 0.9
+OLDEST = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def get_feeds(entry: ConfigEntry) -> list[dict]:
+    """Configured feeds, including entries created before multi-feed support."""
+    feeds = entry.options.get("feeds", entry.data.get("feeds"))
+    if feeds is not None:
+        return feeds
+
+    legacy = {key: entry.options.get(key, entry.data.get(key, '')) for key in FEED_FIELDS}
+    return [legacy] if legacy["url"] else []
+
+
+def parse_published(value) -> datetime:
+    """Best-effort timestamp of an article, oldest possible when unknown."""
+    if not isinstance(value, str) or not value:
+        return OLDEST
+
+    parsed = dt_util.parse_datetime(value)
+    if parsed is None:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return OLDEST
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def normalize_title(title) -> str:
+    text = unicodedata.normalize("NFKD", str(title or "")).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]+", " ", text.lower()).strip()
+
+
+def normalize_link(link) -> str:
+    link = str(link or "").strip().lower()
+    link = re.sub(r"^https?://(www\.)?", "", link)
+    return link.split("#")[0].rstrip("/")
+
+
+@dataclass
+class Feed:
+    url: str
+    fetcher: FeedFetcher
+    extractor: ArticleExtractor
+    articles: list[dict] = field(default_factory=list)
+    loaded: bool = False
+
+
+class NewsAggregator:
+    """Fetch every feed concurrently and merge them into one list.
+
+    Fetches are bounded by a semaphore. Articles are deduplicated by
+    normalized link and by near-identical titles (the same story published
+    by several sources), then sorted by `published`, newest first.
+    """
+
+    def __init__(self, hass: HomeAssistant, feeds: list[dict]) -> None:
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+        self._feeds = [
+            Feed(
+                url=feed["url"],
+                fetcher=FeedFetcher(hass, feed["url"]),
+                extractor=ArticleExtractor({
+                    'title': feed.get("title", ''),
+                    'summary': feed.get("summary", ''),
+                    'thumbnail': feed.get("image", ''),
+                    'link': feed.get("link", ''),
+                    'published': feed.get("published", ''),
+                }),
+            )
+            for feed in feeds
+        ]
+        self.articles: list[dict] = []
+
+    async def async_refresh(self) -> bool:
+        """Refresh all feeds; returns whether any feed brought new content.
+
+        Raises when every feed failed.
+        """
+        results = await asyncio.gather(
+            *(self._refresh_feed(feed) for feed in self._feeds), return_exceptions=True
+        )
+        errors = [result for result in results if isinstance(result, Exception)]
+        if self._feeds and len(errors) == len(self._feeds):
+            raise errors[0]
+
+        if not any(result is True for result in results):
+            return False
+
+        self.articles = self._merge([feed.articles for feed in self._feeds])
+        return True
+
+    async def _refresh_feed(self, feed: Feed) -> bool:
+        async with self._semaphore:
+            try:
+                result = await feed.fetcher.async_fetch()
+            except Exception as e:
+                _LOGGER.warning(f"Error fetching news from {feed.url}: {e}")
+                raise
+
+        if not result.modified and feed.loaded:
+            return False
+
+        feed.articles = feed.extractor.extract(result.data) if result.data is not None else []
+        feed.loaded = True
+        return True
+
+    @staticmethod
+    def _merge(sources: list[list[dict]]) -> list[dict]:
+        links: set[str] = set()
+        titles: dict[str, None] = {}
+        merged = []
+        for article in (article for articles in sources for article in articles):
+            link = normalize_link(article.get("link"))
+            title = normalize_title(article.get("title"))
+            if link and link in links:
+                continue
+            if title and (title in titles or any(
+                SequenceMatcher(None, title, seen).quick_ratio() >= TITLE_SIMILARITY
+                and SequenceMatcher(None, title, seen).ratio() >= TITLE_SIMILARITY
+                for seen in titles
+            )):
+                continue
+
+            if link:
+                links.add(link)
+            if title:
+                titles[title] = None
+            merged.append(article)
+
+        merged.sort(key=lambda article: parse_published(article.get("published")), reverse=True)
+        return merged
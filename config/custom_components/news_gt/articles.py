@@ -0,0 +1,59 @@
+"""Bounded, deduplicated cache of news articles."""
+
+from __future__ import annotations
+
+import hashlib
+
+from collections import OrderedDict
+
+
+def article_key(article: dict) -> str:
+    """Stable identity of an article, its link or else its title."""
+    identity = article.get("link") or article.get("title") or repr(sorted(article.items()))
+    return hashlib.sha1(str(identity).encode()).hexdigest()
+
+
+class ArticleCache:
+    """Keeps up to `max_articles` unique articles, newest refresh first.
+
+    Every change bumps `version`, a short hash of the cached keys, which lets
+    clients skip refetching the full list when nothing changed.
+    """
+
+    def __init__(self, max_articles: int) -> None:
+        self.max_articles = max_articles
+        self._articles: OrderedDict[str, dict] = OrderedDict()
+        self.version: str | None = None
+
+    @property
+    def articles(self) -> list[dict]:
+        return list(self._articles.values())
+
+    def headlines(self, count: int) -> list[dict]:
+        return [
+            {key: article[key] for key in ("title", "link", "published") if key in article}
+            for article in list(self._articles.values())[:count]
+        ]
+
+    def update(self, articles: list[dict]) -> bool:
+        """Merge a fresh batch in front of the cached articles.
+
+        Returns whether the cached set changed.
+        """
+        merged: OrderedDict[str, dict] = OrderedDict()
+        for article in articles:
+            merged.setdefault(article_key(article), article)
+        for key, article in self._articles.items():
+            if len(merged) >= self.max_articles:
+                break
+            merged.setdefault(key, article)
+        while len(merged) > self.max_articles:
+            merged.popitem()
+
+        version = hashlib.sha1(
+            "".join(f"{key}{sorted(article.items())}" for key, article in merged.items()).encode()
+        ).hexdigest()[:12]
+        changed = version != self.version
+        self._articles = merged
+        self.version = version
+        return changed
@@ -3,18 +3,44 @@ import voluptuous as vol
 from typing import Any
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers import selector
 from homeassistant.config_entries import(
-    ConfigFlow, 
-    ConfigFlowResult, 
-    OptionsFlow, 
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
     ConfigEntry)
+from .aggregator import FEED_FIELDS, get_feeds
 from .const import *
 
+FEED_PATHS_DEFAULT = {
+    "title": TITLE_JSON_PATH,
+    "link": LINK_JSON_PATH,
+    "summary": SUMMARY_JSON_PATH,
+    "image": IMAGE_JSON_PATH,
+    "published": PUBLISHED_JSON_PATH,
+}
+
+def feed_schema(feed: dict, add_another: bool = True) -> vol.Schema:
+    """Schema of one feed: its URL and the JSONPath of each article field."""
+    schema = {vol.Required(key, default=feed.get(key, '')): str for key in FEED_FIELDS}
+    if add_another:
+        schema[vol.Required("add_another", default=False)] = bool
+    return vol.Schema(schema)
+
+def settings_schema(refresh_interval: int, max_articles: int) -> dict:
+    return {
+        vol.Required("refresh_interval", default=refresh_interval): vol.All(int, vol.Range(min=5)),
+        vol.Required("max_articles", default=max_articles): vol.All(int, vol.Range(min=1)),
+    }
+
 class NewsGTFlowHandler(ConfigFlow, domain=DOMAIN):
     """Config flow for news gt integration."""
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        self._data: dict[str, Any] = {"feeds": []}
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -24,41 +50,85 @@ class NewsGTFlowHandler(ConfigFlow, domain=DOMAIN):
         self._abort_if_unique_id_configured()
 
         if user_input is not None:
-            return self.async_create_entry(title="News GT", data=user_input)
-
-        data_schema = vol.Schema({
-            vol.Required("url", default=URL_DEFAULT): str,
-            vol.Required("title", default=TITLE_JSON_PATH): str,
-            vol.Required("link", default=LINK_JSON_PATH): str,
-            vol.Required("summary", default=SUMMARY_JSON_PATH): str,
-            vol.Required("image", default=IMAGE_JSON_PATH): str,
-            vol.Required("published", default=PUBLISHED_JSON_PATH): str,
-        })
+            self._data["refresh_interval"] = user_input.pop("refresh_interval")
+            self._data["max_articles"] = user_input.pop("max_articles")
+            return await self._add_feed(user_input)
+
+        data_schema = feed_schema({"url": URL_DEFAULT, **FEED_PATHS_DEFAULT}).extend(settings_schema(REFRESH_INTERVAL_DEFAULT, MAX_ARTICLES_DEFAULT))
         return self.async_show_form(step_id="user", data_schema=data_schema, errors={})
-    
+
+    async def async_step_feed(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Add one more feed to the entry being created."""
+        if user_input is not None:
+            return await self._add_feed(user_input)
+
+        return self.async_show_form(step_id="feed", data_schema=feed_schema(FEED_PATHS_DEFAULT), errors={})
+
+    async def _add_feed(self, user_input: dict[str, Any]) -> ConfigFlowResult:
+        add_another = user_input.pop("add_another", False)
+        self._data["feeds"].append(user_input)
+        if add_another:
+            return await self.async_step_feed()
+        return self.async_create_entry(title="News GT", data=self._data)
+
     @staticmethod
     @callback
     def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
         """Create the options flow."""
         return NewsGTOptionsFlow()
-    
+
 
 class NewsGTOptionsFlow(OptionsFlow):
     async def async_step_init(self, user_input: dict[str, any] | None = None) -> FlowResult:
         """Manage the options."""
+        return self.async_show_menu(step_id="init", menu_options=["settings", "add_feed", "remove_feed"])
+
+    async def async_step_settings(self, user_input: dict[str, any] | None = None) -> FlowResult:
+        """Change the refresh interval and article limit."""
+        if user_input is not None:
+            return self._save(**user_input)
+
+        options_schema = vol.Schema(settings_schema(
+            self.get_entry("refresh_interval") or REFRESH_INTERVAL_DEFAULT,
+            self.get_entry("max_articles") or MAX_ARTICLES_DEFAULT
+        ))
+        return self.async_show_form(step_id="settings", data_schema=options_schema)
+
+    async def async_step_add_feed(self, user_input: dict[str, any] | None = None) -> FlowResult:
+        """Add a feed."""
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
-        
+            return self._save(feeds=get_feeds(self.config_entry) + [user_input])
+
+        return self.async_show_form(step_id="add_feed", data_schema=feed_schema(FEED_PATHS_DEFAULT, add_another=False))
+
+    async def async_step_remove_feed(self, user_input: dict[str, any] | None = None) -> FlowResult:
+        """Remove feeds."""
+        feeds = get_feeds(self.config_entry)
+        if user_input is not None:
+            removed = set(user_input["urls"])
+            return self._save(feeds=[feed for feed in feeds if feed["url"] not in removed])
+
         options_schema = vol.Schema({
-            vol.Required("url", default=self.get_entry("url")): str,
-            vol.Required("title", default=self.get_entry("title")): str,
-            vol.Required("link", default=self.get_entry("link")): str,
-            vol.Required("summary", default=self.get_entry("summary")): str,
-            vol.Required("image", default=self.get_entry("image")): str,
-            vol.Required("published", default=self.get_entry("published")): str,
+            vol.Required("urls", default=[]): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=[feed["url"] for feed in feeds],
+                    multiple=True,
+                    mode=selector.SelectSelectorMode.LIST
+                )
+            )
         })
+        return self.async_show_form(step_id="remove_feed", data_schema=options_schema)
+
+    def _save(self, **changes) -> FlowResult:
+        options = {
+            "feeds": get_feeds(self.config_entry),
+            "refresh_interval": self.get_entry("refresh_interval") or REFRESH_INTERVAL_DEFAULT,
+            "max_articles": self.get_entry("max_articles") or MAX_ARTICLES_DEFAULT,
+        }
+        options.update(changes)
+        return self.async_create_entry(title="", data=options)
 
-        return self.async_show_form(step_id="init", data_schema=options_schema)
-    
     def get_entry(self, key: str) -> str:
-        return self.config_entry.options.get(key, self.config_entry.data.get(key, ''))
\ No newline at end of file
+        return self.config_entry.options.get(key, self.config_entry.data.get(key, ''))
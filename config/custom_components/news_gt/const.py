@@ -6,4 +6,7 @@ TITLE_JSON_PATH = "$.results[*].title"
 LINK_JSON_PATH = "$.results[*].link"
 SUMMARY_JSON_PATH = "$.results[*].description"
 IMAGE_JSON_PATH = "$.results[*].image_url"
-PUBLISHED_JSON_PATH = "$.results[*].pubDate"
\ No newline at end of file
+PUBLISHED_JSON_PATH = "$.results[*].pubDate"
+REFRESH_INTERVAL_DEFAULT = 1440
+MAX_ARTICLES_DEFAULT = 50
+HEADLINES_COUNT = 5
@@ -0,0 +1,165 @@
+"""Compiled JSONPath extraction of articles from a feed payload."""
+
+from __future__ import annotations
+
+import re
+
+from typing import Any
+
+from jsonpath import jsonpath
+
+WILDCARD = object()
+# An article without any of these (when configured) cannot be shown or told apart.
+IDENTITY_FIELDS = ("title", "link")
+TOKEN = re.compile(
+    r"""\.(?P<name>[A-Za-z_][\w-]*)"""
+    r"""|\.\*|\[\*\]"""
+    r"""|\[(?P<index>-?\d+)\]"""
+    r"""|\[(?P<quote>['"])(?P<key>.*?)(?P=quote)\]"""
+)
+
+
+class CompiledPath:
+    """A JSONPath made of child keys, indexes and wildcards, parsed once."""
+
+    def __init__(self, steps: tuple) -> None:
+        self.steps = steps
+
+    @classmethod
+    def compile(cls, path: str) -> CompiledPath | None:
+        """Compile `path`, or return None when it uses unsupported syntax."""
+        path = path.strip()
+        if not path.startswith("$"):
+            return None
+
+        steps = []
+        position = 1
+        while position < len(path):
+            match = TOKEN.match(path, position)
+            if match is None:
+                return None
+            if match.group("name") is not None:
+                steps.append(match.group("name"))
+            elif match.group("index") is not None:
+                steps.append(int(match.group("index")))
+            elif match.group("key") is not None:
+                steps.append(match.group("key"))
+            else:
+                steps.append(WILDCARD)
+            position = match.end()
+        return cls(tuple(steps))
+
+    def find(self, data: Any) -> list:
+        """Every value the path matches in `data`."""
+        current = [data]
+        for step in self.steps:
+            matches = []
+            for node in current:
+                if step is WILDCARD:
+                    if isinstance(node, list):
+                        matches.extend(node)
+                    elif isinstance(node, dict):
+                        matches.extend(node.values())
+                elif isinstance(step, int):
+                    if isinstance(node, list) and -len(node) <= step < len(node):
+                        matches.append(node[step])
+                elif isinstance(node, dict) and step in node:
+                    matches.append(node[step])
+            current = matches
+        return current
+
+    def first(self, data: Any) -> Any:
+        """The first value the path matches in `data`, or None."""
+        if WILDCARD in self.steps:
+            matches = self.find(data)
+            return matches[0] if matches else None
+
+        node = data
+        for step in self.steps:
+            if isinstance(step, int):
+                if not isinstance(node, list) or not -len(node) <= step < len(node):
+                    return None
+            elif not isinstance(node, dict) or step not in node:
+                return None
+            node = node[step]
+        return node
+
+
+class ArticleExtractor:
+    """Build articles from a payload in a single pass.
+
+    When every field path shares a record root ending in a wildcard (for
+    example `$.results[*]`), the records are walked once and each field is
+    read relative to its record, so a missing field never shifts the other
+    fields onto the wrong article. Otherwise each path is evaluated on its
+    own and the results are joined by position. Records without a title or
+    a link are dropped.
+    """
+
+    def __init__(self, fields: dict[str, str]) -> None:
+        self._fields = {name: path for name, path in fields.items() if path}
+        compiled = {name: CompiledPath.compile(path) for name, path in self._fields.items()}
+        self._root: CompiledPath | None = None
+        self._relative: dict[str, CompiledPath] = {}
+        self._absolute: dict[str, CompiledPath | None] = compiled
+
+        if compiled and all(compiled.values()):
+            root = self._common_root([path.steps for path in compiled.values()])
+            if root is not None:
+                self._root = CompiledPath(root)
+                self._relative = {
+                    name: CompiledPath(path.steps[len(root):]) for name, path in compiled.items()
+                }
+
+    @staticmethod
+    def _common_root(all_steps: list[tuple]) -> tuple | None:
+        prefix_length = 0
+        for steps in zip(*all_steps):
+            if any(step is not steps[0] and step != steps[0] for step in steps):
+                break
+            prefix_length += 1
+
+        prefix = all_steps[0][:prefix_length]
+        # Each field has to keep at least one step below the record root.
+        if any(len(steps) == prefix_length for steps in all_steps):
+            prefix = prefix[:-1]
+        while prefix and prefix[-1] is not WILDCARD:
+            prefix = prefix[:-1]
+        return prefix or None
+
+    def extract(self, data: Any) -> list[dict]:
+        if self._root is not None:
+            articles = []
+            for record in self._root.find(data):
+                article = {}
+                for name, path in self._relative.items():
+                    value = path.first(record)
+                    if value is not None:
+                        article[name] = value
+                if self._keep(article):
+                    articles.append(article)
+            return articles
+
+        columns = {name: self._values(data, name) for name in self._fields}
+        length = max((len(values) for values in columns.values()), default=0)
+        articles = (
+            {name: values[i] for name, values in columns.items() if i < len(values)}
+            for i in range(length)
+        )
+        return [article for article in articles if self._keep(article)]
+
+    def _keep(self, article: dict) -> bool:
+        if not article:
+            return False
+        if not any(name in self._fields for name in IDENTITY_FIELDS):
+            return True
+        return any(article.get(name) for name in IDENTITY_FIELDS)
+
+    def _values(self, data: Any, name: str) -> list:
+        if compiled := self._absolute.get(name):
+            return compiled.find(data)
+
+        matches = jsonpath(data, self._fields[name])
+        if matches is False:
+            return []
+        return matches
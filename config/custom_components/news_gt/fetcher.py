@@ -0,0 +1,89 @@
+"""Conditional, cached fetching of news feeds."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+
+from dataclasses import dataclass
+from typing import Any
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=30)
+RETRIES = 3
+BACKOFF_SECONDS = 2
+
+
+@dataclass
+class FetchResult:
+    data: Any
+    modified: bool
+
+
+class FeedFetcher:
+    """Fetch a JSON feed with ETag/Last-Modified revalidation.
+
+    The last response body and its validators are kept in `.storage`, so an
+    unchanged feed costs a 304 and no parsing, even right after a restart.
+    """
+
+    def __init__(self, hass: HomeAssistant, url: str) -> None:
+        self._url = url
+        self._session = async_get_clientsession(hass)
+        key = hashlib.sha1(url.encode()).hexdigest()[:12]
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.feed_{key}")
+        self._cache: dict | None = None
+
+    async def async_load_cached(self) -> Any:
+        """Return the cached body of the last successful fetch, if any."""
+        if self._cache is None:
+            self._cache = await self._store.async_load() or {}
+        return self._cache.get("data")
+
+    async def async_fetch(self) -> FetchResult:
+        """Fetch the feed, retrying with exponential backoff."""
+        cached = await self.async_load_cached()
+        headers = {}
+        if cached is not None:
+            if etag := self._cache.get("etag"):
+                headers["If-None-Match"] = etag
+            if last_modified := self._cache.get("last_modified"):
+                headers["If-Modified-Since"] = last_modified
+
+        for attempt in range(RETRIES):
+            try:
+                async with self._session.get(self._url, headers=headers, timeout=REQUEST_TIMEOUT) as response:
+                    if response.status == 304:
+                        return FetchResult(cached, modified=False)
+                    if response.status >= 500:
+                        raise aiohttp.ClientResponseError(
+                            response.request_info, response.history, status=response.status
+                        )
+                    response.raise_for_status()
+                    data = await response.json(content_type=None)
+                    self._cache = {
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                        "data": data,
+                    }
+                    self._store.async_delay_save(lambda: self._cache, 5)
+                    return FetchResult(data, modified=True)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                if isinstance(err, aiohttp.ClientResponseError) and err.status < 500:
+                    raise
+                if attempt == RETRIES - 1:
+                    raise
+                delay = BACKOFF_SECONDS * 2 ** attempt
+                _LOGGER.debug("Fetching %s failed (%s), retrying in %ss", self._url, err, delay)
+                await asyncio.sleep(delay)
@@ -1,13 +1,19 @@
-import requests
 import datetime
+import logging
 
-from jsonpath import jsonpath
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.helpers.event import async_track_time_interval
 
+from .aggregator import NewsAggregator, get_feeds
+from .articles import ArticleCache
+from .const import DOMAIN, HEADLINES_COUNT, REFRESH_INTERVAL_DEFAULT
+from .thumbnails import ThumbnailCache
+
+_LOGGER = logging.getLogger(__name__)
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -20,19 +26,17 @@ async def async_setup_entry(
 
 class NewsSensor(SensorEntity):
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry):
-        self._url = self.get_entry(entry, "url")
-        self._title = self.get_entry(entry, "title")
-        self._link = self.get_entry(entry, "link")
-        self._summary = self.get_entry(entry, "summary")
-        self._image = self.get_entry(entry, "image")
-        self._published = self.get_entry(entry, "published")
+        self._aggregator = NewsAggregator(hass, get_feeds(entry))
+        refresh_interval = self.get_entry(entry, "refresh_interval") or REFRESH_INTERVAL_DEFAULT
+        self._cache: ArticleCache = hass.data[DOMAIN][entry.entry_id]
+        self._thumbnails: ThumbnailCache = hass.data[f"{DOMAIN}_thumbnails"]
         self._state = None
         self._attributes = {}
         self._attr_unique_id = "news_gt_sensor"
         self._attr_name = "Latest News"
         self._attr_should_poll = False
         self._hass = hass
-        self._unsub_update = async_track_time_interval(self._hass, self.async_update, datetime.timedelta(hours=24))
+        self._unsub_update = async_track_time_interval(self._hass, self.async_update, datetime.timedelta(minutes=refresh_interval))
         hass.async_create_task(self.async_update())
 
     @property
@@ -49,45 +53,35 @@ class NewsSensor(SensorEntity):
             self._unsub_update()
 
     async def async_update(self, now=None):
-        response = await self._hass.async_add_executor_job(requests.get, self._url)
-        if response.status_code == 200:
-            data = response.json()
-            self._state = datetime.datetime.now().isoformat()
-            articles = []
-
-            titles = self.get_values(data, self._title)
-            links = self.get_values(data, self._link)
-            summaries = self.get_values(data, self._summary)
-            thumbnails = self.get_values(data, self._image)
-            published = self.get_values(data, self._published)
-            for i in range(max(len(titles), len(summaries), len(thumbnails), len(links), len(published))):
-                article = {}
-                if i < len(titles):
-                    article['title'] = titles[i]
-                if i < len(summaries):
-                    article['summary'] = summaries[i]
-                if i < len(thumbnails):
-                    article['thumbnail'] = thumbnails[i]
-                if i < len(links):
-                    article['link'] = links[i]
-                if i < len(published):
-                    article['published'] = published[i]
-                articles.append(article)
-
-            self._attributes = {'articles': articles}
-        else:
+        try:
+            modified = await self._aggregator.async_refresh()
+        except Exception as e:
+            _LOGGER.warning(f"Error fetching news: {e}")
             self._state = "Error fetching news"
-            self._attributes = {'articles': []}
+            self.async_write_ha_state()
+            return
+
+        self._state = datetime.datetime.now().isoformat()
+        if modified or self._cache.version is None:
+            self._cache.update([self._proxy_thumbnail(article) for article in self._aggregator.articles])
+            # Only a version and the top headlines go into the state; clients
+            # fetch the full list through news_gt.get_articles when the
+            # version changes, so the recorder does not store it every time.
+            self._attributes = {
+                'version': self._cache.version,
+                'count': len(self._cache.articles),
+                'headlines': self._cache.headlines(HEADLINES_COUNT),
+            }
 
         self.async_write_ha_state()
 
+    def _proxy_thumbnail(self, article: dict) -> dict:
+        """Point the article thumbnail at the local, downscaled copy."""
+        thumbnail = article.get("thumbnail")
+        if not isinstance(thumbnail, str) or not thumbnail.startswith(("http://", "https://")):
+            return article
+        return {**article, "thumbnail": self._thumbnails.register(thumbnail)}
+
     def get_entry(self, entry: ConfigEntry, key: str) -> str:
         return entry.options.get(key, entry.data.get(key, '')) 
-
-    def get_values(self, data: dict, path: str) -> list:
-        matches = jsonpath(data, path)
-        if matches is False:
-            return []
-        
-        return matches
     
\ No newline at end of file
@@ -0,0 +1,163 @@
+"""Thumbnail proxy with an LRU disk cache for article images."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import logging
+import os
+
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+# Shipped with Home Assistant core, so not listed in the manifest.
+from PIL import Image
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+THUMBNAIL_URL = f"/api/{DOMAIN}/thumbnail/{{key}}"
+THUMBNAIL_SIZE = (480, 240)
+THUMBNAIL_QUALITY = 75
+CACHE_MAX_BYTES = 50 * 1024 * 1024
+MAX_SOURCE_BYTES = 10 * 1024 * 1024
+FETCH_TIMEOUT = aiohttp.ClientTimeout(total=20)
+
+
+def thumbnail_key(url: str) -> str:
+    return hashlib.sha1(url.encode()).hexdigest()[:20]
+
+
+class ThumbnailCache:
+    """Downscaled copies of remote images kept on disk, evicted least recently used.
+
+    Only URLs registered from feed articles are fetched, so the view cannot be
+    used as an open proxy. Files are named by the hash of their source URL,
+    which also makes them safe to cache forever on the client.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._session = async_get_clientsession(hass)
+        self._directory = Path(hass.config.path(".cache", DOMAIN, "thumbnails"))
+        self._sources: dict[str, str] = {}
+        self._pending: dict[str, asyncio.Future] = {}
+
+    def register(self, url: str) -> str:
+        """Allow `url` to be proxied and return the local thumbnail URL."""
+        key = thumbnail_key(url)
+        self._sources[key] = url
+        return THUMBNAIL_URL.format(key=key)
+
+    async def async_get(self, key: str) -> bytes | None:
+        path = self._directory / f"{key}.jpg"
+        cached = await self._hass.async_add_executor_job(self._read, path)
+        if cached is not None:
+            return cached
+
+        if key not in self._sources:
+            return None
+
+        # Concurrent requests for the same image share one download.
+        if key in self._pending:
+            return await asyncio.shield(self._pending[key])
+
+        future = self._hass.loop.create_future()
+        self._pending[key] = future
+        try:
+            thumbnail = await self._fetch(self._sources[key])
+            if thumbnail is not None:
+                await self._hass.async_add_executor_job(self._write, path, thumbnail)
+            future.set_result(thumbnail)
+            return thumbnail
+        except Exception as e:
+            _LOGGER.debug(f"Thumbnail for {self._sources[key]} failed: {e}")
+            return None
+        finally:
+            # Also reached on cancellation, which would otherwise leave the
+            # requests waiting on this download hanging.
+            if not future.done():
+                future.set_result(None)
+            self._pending.pop(key, None)
+
+    async def _fetch(self, url: str) -> bytes | None:
+        async with self._session.get(url, timeout=FETCH_TIMEOUT) as response:
+            if response.status != 200:
+                return None
+            if response.content_length and response.content_length > MAX_SOURCE_BYTES:
+                return None
+            source = await response.content.read(MAX_SOURCE_BYTES + 1)
+            if len(source) > MAX_SOURCE_BYTES:
+                return None
+        return await self._hass.async_add_executor_job(self._downscale, source)
+
+    @staticmethod
+    def _downscale(source: bytes) -> bytes:
+        with Image.open(io.BytesIO(source)) as image:
+            image.draft("RGB", THUMBNAIL_SIZE)
+            image = image.convert("RGB")
+            image.thumbnail(THUMBNAIL_SIZE)
+            output = io.BytesIO()
+            image.save(output, format="JPEG", quality=THUMBNAIL_QUALITY, optimize=True, progressive=True)
+            return output.getvalue()
+
+    @staticmethod
+    def _read(path: Path) -> bytes | None:
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        os.utime(path)
+        return data
+
+    def _write(self, path: Path, data: bytes) -> None:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        self._evict()
+
+    def _evict(self) -> None:
+        files = []
+        for entry in self._directory.glob("*.jpg"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                # Removed by a concurrent eviction.
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry))
+        total = sum(size for _, size, _ in files)
+        for _, size, entry in sorted(files, key=lambda item: item[0]):
+            if total <= CACHE_MAX_BYTES:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+
+
+class ThumbnailView(HomeAssistantView):
+    """Serve article thumbnails from the cache."""
+
+    url = THUMBNAIL_URL
+    name = f"api:{DOMAIN}:thumbnail"
+    # Loaded by <img> tags, which cannot send the auth header; keys are
+    # unguessable hashes of URLs that came from the configured feeds.
+    requires_auth = False
+
+    def __init__(self, cache: ThumbnailCache) -> None:
+        self._cache = cache
+
+    async def get(self, request: web.Request, key: str) -> web.Response:
+        thumbnail = await self._cache.async_get(key)
+        if thumbnail is None:
+            return web.Response(status=404)
+
+        return web.Response(
+            body=thumbnail,
+            content_type="image/jpeg",
+            headers={"Cache-Control": "public, max-age=31536000, immutable"},
+        )
@@ -6,8 +6,33 @@ class NewsCard extends HTMLElement {
     set hass(hass) {
       const entityId = this.config.entity;
       const state = hass.states[entityId];
-      const articles = state.attributes.articles || [];
-  
+      if (!state) {
+        return;
+      }
+
+      // The sensor only carries a version and the top headlines; the full
+      // list is fetched once per version instead of on every state push.
+      const version = state.attributes.version;
+      if (version === this._version) {
+        return;
+      }
+      this._version = version;
+      this.render(state.attributes.headlines || state.attributes.articles || []);
+
+      hass.callWS({
+        type: 'call_service',
+        domain: 'news_gt',
+        service: 'get_articles',
+        service_data: {},
+        return_response: true,
+      }).then(result => {
+        if (this._version === version) {
+          this.render(result.response.articles || []);
+        }
+      }).catch(error => console.error('news-card: fetching articles failed', error));
+    }
+
+    render(articles) {
       this.innerHTML = `
         <ha-card>
           <style>
@@ -62,11 +87,11 @@ class NewsCard extends HTMLElement {
           <div class="card-content">
             ${articles.map(article => `
               <div class="article">
-                ${article.thumbnail ? `<div class="thumbnail"><img src="${article.thumbnail}" alt="${article.title}"></div>` : ''}
+                ${article.thumbnail ? `<div class="thumbnail"><img src="${article.thumbnail}" alt="${article.title}" loading="lazy" decoding="async"></div>` : ''}
                 <div class="text-content">
                     <h3><a href="${article.link}" target="_blank">${article.title}</a></h3>
-                    <div class="published">${article.published}</div>
-                    <p>${article.summary}</p>
+                    <div class="published">${article.published || ''}</div>
+                    <p>${article.summary || ''}</p>
                 </div>
               </div>
             `).join('')}
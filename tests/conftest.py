@@ -0,0 +1,17 @@
+import sys
+from pathlib import Path
+
+import pytest_asyncio
+
+# The integrations import each other as `custom_components.<domain>`, rooted at the HA config dir.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "config"))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+
+@pytest_asyncio.fixture
+async def hass(tmp_path):
+    """A bare Home Assistant core with its config dir in `tmp_path`."""
+    hass = HomeAssistant(str(tmp_path))
+    yield hass
+    await hass.async_stop(force=True)
@@ -0,0 +1,281 @@
+import asyncio
+import gc
+
+import pytest
+import pytest_asyncio
+
+from custom_components.automation_core import service as service_module
+from custom_components.automation_core.service import AutomationService, ServiceStatus
+from custom_components.automation_core.snapshots import SessionSnapshots
+
+
+class FakeEmitter:
+    def __init__(self) -> None:
+        self._handlers = {}
+
+    def on(self, event, handler):
+        self._handlers.setdefault(event, []).append(handler)
+
+    def emit(self, event, arg):
+        for handler in list(self._handlers.get(event, [])):
+            handler(arg)
+
+
+class FakeSession:
+    def __init__(self, page) -> None:
+        self.page = page
+
+    async def send(self, method, params=None):
+        if method == "Performance.getMetrics":
+            return {"metrics": [{"name": "JSHeapUsedSize", "value": self.page.heap}]}
+        return {}
+
+    async def detach(self):
+        pass
+
+
+class FakePage(FakeEmitter):
+    """The part of a Playwright page the service uses."""
+
+    def __init__(self, context) -> None:
+        super().__init__()
+        self.context = context
+        self.url = "about:blank"
+        self.heap = 0
+        self._closed = False
+
+    def is_closed(self):
+        return self._closed
+
+    async def close(self):
+        if not self._closed:
+            self._closed = True
+            self.context.pages.remove(self)
+            self.emit("close", self)
+
+    async def route(self, pattern, handler):
+        pass
+
+
+class FakeContext(FakeEmitter):
+    def __init__(self, user_data_dir) -> None:
+        super().__init__()
+        self.user_data_dir = user_data_dir
+        self.pages = []
+
+    async def new_page(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+    async def new_cdp_session(self, page):
+        return FakeSession(page)
+
+    async def add_cookies(self, cookies):
+        pass
+
+    async def close(self):
+        for page in list(self.pages):
+            await page.close()
+        self.emit("close", self)
+
+
+class FakeChromium:
+    def __init__(self) -> None:
+        self.contexts = []
+        self.failures = 0
+
+    async def launch_persistent_context(self, user_data_dir, **options):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("Chromium did not start")
+        context = FakeContext(user_data_dir)
+        self.contexts.append(context)
+        return context
+
+
+class FakePlaywright:
+    """Stands in for the Playwright driver, which needs a downloaded Chromium."""
+
+    def __init__(self, chromium) -> None:
+        self.chromium = chromium
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+@pytest.fixture
+def chromium(monkeypatch):
+    chromium = FakeChromium()
+    monkeypatch.setattr(service_module, "async_playwright", lambda: FakePlaywright(chromium))
+    return chromium
+
+
+@pytest_asyncio.fixture
+async def make_service(tmp_path, chromium):
+    services = []
+
+    def make(**options):
+        service = AutomationService(
+            user_data_dir=tmp_path / "User_Data",
+            snapshots=SessionSnapshots(directory=tmp_path / "snapshots"),
+            **options,
+        )
+        services.append(service)
+        return service
+
+    yield make
+    for service in services:
+        await service.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_get_context_waits_for_the_launch(make_service, chromium):
+    service = make_service()
+    context = await service.get_context()
+    assert context is chromium.contexts[0]
+    assert service.status is ServiceStatus.READY
+
+
+@pytest.mark.asyncio
+async def test_failed_launch_is_retried_and_not_reported_unretrieved(make_service, chromium):
+    loop = asyncio.get_running_loop()
+    unhandled = []
+    loop.set_exception_handler(lambda loop, context: unhandled.append(context))
+    try:
+        chromium.failures = 1
+        service = make_service()
+        await service._task
+        assert service.status is ServiceStatus.FAILED
+
+        # Nobody waited on the failed launch; the next caller launches again.
+        context = await service.get_context()
+        assert context is chromium.contexts[0]
+        gc.collect()
+        await asyncio.sleep(0)
+        assert unhandled == []
+    finally:
+        loop.set_exception_handler(None)
+
+
+@pytest.mark.asyncio
+async def test_failed_launch_reaches_its_waiters(make_service, chromium):
+    chromium.failures = 1
+    service = make_service()
+    with pytest.raises(RuntimeError):
+        await service.get_context()
+
+
+async def recycled(service, page_id, timeout=1):
+    """The page `page_id` is replaced with next."""
+    replaced = asyncio.get_running_loop().create_future()
+    service.add_page_listener(page_id, lambda page: replaced.done() or replaced.set_result(page))
+    return await asyncio.wait_for(replaced, timeout)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("problem", ["crash", "close", "heap"])
+async def test_watchdog_replaces_unhealthy_pages(make_service, problem):
+    service = make_service(health_interval=0.05, max_heap_mb=100)
+    page = await service.get_page("whatsapp")
+    waiting = asyncio.ensure_future(recycled(service, "whatsapp"))
+    await asyncio.sleep(0)
+
+    if problem == "crash":
+        page.emit("crash", page)
+    elif problem == "close":
+        await page.close()
+    else:
+        page.heap = 200 * 1024 * 1024
+
+    new_page = await waiting
+    assert new_page is not page
+    assert page.is_closed()
+    assert service.pages["whatsapp"] is new_page
+
+
+@pytest.mark.asyncio
+async def test_watchdog_keeps_healthy_pages(make_service):
+    service = make_service(health_interval=0.01)
+    page = await service.get_page("whatsapp")
+    await asyncio.sleep(0.1)
+    assert service.pages["whatsapp"] is page
+
+
+@pytest.mark.asyncio
+async def test_watchdog_relaunches_a_closed_browser(make_service, chromium):
+    service = make_service(health_interval=60)
+    page = await service.get_page("news")
+    waiting = asyncio.ensure_future(recycled(service, "news"))
+    await asyncio.sleep(0)
+
+    await chromium.contexts[0].close()
+    new_page = await waiting
+    assert new_page.context is chromium.contexts[1]
+    assert await service.get_context() is chromium.contexts[1]
+    assert service.status is ServiceStatus.READY
+
+
+@pytest.mark.asyncio
+async def test_pool_lends_up_to_pool_size_pages(make_service):
+    service = make_service(pool_size=2)
+    async with service.lease("news") as first, service.lease("news") as second:
+        assert first is not second
+        third = asyncio.ensure_future(service._acquire("news"))
+        await asyncio.sleep(0.05)
+        assert not third.done()
+    # A returned page goes to the waiter instead of a new one.
+    assert await asyncio.wait_for(third, 1) in (first, second)
+    await service._release("news", third.result())
+    assert service._pools["news"].total == 2
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_idle_pages(make_service):
+    service = make_service(pool_size=2)
+    async with service.lease("news") as page:
+        pass
+    async with service.lease("news") as again:
+        assert again is page
+
+
+@pytest.mark.asyncio
+async def test_pool_drops_crashed_and_closed_pages(make_service):
+    service = make_service(pool_size=1)
+    async with service.lease("news") as crashed:
+        crashed.emit("crash", crashed)
+    assert crashed.is_closed()
+
+    async with service.lease("news") as closed:
+        assert closed is not crashed
+        await closed.close()
+    async with service.lease("news") as page:
+        assert page is not closed
+    assert service._pools["news"].total == 1
+
+
+@pytest.mark.asyncio
+async def test_pool_spreads_pages_across_shards(make_service, chromium):
+    service = make_service(pool_size=2, shards=2)
+    async with service.lease("news") as first, service.lease("news") as second:
+        assert {first.context, second.context} == set(chromium.contexts[:2])
+
+
+@pytest.mark.asyncio
+async def test_failed_page_creation_frees_its_slot(make_service, chromium, monkeypatch):
+    service = make_service(pool_size=1)
+    context = await service.get_context()
+
+    async def broken():
+        raise RuntimeError("Target closed")
+
+    monkeypatch.setattr(context, "new_page", broken)
+    with pytest.raises(RuntimeError):
+        async with service.lease("news"):
+            pass
+    monkeypatch.undo()
+    async with service.lease("news") as page:
+        assert not page.is_closed()
@@ -0,0 +1,49 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from pyee.asyncio import AsyncIOEventEmitter
+
+from custom_components.automation_core.automations.declaraguate.lib import DeclaraGuate
+from custom_components.automation_core.automations.whatsapp.lib import WhatsAppEventName, WhatsAppLoginStatus
+
+
+class LoggedOutWhatsApp:
+    def __init__(self) -> None:
+        self.state = WhatsAppLoginStatus.NOT_LOGGED_IN
+        self.event_emitter = AsyncIOEventEmitter()
+
+
+@pytest.mark.asyncio
+async def test_login_wait_is_bounded_and_holds_nothing(monkeypatch):
+    monkeypatch.setattr(DeclaraGuate, "_lock", asyncio.Lock())
+    monkeypatch.setattr(DeclaraGuate, "LOGIN_TIMEOUT", 0.05)
+    whatsapp = LoggedOutWhatsApp()
+    leases = []
+
+    @asynccontextmanager
+    async def lease_page(domain):
+        leases.append(domain)
+        yield None
+
+    waiting = asyncio.ensure_future(DeclaraGuate.declare(lease_page, whatsapp))
+    await asyncio.sleep(0.01)
+    assert not DeclaraGuate._lock.locked()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await waiting
+    assert leases == []
+    assert whatsapp.event_emitter.listeners(WhatsAppEventName.LOGIN_STATUS) == []
+
+
+@pytest.mark.asyncio
+async def test_login_event_releases_the_wait():
+    whatsapp = LoggedOutWhatsApp()
+    waiting = asyncio.ensure_future(DeclaraGuate._logged_in(whatsapp))
+    await asyncio.sleep(0)
+    whatsapp.event_emitter.emit(WhatsAppEventName.LOGIN_STATUS, WhatsAppLoginStatus.LOGIN_IN_PROGRESS)
+    await asyncio.sleep(0)
+    assert not waiting.done()
+
+    whatsapp.event_emitter.emit(WhatsAppEventName.LOGIN_STATUS, WhatsAppLoginStatus.LOGGED_IN)
+    await asyncio.wait_for(waiting, 1)
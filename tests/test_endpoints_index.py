@@ -0,0 +1,92 @@
+import os
+
+import pytest
+
+from custom_components.api_endpoints_exposer.index import EVENT_LOVELACE_UPDATED, EndpointIndex, find_endpoints
+
+YAML = """
+views:
+  - title: Home
+    cards:
+      - entity: light.kitchen
+        description: Kitchen light
+"""
+
+
+class StorageDashboard:
+    mode = "storage"
+
+    def __init__(self, config):
+        self.config = config
+        self.loads = 0
+
+    async def async_load(self, force):
+        self.loads += 1
+        return self.config
+
+
+def test_find_endpoints_walks_nested_cards():
+    config = {"views": [
+        {"path": "home", "sections": [{"cards": [{"entity": "light.a", "description": "A"}]}]},
+        {"cards": [{"type": "conditional", "card": {"entity": "switch.b", "description": "B"}}]},
+        "not a view",
+    ]}
+    assert find_endpoints(config, "dash") == [
+        {"description": "A", "entity": "light.a", "view": "home", "dashboard": "dash"},
+        {"description": "B", "entity": "switch.b", "view": "1", "dashboard": "dash"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_endpoints_are_parsed_once(hass, tmp_path, monkeypatch):
+    (tmp_path / "ui-lovelace.yaml").write_text(YAML)
+    index = EndpointIndex(hass)
+    parses = []
+    parse = index._parse_yaml
+    monkeypatch.setattr(index, "_parse_yaml", lambda: parses.append(1) or parse())
+
+    first = await index.async_endpoints()
+    assert [endpoint["entity"] for endpoint in first] == ["light.kitchen"]
+    assert await index.async_endpoints() is first
+    await index._async_check_yaml()
+    assert len(parses) == 1
+
+
+@pytest.mark.asyncio
+async def test_yaml_change_is_picked_up_by_mtime(hass, tmp_path):
+    path = tmp_path / "ui-lovelace.yaml"
+    path.write_text(YAML)
+    index = EndpointIndex(hass)
+    changes = []
+    index.async_add_listener(lambda: changes.append(1))
+    await index.async_endpoints()
+
+    path.write_text(YAML.replace("light.kitchen", "light.hall"))
+    os.utime(path, (1, 1))
+    await index._async_check_yaml()
+
+    assert [endpoint["entity"] for endpoint in await index.async_endpoints()] == ["light.hall"]
+    assert changes == [1]
+
+
+@pytest.mark.asyncio
+async def test_broken_yaml_yields_no_endpoints(hass, tmp_path):
+    (tmp_path / "ui-lovelace.yaml").write_text("views: [")
+    assert await EndpointIndex(hass).async_endpoints() == []
+
+
+@pytest.mark.asyncio
+async def test_storage_dashboard_reloads_on_lovelace_updated(hass):
+    dashboard = StorageDashboard({"views": [{"cards": [{"entity": "light.a", "description": "A"}]}]})
+    hass.data["lovelace"] = {"dashboards": {"dash": dashboard}}
+    index = EndpointIndex(hass)
+    unsub = index.async_start()
+
+    assert [endpoint["dashboard"] for endpoint in await index.async_endpoints()] == ["dash"]
+    dashboard.config = {"views": []}
+    hass.bus.async_fire(EVENT_LOVELACE_UPDATED, {"url_path": "dash"})
+    await hass.async_block_till_done()
+
+    assert await index.async_endpoints() == []
+    assert dashboard.loads == 2
+    unsub()
@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+
+from custom_components.api_endpoints_exposer.index import EndpointIndex
+from custom_components.api_endpoints_exposer.websocket_api import ws_subscribe
+
+DASHBOARD = """
+views:
+  - path: home
+    cards:
+      - type: entities
+        entity: light.kitchen
+        description: Kitchen light
+      - type: vertical-stack
+        cards:
+          - entity: sensor.temperature
+            description: Temperature
+"""
+
+
+class RecordingConnection:
+    """Collects what a websocket command sends back."""
+
+    def __init__(self) -> None:
+        self.subscriptions = {}
+        self.messages = []
+
+    def send_result(self, msg_id, result=None):
+        self.messages.append(("result", msg_id))
+
+    def send_error(self, msg_id, code, message):
+        self.messages.append(("error", msg_id, code))
+
+    def send_message(self, message):
+        self.messages.append(("event", message["id"], message["event"]))
+
+
+@pytest.fixture
+def index(hass, tmp_path):
+    (tmp_path / "ui-lovelace.yaml").write_text(DASHBOARD)
+    return EndpointIndex(hass)
+
+
+async def subscribe(hass, index, **options):
+    hass.data["api_endpoints_exposer"] = {"index": index}
+    connection = RecordingConnection()
+    msg = {"id": 5, "type": "api_endpoints_exposer/subscribe", "debounce": 0.05, **options}
+    await ws_subscribe.__wrapped__(hass, connection, msg)
+    return connection
+
+
+@pytest.mark.asyncio
+async def test_subscribe_sends_result_then_snapshot(hass, index):
+    hass.states.async_set("light.kitchen", "on", {"brightness": 10})
+    connection = await subscribe(hass, index, domains=["light"])
+
+    assert connection.messages[0] == ("result", 5)
+    kind, msg_id, event = connection.messages[1]
+    assert (kind, msg_id) == ("event", 5)
+    assert [(endpoint["entity"], endpoint["state"]) for endpoint in event["endpoints"]] == [("light.kitchen", "on")]
+    assert 5 in connection.subscriptions
+
+
+@pytest.mark.asyncio
+async def test_changes_are_debounced_into_one_message(hass, index):
+    connection = await subscribe(hass, index)
+    connection.messages.clear()
+
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("sensor.temperature", "21")
+    await hass.async_block_till_done()
+    assert connection.messages == []
+
+    await asyncio.sleep(0.1)
+    [(kind, _, event)] = connection.messages
+    assert kind == "event"
+    assert {entity: change["state"] for entity, change in event["changes"].items()} == {
+        "light.kitchen": "off",
+        "sensor.temperature": "21",
+    }
+
+
+@pytest.mark.asyncio
+async def test_unrequested_attribute_changes_are_skipped(hass, index):
+    hass.states.async_set("light.kitchen", "on", {"brightness": 10, "friendly_name": "Kitchen"})
+    connection = await subscribe(hass, index, attributes=["friendly_name"])
+    connection.messages.clear()
+
+    hass.states.async_set("light.kitchen", "on", {"brightness": 200, "friendly_name": "Kitchen"})
+    await hass.async_block_till_done()
+    await asyncio.sleep(0.1)
+    assert connection.messages == []
+
+
+@pytest.mark.asyncio
+async def test_unsubscribe_stops_updates(hass, index):
+    connection = await subscribe(hass, index)
+    connection.messages.clear()
+
+    connection.subscriptions.pop(5)()
+    hass.states.async_set("light.kitchen", "on")
+    await hass.async_block_till_done()
+    await asyncio.sleep(0.1)
+    assert connection.messages == []
+
+
+@pytest.mark.asyncio
+async def test_failed_load_only_sends_an_error(hass, index, monkeypatch):
+    async def broken():
+        raise OSError("unreadable dashboard")
+
+    monkeypatch.setattr(index, "async_endpoints", broken)
+    connection = await subscribe(hass, index)
+
+    assert connection.messages == [("error", 5, "unknown_error")]
+    assert connection.subscriptions == {}
+
+
+@pytest.mark.asyncio
+async def test_not_loaded(hass):
+    connection = RecordingConnection()
+    await ws_subscribe.__wrapped__(hass, connection, {"id": 1, "debounce": 0})
+    assert connection.messages == [("error", 1, "not_loaded")]
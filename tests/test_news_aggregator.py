@@ -0,0 +1,60 @@
+from datetime import datetime, timezone
+
+from custom_components.news_gt.aggregator import (
+    OLDEST,
+    NewsAggregator,
+    normalize_link,
+    normalize_title,
+    parse_published,
+)
+
+
+def test_normalize_link():
+    assert normalize_link("HTTPS://www.News.example/a/#top") == "news.example/a"
+    assert normalize_link("http://news.example/a") == normalize_link("https://news.example/a/")
+    assert normalize_link(None) == ""
+
+
+def test_normalize_title():
+    assert normalize_title("  Alcalde anunció: ¡Nueva línea!  ") == "alcalde anuncio nueva linea"
+    assert normalize_title(None) == ""
+
+
+def test_parse_published():
+    assert parse_published("2025-03-01T10:00:00") == datetime(2025, 3, 1, 10, tzinfo=timezone.utc)
+    assert parse_published("Sat, 01 Mar 2025 10:00:00 GMT") == datetime(2025, 3, 1, 10, tzinfo=timezone.utc)
+    assert parse_published("yesterday") is OLDEST
+    assert parse_published(None) is OLDEST
+
+
+def test_merge_dedups_links_across_feeds():
+    merged = NewsAggregator._merge([
+        [{"title": "Lluvias en la capital", "link": "https://a.example/lluvias"}],
+        [{"title": "Otro titular", "link": "http://www.a.example/lluvias/"}],
+    ])
+    assert merged == [{"title": "Lluvias en la capital", "link": "https://a.example/lluvias"}]
+
+
+def test_merge_dedups_near_identical_titles():
+    merged = NewsAggregator._merge([
+        [{"title": "Congreso aprueba el presupuesto 2025", "link": "https://a.example/1"}],
+        [
+            {"title": "Congreso aprueba el presupuesto 2025.", "link": "https://b.example/9"},
+            {"title": "Congreso aprueba presupuesto 2025", "link": "https://b.example/10"},
+            {"title": "Selección gana el amistoso", "link": "https://b.example/11"},
+        ],
+    ])
+    assert [article["link"] for article in merged] == ["https://a.example/1", "https://b.example/11"]
+
+
+def test_merge_keeps_articles_without_link_or_title_apart():
+    merged = NewsAggregator._merge([[{"title": "Solo título"}, {"link": "https://a.example/solo"}]])
+    assert len(merged) == 2
+
+
+def test_merge_sorts_newest_first():
+    merged = NewsAggregator._merge([
+        [{"title": "Old", "published": "2025-03-01T08:00:00Z"}, {"title": "Undated"}],
+        [{"title": "New", "published": "2025-03-02T08:00:00Z"}],
+    ])
+    assert [article["title"] for article in merged] == ["New", "Old", "Undated"]
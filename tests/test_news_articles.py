@@ -0,0 +1,47 @@
+from custom_components.news_gt.articles import ArticleCache, article_key
+
+
+def article(n: int, **fields) -> dict:
+    return {"title": f"Story {n}", "link": f"https://news.example/{n}", **fields}
+
+
+def test_key_prefers_link_then_title():
+    assert article_key({"title": "A", "link": "x"}) == article_key({"title": "B", "link": "x"})
+    assert article_key({"title": "A"}) == article_key({"title": "A", "summary": "other"})
+    assert article_key({"summary": "a"}) != article_key({"summary": "b"})
+
+
+def test_update_dedups_and_keeps_newest_first():
+    cache = ArticleCache(max_articles=10)
+    assert cache.update([article(1), article(2)])
+    assert cache.update([article(3), article(1, summary="fresh")])
+    assert [a["title"] for a in cache.articles] == ["Story 3", "Story 1", "Story 2"]
+    # The fresh batch wins over the cached copy.
+    assert cache.articles[1]["summary"] == "fresh"
+
+
+def test_update_bounds_the_cache():
+    cache = ArticleCache(max_articles=3)
+    cache.update([article(n) for n in range(5)])
+    assert [a["title"] for a in cache.articles] == ["Story 0", "Story 1", "Story 2"]
+    cache.update([article(9)])
+    assert [a["title"] for a in cache.articles] == ["Story 9", "Story 0", "Story 1"]
+
+
+def test_version_only_changes_with_content():
+    cache = ArticleCache(max_articles=5)
+    assert cache.version is None
+    cache.update([article(1)])
+    version = cache.version
+    assert not cache.update([article(1)])
+    assert cache.version == version
+    assert cache.update([article(1, summary="edited")])
+    assert cache.version != version
+
+
+def test_headlines():
+    cache = ArticleCache(max_articles=5)
+    cache.update([article(1, summary="long", published="2025-03-01"), article(2)])
+    assert cache.headlines(1) == [
+        {"title": "Story 1", "link": "https://news.example/1", "published": "2025-03-01"}
+    ]
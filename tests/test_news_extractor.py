@@ -0,0 +1,63 @@
+import pytest
+
+from custom_components.news_gt.extractor import WILDCARD, ArticleExtractor, CompiledPath
+
+DATA = {
+    "results": [
+        {"title": "First", "url": "https://a.example/1", "media": [{"src": "one.jpg"}]},
+        {"url": "https://a.example/2"},
+        {"summary": "Neither a title nor a link"},
+        {},
+    ],
+    "meta": {"page size": 4},
+}
+
+
+def test_compile_steps():
+    path = CompiledPath.compile(" $.results[*].media[-1]['src'] ")
+    assert path.steps == ("results", WILDCARD, "media", -1, "src")
+
+
+@pytest.mark.parametrize("path", ["results[*]", "$..title", "$.results[?(@.url)]", "$.results[1:2]"])
+def test_compile_unsupported(path):
+    assert CompiledPath.compile(path) is None
+
+
+def test_find():
+    assert CompiledPath.compile("$.results[*].url").find(DATA) == ["https://a.example/1", "https://a.example/2"]
+    assert CompiledPath.compile("$.results.*.media[0].src").find(DATA) == ["one.jpg"]
+    assert CompiledPath.compile("$.meta['page size']").find(DATA) == [4]
+    assert CompiledPath.compile("$.results[10]").find(DATA) == []
+
+
+def test_first():
+    assert CompiledPath.compile("$.results[-4].title").first(DATA) == "First"
+    assert CompiledPath.compile("$.results[*].url").first(DATA) == "https://a.example/1"
+    assert CompiledPath.compile("$.results[1].title").first(DATA) is None
+    assert CompiledPath.compile("$.meta[0]").first(DATA) is None
+
+
+def test_extract_by_record():
+    extractor = ArticleExtractor({
+        "title": "$.results[*].title",
+        "link": "$.results[*].url",
+        "thumbnail": "$.results[*].media[0].src",
+        "summary": "",
+    })
+    # A missing title does not shift the next title onto the second article.
+    assert extractor.extract(DATA) == [
+        {"title": "First", "link": "https://a.example/1", "thumbnail": "one.jpg"},
+        {"link": "https://a.example/2"},
+    ]
+
+
+def test_extract_by_position():
+    extractor = ArticleExtractor({"title": "$..title", "link": "$..url"})
+    data = {"a": [{"title": "A", "url": "a"}, {"title": "B", "url": "b"}]}
+    assert extractor.extract(data) == [{"title": "A", "link": "a"}, {"title": "B", "link": "b"}]
+    assert extractor.extract({}) == []
+
+
+def test_extract_without_identity_fields():
+    extractor = ArticleExtractor({"summary": "$.results[*].summary"})
+    assert extractor.extract(DATA) == [{"summary": "Neither a title nor a link"}]
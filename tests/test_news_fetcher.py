@@ -0,0 +1,85 @@
+import aiohttp
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from custom_components.news_gt import fetcher
+from custom_components.news_gt.fetcher import FeedFetcher
+
+FEED = [{"title": "Noticia"}]
+
+
+@pytest_asyncio.fixture
+async def server():
+    """A feed served with an ETag; `statuses` overrides the next responses."""
+    requests, statuses = [], []
+
+    async def feed(request):
+        requests.append(request.headers)
+        if statuses:
+            return web.Response(status=statuses.pop(0))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.json_response(FEED, headers={"ETag": '"v1"', "Last-Modified": "Wed, 12 Mar 2025 09:30:00 GMT"})
+
+    app = web.Application()
+    app.router.add_get("/feed", feed)
+    server = TestServer(app)
+    await server.start_server()
+    server.requests, server.statuses = requests, statuses
+    yield server
+    await server.close()
+
+
+@pytest_asyncio.fixture
+async def session(monkeypatch):
+    session = aiohttp.ClientSession()
+    monkeypatch.setattr(fetcher, "async_get_clientsession", lambda hass: session)
+    monkeypatch.setattr(fetcher, "BACKOFF_SECONDS", 0)
+    yield session
+    await session.close()
+
+
+@pytest.mark.asyncio
+async def test_unchanged_feed_is_revalidated(hass, server, session):
+    feed = FeedFetcher(hass, str(server.make_url("/feed")))
+
+    first = await feed.async_fetch()
+    assert first.modified and first.data == FEED
+    assert "If-None-Match" not in server.requests[0]
+
+    second = await feed.async_fetch()
+    assert not second.modified and second.data == FEED
+    assert server.requests[1]["If-None-Match"] == '"v1"'
+    assert server.requests[1]["If-Modified-Since"] == "Wed, 12 Mar 2025 09:30:00 GMT"
+
+
+@pytest.mark.asyncio
+async def test_cache_survives_a_restart(hass, server, session):
+    url = str(server.make_url("/feed"))
+    # What the delayed save of an earlier run left in .storage.
+    await FeedFetcher(hass, url)._store.async_save({"etag": '"v1"', "last_modified": None, "data": FEED})
+
+    restarted = FeedFetcher(hass, url)
+    assert await restarted.async_load_cached() == FEED
+    result = await restarted.async_fetch()
+    assert not result.modified and result.data == FEED
+    assert server.requests[-1]["If-None-Match"] == '"v1"'
+    assert "If-Modified-Since" not in server.requests[-1]
+
+
+@pytest.mark.asyncio
+async def test_server_errors_are_retried(hass, server, session):
+    server.statuses.extend([503, 502])
+    result = await FeedFetcher(hass, str(server.make_url("/feed"))).async_fetch()
+    assert result.modified and result.data == FEED
+    assert len(server.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried(hass, server, session):
+    server.statuses.append(404)
+    with pytest.raises(aiohttp.ClientResponseError):
+        await FeedFetcher(hass, str(server.make_url("/feed"))).async_fetch()
+    assert len(server.requests) == 1
@@ -0,0 +1,95 @@
+import asyncio
+import io
+import os
+
+import pytest
+import pytest_asyncio
+from PIL import Image
+
+from custom_components.news_gt import thumbnails
+from custom_components.news_gt.thumbnails import THUMBNAIL_SIZE, ThumbnailCache, thumbnail_key
+
+
+def jpeg(size=(1200, 800)) -> bytes:
+    output = io.BytesIO()
+    Image.new("RGB", size, "red").save(output, format="JPEG")
+    return output.getvalue()
+
+
+@pytest_asyncio.fixture
+async def cache(hass, monkeypatch):
+    # Downloads are replaced per test; no HTTP session is needed.
+    monkeypatch.setattr(thumbnails, "async_get_clientsession", lambda hass: None)
+    return ThumbnailCache(hass)
+
+
+def test_downscale_fits_the_thumbnail_size():
+    with Image.open(io.BytesIO(ThumbnailCache._downscale(jpeg()))) as image:
+        assert image.format == "JPEG"
+        assert image.width <= THUMBNAIL_SIZE[0] and image.height <= THUMBNAIL_SIZE[1]
+
+
+@pytest.mark.asyncio
+async def test_only_registered_urls_are_fetched(cache, monkeypatch):
+    fetched = []
+
+    async def fetch(url):
+        fetched.append(url)
+        return b"thumbnail"
+
+    monkeypatch.setattr(cache, "_fetch", fetch)
+    assert await cache.async_get(thumbnail_key("https://elsewhere.example/a.jpg")) is None
+
+    url = cache.register("https://news.example/a.jpg")
+    key = url.rsplit("/", 1)[1]
+    assert await cache.async_get(key) == b"thumbnail"
+    # Served from disk the second time.
+    assert await cache.async_get(key) == b"thumbnail"
+    assert fetched == ["https://news.example/a.jpg"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_download(cache, monkeypatch):
+    release = asyncio.Event()
+    fetched = []
+
+    async def fetch(url):
+        fetched.append(url)
+        await release.wait()
+        return b"thumbnail"
+
+    monkeypatch.setattr(cache, "_fetch", fetch)
+    key = cache.register("https://news.example/a.jpg").rsplit("/", 1)[1]
+    requests = [asyncio.ensure_future(cache.async_get(key)) for _ in range(3)]
+    await asyncio.sleep(0.05)
+    release.set()
+    assert await asyncio.gather(*requests) == [b"thumbnail"] * 3
+    assert fetched == ["https://news.example/a.jpg"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_download_releases_the_waiters(cache, monkeypatch):
+    async def fetch(url):
+        await asyncio.sleep(3600)
+
+    monkeypatch.setattr(cache, "_fetch", fetch)
+    key = cache.register("https://news.example/a.jpg").rsplit("/", 1)[1]
+    first = asyncio.ensure_future(cache.async_get(key))
+    await asyncio.sleep(0.05)
+    second = asyncio.ensure_future(cache.async_get(key))
+    await asyncio.sleep(0.05)
+    first.cancel()
+    assert await asyncio.wait_for(second, 1) is None
+
+
+@pytest.mark.asyncio
+async def test_evict_drops_least_recently_used(cache, monkeypatch):
+    monkeypatch.setattr(thumbnails, "CACHE_MAX_BYTES", 25)
+    cache._directory.mkdir(parents=True)
+    for age, name in enumerate(("new", "middle", "old")):
+        path = cache._directory / f"{name}.jpg"
+        path.write_bytes(b"x" * 10)
+        os.utime(path, (1000 - age, 1000 - age))
+
+    cache._evict()
+    assert sorted(path.stem for path in cache._directory.glob("*.jpg")) == ["middle", "new"]
@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+
+from custom_components.automation_core.scheduler import CommandScheduler, Priority
+
+
+async def wait(seconds: float, result=None):
+    await asyncio.sleep(seconds)
+    return result
+
+
+def test_submit_returns_result():
+    async def run():
+        scheduler = CommandScheduler()
+        try:
+            assert await scheduler.submit(wait, 0, "done") == "done"
+        finally:
+            await scheduler.shutdown()
+
+    asyncio.run(run())
+
+
+def test_timeout_fails_the_command_and_keeps_the_worker():
+    async def run():
+        scheduler = CommandScheduler()
+        try:
+            slow = scheduler.submit(wait, 10, timeout=0.01)
+            fast = scheduler.submit(wait, 0, "next")
+            with pytest.raises(asyncio.TimeoutError):
+                await slow
+            assert await fast == "next"
+        finally:
+            await scheduler.shutdown()
+
+    asyncio.run(run())
+
+
+def test_default_timeout_applies_unless_disabled():
+    async def run():
+        scheduler = CommandScheduler(default_timeout=0.01)
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await scheduler.submit(wait, 10)
+            assert await scheduler.submit(wait, 0.05, "slow", timeout=None) == "slow"
+        finally:
+            await scheduler.shutdown()
+
+    asyncio.run(run())
+
+
+def test_exclusive_commands_run_by_priority():
+    async def run():
+        scheduler = CommandScheduler()
+        order = []
+
+        async def record(name):
+            order.append(name)
+
+        try:
+            blocker = scheduler.submit(wait, 0.01)
+            low = scheduler.submit(record, "low", priority=Priority.LOW)
+            high = scheduler.submit(record, "high", priority=Priority.HIGH)
+            await asyncio.gather(blocker, low, high)
+            assert order == ["high", "low"]
+        finally:
+            await scheduler.shutdown()
+
+    asyncio.run(run())
+
+
+def test_cancelled_future_is_skipped():
+    async def run():
+        scheduler = CommandScheduler()
+        ran = []
+
+        async def record():
+            ran.append(True)
+
+        try:
+            blocker = scheduler.submit(wait, 0.01)
+            skipped = scheduler.submit(record)
+            skipped.cancel()
+            await blocker
+            await scheduler.submit(wait, 0)
+            assert ran == []
+        finally:
+            await scheduler.shutdown()
+
+    asyncio.run(run())
+
+
+def test_cancel_stops_a_background_job_once():
+    async def run():
+        scheduler = CommandScheduler()
+        task = scheduler.spawn("listener", wait, 10)
+        assert scheduler.spawn("listener", wait, 10) is task
+
+        assert scheduler.cancel("listener")
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert not scheduler.cancel("listener")
+        await scheduler.shutdown()
+
+    asyncio.run(run())
+
+
+def test_shutdown_cancels_queued_commands():
+    async def run():
+        scheduler = CommandScheduler()
+        running = scheduler.submit(wait, 10, timeout=None)
+        queued = scheduler.submit(wait, 0)
+        await asyncio.sleep(0)
+        assert scheduler.backlog == 1
+
+        await scheduler.shutdown()
+        assert running.cancelled()
+        assert queued.cancelled()
+
+    asyncio.run(run())
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from custom_components.automation_core.automations.whatsapp.lib import WhatsApp
+from custom_components.automation_core.automations.whatsapp.store import MessageStore
+
+ME = "me@c.us"
+
+
+class FakeHandle:
+    def __init__(self, value):
+        self._value = value
+
+    async def json_value(self):
+        return self._value
+
+
+class FakeLocator:
+    def __init__(self, page, selector):
+        self._page, self._selector = page, selector
+
+    async def all_text_contents(self):
+        return [text for id, text in self._page.messages if f'[data-id="{id}"]' in self._selector]
+
+
+class FakePage:
+    """Stands in for the open chat: `messages` holds its (data-id, text) pairs."""
+
+    def __init__(self, messages):
+        self.messages = list(messages)
+
+    def ids(self):
+        return [id for id, _ in self.messages]
+
+    async def evaluate(self, expression):
+        return self.ids()
+
+    async def wait_for_function(self, expression, arg, timeout):
+        known, chat = arg
+        while True:
+            new = [id for id in self.ids() if id not in known and (chat is None or id.split("_")[1] == chat)]
+            if new:
+                return FakeHandle(new[0])
+            await asyncio.sleep(0)
+
+    def locator(self, selector):
+        return FakeLocator(self, selector)
+
+
+@pytest_asyncio.fixture
+async def client(tmp_path, monkeypatch):
+    client = WhatsApp(store=MessageStore(path=tmp_path / "messages.db"))
+    client._page = FakePage([(f"false_{ME}_OLD", "old")])
+
+    async def find_me():
+        client._current_user = WhatsApp.ME_CHAT
+
+    async def send(message):
+        client._page.messages.append((f"true_{ME}_SENT", message))
+
+    monkeypatch.setattr(client, "_find_me_impl", find_me)
+    monkeypatch.setattr(client, "_send_message_impl", send)
+    yield client
+    await client._store.close()
+
+
+@pytest.mark.asyncio
+async def test_reply_is_matched_by_id_not_position(client):
+    known, chat = await client._send_me_tracked_impl("ping")
+    assert chat == ME
+    assert known == [f"false_{ME}_OLD", f"true_{ME}_SENT"]
+
+    reply = asyncio.create_task(client._wait_reply_impl(known, chat))
+    await asyncio.sleep(0.01)
+    assert not reply.done()
+
+    # A re-render drops older rows and another chat's message shows up first;
+    # neither may be taken for the reply.
+    client._page.messages = [(f"true_{ME}_SENT", "ping"), ("false_other@c.us_X", "hi"), (f"false_{ME}_REPLY", "pong")]
+    assert await asyncio.wait_for(reply, 1) == "pong"
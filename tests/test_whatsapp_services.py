@@ -0,0 +1,55 @@
+import pytest
+
+from homeassistant.exceptions import ServiceValidationError
+
+from custom_components.automation_core.automations.whatsapp import services
+from custom_components.automation_core.automations.whatsapp.account import get_accounts
+from custom_components.automation_core.discovery import AutomationRegistry
+
+DOMAIN = "automation_core"
+
+
+@pytest.mark.asyncio
+async def test_registry_finds_the_services_hook(hass):
+    registry = AutomationRegistry(hass)
+    await registry.async_load()
+    hooks = await registry.async_get_setup_hooks()
+    assert services.async_setup_automation in hooks
+
+
+@pytest.mark.asyncio
+async def test_services_are_registered_and_removed(hass):
+    remove = services.async_setup_automation(hass, None)
+    assert hass.services.has_service(DOMAIN, services.SEARCH_SERVICE)
+    assert hass.services.has_service(DOMAIN, services.SEND_SERVICE)
+
+    remove()
+    assert not hass.services.has_service(DOMAIN, services.SEARCH_SERVICE)
+    assert not hass.services.has_service(DOMAIN, services.SEND_SERVICE)
+
+
+@pytest.mark.asyncio
+async def test_account_names_are_slugified(hass, monkeypatch):
+    services.async_setup_automation(hass, None)
+    client = get_accounts(hass).get("work_phone")
+    searches = []
+
+    async def search_messages(**filters):
+        searches.append(filters)
+        return []
+
+    monkeypatch.setattr(client, "search_messages", search_messages)
+    response = await hass.services.async_call(
+        DOMAIN, services.SEARCH_SERVICE, {"account": "Work Phone", "text": "hola"}, blocking=True, return_response=True
+    )
+    assert response == {"messages": []}
+    assert searches == [{"text": "hola", "limit": 50}]
+
+
+@pytest.mark.asyncio
+async def test_unknown_account(hass):
+    services.async_setup_automation(hass, None)
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN, services.SEARCH_SERVICE, {"account": "Nobody"}, blocking=True, return_response=True
+        )
@@ -0,0 +1,73 @@
+from datetime import datetime
+
+import pytest
+
+from custom_components.automation_core.automations.whatsapp.lib import WhatsAppMessage
+from custom_components.automation_core.automations.whatsapp.store import LRUDict, MessageStore
+
+
+def message(sender: str, text: str, me: bool = False) -> WhatsAppMessage:
+    return WhatsAppMessage(sender=sender, me=me, time=datetime(2025, 3, 12, 9, 30), message=text, unread=True, no_of_unread=1)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return MessageStore(path=tmp_path / "messages.db", flush_interval=60)
+
+
+def test_lru_dict_forgets_oldest_writes():
+    cache = LRUDict(maxsize=2)
+    cache["a"], cache["b"] = 1, 2
+    cache["a"] = 3
+    cache["c"] = 4
+    assert list(cache) == ["a", "c"]
+
+
+@pytest.mark.asyncio
+async def test_query_sees_buffered_messages(store):
+    store.append(message("Ana", "hola"))
+    store.append(message("Luis", "adiós", me=True))
+
+    rows = await store.query()
+    assert [(row["sender"], row["message"], row["me"]) for row in rows] == [
+        ("Luis", "adiós", True),
+        ("Ana", "hola", False),
+    ]
+    assert rows[1]["time_label"] == "2025-03-12 09:30:00"
+    assert [row["sender"] for row in await store.query(sender="Ana")] == ["Ana"]
+    assert [row["sender"] for row in await store.query(me=True)] == ["Luis"]
+    assert len(await store.query(limit=1)) == 1
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_text_search_is_literal(store):
+    for text in ("50% off", "500 offers", "a_b", "axb", "C:\\temp"):
+        store.append(message("Ana", text))
+
+    async def search(text):
+        return sorted(row["message"] for row in await store.query(text=text))
+
+    assert await search("0% off") == ["50% off"]
+    assert await search("a_b") == ["a_b"]
+    assert await search("\\temp") == ["C:\\temp"]
+    assert await search("OFF") == ["50% off", "500 offers"]
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_history_survives_reopening(store, tmp_path):
+    store.append(message("Ana", "hola"))
+    await store.close()
+
+    reopened = MessageStore(path=tmp_path / "messages.db")
+    assert [row["message"] for row in await reopened.query()] == ["hola"]
+    await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_close_releases_the_thread(store):
+    store.append(message("Ana", "hola"))
+    await store.query()
+    await store.close()
+    assert store._executor._shutdown
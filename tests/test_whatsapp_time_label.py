@@ -0,0 +1,37 @@
+from datetime import date, datetime
+
+import pytest
+
+from custom_components.automation_core.automations.whatsapp.lib import parse_time_label
+
+# A Wednesday.
+TODAY = date(2025, 3, 12)
+
+
+@pytest.mark.parametrize(("label", "expected"), [
+    ("3:45 PM", datetime(2025, 3, 12, 15, 45)),
+    ("3:45 p.m.", datetime(2025, 3, 12, 15, 45)),
+    ("09:05 am", datetime(2025, 3, 12, 9, 5)),
+    ("12:30 AM", datetime(2025, 3, 12, 0, 30)),
+    ("12:30 PM", datetime(2025, 3, 12, 12, 30)),
+    ("Yesterday", datetime(2025, 3, 11)),
+    ("ayer", datetime(2025, 3, 11)),
+    ("Monday", datetime(2025, 3, 10)),
+    ("jueves", datetime(2025, 3, 6)),
+    # The same weekday as today means a week ago; today would show a clock time.
+    ("Miércoles", datetime(2025, 3, 5)),
+    ("3/1/2025", datetime(2025, 3, 1)),
+    ("12/31/24", datetime(2024, 12, 31)),
+])
+def test_labels(label, expected):
+    assert parse_time_label(label, TODAY) == expected
+
+
+@pytest.mark.parametrize("label", ["13/45/2025", "13:00 PM", "soon"])
+def test_unknown_labels_resolve_to_today(label):
+    assert parse_time_label(label, TODAY) == datetime(2025, 3, 12)
+
+
+@pytest.mark.parametrize("label", ["", "   "])
+def test_blank_label(label):
+    assert parse_time_label(label, TODAY) is None